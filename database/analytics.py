@@ -0,0 +1,170 @@
+# database/analytics.py
+"""Сводная статистика по ученикам для окна «Статистика»."""
+from collections import Counter
+from datetime import date
+
+# Возрастные группы: (полных лет от, подпись); группа длится до начала следующей
+AGE_BANDS = (
+    (0, "до 7 лет"),
+    (7, "7–9 лет"),
+    (10, "10–12 лет"),
+    (13, "13–15 лет"),
+    (16, "16–17 лет"),
+    (18, "18 лет и старше"),
+)
+CLEARANCE_LABELS = {
+    "cleared": "Допуск действует",
+    "expired": "Допуск просрочен",
+    "not_cleared": "Не допущен",
+    "none": "Нет медосмотров",
+}
+# Разрезы сводки и их названия в окне статистики
+DIMENSIONS = {
+    "department": "Отделение",
+    "group": "Группа",
+    "coach": "Тренер",
+    "school": "Школа",
+    "rank": "Разряд",
+    "age_band": "Возраст",
+    "clearance": "Медосмотр",
+}
+
+# Снимок нужных колонок students читается одним проходом без сортировки и
+# считается по колонкам в Python: GROUP BY сразу по всем разрезам дал бы почти
+# уникальные комбинации и сортировку всей таблицы. Тренер выводится из группы
+# по справочнику groups, а возрастная группа — из числа учеников на каждую дату
+# рождения, поэтому в снимке нет ни соединений, ни вычислений по строкам
+_SNAPSHOT_SQL = "SELECT department, group_id, school, rank, birth_date, enrollment_date FROM students"
+# Состояние допуска по сводке medical_status — те же условия, что у фильтра medical_status;
+# ученики без строки в сводке — «нет медосмотров»
+_CLEARANCE_SQL = "SELECT next_examination_date < ?, clearance, COUNT(*) FROM medical_status GROUP BY 1, 2"
+
+
+def _age_cutoffs(today):
+    """Даты ГГГГ-ММ-ДД: рождённые не позже cutoff к сегодняшнему дню исполнили age лет"""
+    return [f"{today.year - age:04d}-{today:%m-%d}" for age, _ in AGE_BANDS[1:]]
+
+
+def _age_band(birth_date, cutoffs):
+    if not birth_date:
+        return None
+    return AGE_BANDS[sum(1 for cutoff in cutoffs if birth_date <= cutoff)][1]
+
+
+def _add(counts, key, count):
+    counts[key] = counts.get(key, 0) + count
+
+
+class StudentSummary:
+    """Результат одного подсчёта: численность по разрезам и динамика зачисления"""
+
+    def __init__(self, total, counts, enrollment):
+        """Инициализация сводки
+
+        Args:
+            total (int): Всего учеников
+            counts (dict): Разрез -> {подпись значения: число учеников}; None — не указано
+            enrollment (list): Пары (месяц «ГГГГ-ММ», зачислено) по возрастанию месяца
+        """
+        self.total = total
+        self.counts = counts
+        self.enrollment = enrollment
+
+    def values(self, dimension):
+        """Пары (значение, число учеников) по убыванию числа; «не указано» — последним"""
+        return sorted(self.counts[dimension].items(), key=lambda item: (item[0] is None, -item[1], str(item[0])))
+
+    def enrollment_trend(self):
+        """Тройки (месяц, зачислено за месяц, учеников к концу месяца)"""
+        trend = []
+        running = 0
+        for month, count in self.enrollment:
+            running += count
+            trend.append((month, count, running))
+        return trend
+
+
+class StudentAnalytics:
+    """Статистика учеников с кэшем до следующего изменения базы.
+
+    Сводка хранится вместе с номером версии данных DatabaseManager.generation
+    и датой подсчёта: пока ученики и медосмотры не менялись и не наступил
+    новый день (возраст и сроки допуска зависят от даты), повторное открытие
+    статистики не обращается к базе.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._summary = None
+        self._key = None
+
+    def is_current(self, today=None):
+        """Есть ли в кэше сводка для текущей версии данных"""
+        return self._key == (self.db.generation, today or date.today())
+
+    def summary(self, today=None):
+        """Сводка по ученикам; из кэша, если данные не менялись
+
+        Args:
+            today (date, optional): Дата, на которую считаются возраст и допуск. Defaults to сегодня.
+
+        Returns:
+            StudentSummary: Сводка
+        """
+        today = today or date.today()
+        key = (self.db.generation, today)
+        if self._key != key:
+            self._summary = self._compute(today)
+            self._key = key
+        return self._summary
+
+    def _compute(self, today):
+        reader = self.db.reader
+        rows = reader.execute(_SNAPSHOT_SQL).fetchall()
+        columns = list(zip(*rows)) or [()] * 6
+        departments, groups, schools, ranks, births, enrollments = (Counter(column) for column in columns)
+        counts = {"department": dict(departments), "school": dict(schools), "rank": dict(ranks)}
+
+        group_names, group_coaches = self._groups()
+        coach_names = self._coach_names()
+        counts["group"], counts["coach"] = {}, {}
+        for group_id, count in groups.items():
+            _add(counts["group"], group_names.get(group_id, group_id), count)
+            coach_id = group_coaches.get(group_id)
+            _add(counts["coach"], coach_names.get(coach_id, coach_id), count)
+
+        cutoffs = _age_cutoffs(today)
+        counts["age_band"] = {}
+        for birth_date, count in births.items():
+            _add(counts["age_band"], _age_band(birth_date, cutoffs), count)
+
+        clearance = {}
+        examined = 0
+        for expired, cleared, count in reader.execute(_CLEARANCE_SQL, (today.isoformat(),)):
+            status = "expired" if expired else "cleared" if cleared else "not_cleared"
+            _add(clearance, CLEARANCE_LABELS[status], count)
+            examined += count
+        if len(rows) > examined:
+            clearance[CLEARANCE_LABELS["none"]] = len(rows) - examined
+        counts["clearance"] = clearance
+
+        months = {}
+        for enrollment_date, count in enrollments.items():
+            if enrollment_date:
+                _add(months, enrollment_date[:7], count)
+        return StudentSummary(len(rows), counts, sorted(months.items()))
+
+    def _groups(self):
+        """Подписи групп «Группа (Отделение)» и тренеры групп по ID"""
+        names, coaches = {}, {}
+        rows = self.db.reader.execute(
+            "SELECT groups.id, groups.name, departments.name, groups.coach_id FROM groups "
+            "LEFT JOIN departments ON departments.id = groups.department_id")
+        for group_id, name, department, coach_id in rows:
+            names[group_id] = f"{name} ({department})" if department else name
+            coaches[group_id] = coach_id
+        return names, coaches
+
+    def _coach_names(self):
+        rows = self.db.reader.execute("SELECT id, last_name, first_name, middle_name FROM coaches")
+        return {coach_id: " ".join(part for part in names if part) for coach_id, *names in rows}
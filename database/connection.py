@@ -0,0 +1,95 @@
+# database/connection.py
+"""Соединения с базой: одно соединение для записи и по читателю на поток."""
+import os
+import sqlite3
+import threading
+from urllib.request import pathname2url
+
+from utils.config import database_settings
+
+
+class ConnectionManager:
+    """Выдаёт соединения с одной базой с настройками из utils.config.
+
+    Запись идёт через единственное соединение writer, открытое в потоке,
+    создавшем менеджер; sqlite3 не даст использовать его из другого потока.
+    Каждый поток получает собственное соединение только для чтения (reader).
+    В режиме WAL читатели не ждут записи, а запись не ждёт читателей.
+    База в памяти (":memory:") у каждого соединения своя, поэтому для неё
+    reader() возвращает writer.
+
+    На каждом соединении есть SQL-функция current_user_id(): триггеры журнала
+    изменений берут из неё пользователя, от имени которого пишет программа
+    (journal_user_id). Поэтому разные экземпляры программы и рабочие потоки со
+    своим менеджером соединений не видят пользователя друг друга.
+    """
+
+    def __init__(self, path=None, settings=None):
+        self.settings = dict(settings or database_settings())
+        self.path = path or self.settings["path"]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._readers = []
+        self.journal_user_id = None
+        self.writer = self._connect(self.path)
+        # Режим журнала хранится в файле базы, поэтому задаётся один раз через writer
+        self.writer.execute(f"PRAGMA journal_mode = {self.settings['journal_mode']}")
+
+    @property
+    def in_memory(self):
+        return self.path == ":memory:" or self.path.startswith("file::memory:")
+
+    def _connect(self, database, uri=False, check_same_thread=True):
+        # Запросы собираются из фиксированного набора шаблонов, поэтому
+        # подготовленные выражения переиспользуются через кэш sqlite3
+        conn = sqlite3.connect(database, uri=uri, cached_statements=256,
+                               timeout=self.settings["busy_timeout"] / 1000,
+                               check_same_thread=check_same_thread)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA synchronous = {self.settings['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {int(self.settings['cache_size'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.settings['mmap_size'])}")
+        conn.execute(f"PRAGMA temp_store = {self.settings['temp_store']}")
+        conn.create_function("current_user_id", 0, lambda: self.journal_user_id)
+        return conn
+
+    def reader(self):
+        """Соединение только для чтения для текущего потока"""
+        if self.in_memory:
+            return self.writer
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            # check_same_thread отключён только для того, чтобы close() мог закрыть
+            # читателей всех потоков; каждое соединение используется одним потоком
+            uri = f"file:{pathname2url(os.path.abspath(self.path))}?mode=ro"
+            conn = self._connect(uri, uri=True, check_same_thread=False)
+            self._local.reader = conn
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def release(self):
+        """Закрывает соединение для чтения текущего потока"""
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            return
+        self._local.reader = None
+        with self._lock:
+            if conn not in self._readers:
+                return
+            self._readers.remove(conn)
+        conn.close()
+
+    def close(self):
+        """Закрывает все соединения"""
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,62 +1,870 @@
 # database/db_manager.py
-import sqlite3
+import json
+from collections import OrderedDict
+from datetime import date
+from itertools import islice
+
+from database.connection import ConnectionManager
+from database.migrations import migrate
+from database.references import resolve_group_id, resolve_hall_id
+from database.search import build_match_query
+from models.competition import points_for_place, sort_key
+from models.medical import default_next_date
+from utils.dates import birth_date_range
+
+# Колонки таблицы students в порядке хранения (без id)
+STUDENT_COLUMNS = (
+    "name", "age", "birth_date", "department", "group_name", "coach", "school",
+    "rank", "rank_date", "snils", "passport", "enrollment_date", "medical_clearance"
+)
+# Полная строка ученика, которую получают читатели и подписчики на изменения.
+# coach_id — тренер группы ученика из справочника groups
+STUDENT_FIELDS = ("id",) + STUDENT_COLUMNS + ("group_id", "coach_id")
+# Возраст считается в запросе по дате рождения ГГГГ-ММ-ДД: разность чисел
+# ГГГГММДД сегодняшней даты и даты рождения, делённая на 10000, — число полных
+# лет. Хранимая колонка age устаревала на следующий день после записи и не читается
+_AGE_SQL = ("(CAST(strftime('%Y%m%d', 'now', 'localtime') AS INTEGER)"
+            " - CAST(replace(birth_date, '-', '') AS INTEGER)) / 10000")
+STUDENT_FIELDS_SQL = (", ".join(f"{_AGE_SQL} AS age" if field == "age" else field for field in STUDENT_FIELDS[:-1])
+                       + ", (SELECT coach_id FROM groups WHERE groups.id = students.group_id) AS coach_id")
+STUDENT_SELECT = f"SELECT {STUDENT_FIELDS_SQL} FROM students"
+# Фильтры по справочникам, которые не являются колонками students
+_REFERENCE_FILTERS = {
+    "group_id": "group_id = ?",
+    "coach_id": "group_id IN (SELECT id FROM groups WHERE coach_id = ?)",
+}
+# Область видимости пользователя (models.user.Session.scope_filters). Условия те же,
+# что у фильтров по справочникам, но ключи свои: выбор тренера в форме поиска
+# не может заменить ограничение, он только сужает его
+_SCOPE_FILTERS = {
+    "scope_coach_id": _REFERENCE_FILTERS["coach_id"],
+    "scope_department_id": "group_id IN (SELECT id FROM groups WHERE department_id = ?)",
+}
+SCOPE_FILTERS = tuple(_SCOPE_FILTERS)
+# Фильтры по последнему медосмотру ученика из таблицы medical_status.
+# Допуск действует, если последний осмотр дал допуск и срок следующего не прошёл;
+# "none" — у ученика нет ни одного осмотра
+_MEDICAL_STATUS_FILTERS = {
+    "cleared": "id IN (SELECT student_id FROM medical_status WHERE clearance = 1"
+               " AND (next_examination_date IS NULL OR next_examination_date >= ?))",
+    "expired": "id IN (SELECT student_id FROM medical_status WHERE next_examination_date < ?)",
+    "none": "id NOT IN (SELECT student_id FROM medical_status)",
+}
+# Полуинтервалы дат из medical_status: дата последнего осмотра и срок следующего
+_MEDICAL_DATE_FILTERS = {
+    "medical_date": "examination_date",
+    "medical_due": "next_examination_date",
+}
+# Фильтры, которые нельзя проверить по строке students без обращения к базе
+SUMMARY_FILTERS = ("medical_status",) + tuple(_MEDICAL_DATE_FILTERS)
+# Строк в одной транзакции массового импорта
+IMPORT_CHUNK_SIZE = 5000
+
+# Массовая запись идёт через временную таблицу: строки попадают в неё executemany,
+# а в students переносятся одним INSERT ... ON CONFLICT на порцию. Новые ученики
+# приходят с id = NULL и получают его автоматически, существующие обновляются
+_IMPORT_COLUMNS = STUDENT_COLUMNS + ("group_id", "id")
+_IMPORT_STAGING = f"CREATE TEMP TABLE IF NOT EXISTS import_rows ({', '.join(_IMPORT_COLUMNS)})"
+_IMPORT_STAGE = f"INSERT INTO temp.import_rows VALUES ({', '.join('?' * len(_IMPORT_COLUMNS))})"
+_IMPORT_UPSERT = (
+    f"INSERT INTO students ({', '.join(_IMPORT_COLUMNS)}) "
+    f"SELECT {', '.join(_IMPORT_COLUMNS)} FROM temp.import_rows WHERE true "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in _IMPORT_COLUMNS[:-1])} "
+    # Неизменившиеся строки не переписываются: это не трогает индексы и поисковую таблицу
+    f"WHERE {' OR '.join(f'{column} IS NOT excluded.{column}' for column in _IMPORT_COLUMNS[:-1])}"
+)
+# Кэш страниц на время импорта (в КиБ): вставки идут в десяток индексов сразу
+_IMPORT_CACHE_SIZE = -65536
+
+# Групповые операции получают список ID одним параметром JSON
+_BULK_IDS = "id IN (SELECT value FROM json_each(?))"
+# Колонки, которые можно изменить у нескольких учеников сразу; по ним же определяется группа
+BULK_COLUMNS = ("department", "group_name", "coach")
+# Новая группа каждого ученика при переводе; группа зависит и от прежних значений ученика
+_BULK_GROUPS_STAGING = "CREATE TEMP TABLE IF NOT EXISTS bulk_groups (id INTEGER PRIMARY KEY, group_id INTEGER)"
+# При изменении большего числа учеников подписчики получают "reset" вместо отдельных строк
+BULK_NOTIFY_LIMIT = 500
+# Места участников соревнования: RANK() по ключу, лучший результат — первый,
+# равные результаты делят место, заявки без результата места не получают
+_COMPETITION_RANKS = (
+    "SELECT student_id, place, points, CASE WHEN sort_key IS NULL THEN NULL"
+    " ELSE RANK() OVER (ORDER BY sort_key IS NULL, sort_key) END"
+    " FROM competition_entries WHERE competition_id = ?"
+)
+# Изменение зачёта сезона на разницу очков и числа соревнований с местом
+_STANDINGS_DELTA = (
+    "INSERT INTO season_standings (season, department_id, student_id, points, events) VALUES (?, ?, ?, ?, ?)"
+    " ON CONFLICT (season, department_id, student_id) DO UPDATE"
+    " SET points = points + excluded.points, events = events + excluded.events"
+)
+# Сколько последних прочитанных по ID учеников хранит get_student
+STUDENT_CACHE_SIZE = 1024
+
+
+def _filter_order(item):
+    column = item[0]
+    return (STUDENT_COLUMNS.index(column) if column in STUDENT_COLUMNS else len(STUDENT_COLUMNS), column)
+
+
+def sort_column(sort_by, descending):
+    """Колонка и направление ORDER BY для сортировки по sort_by.
+
+    Сортировка по возрасту — это сортировка по дате рождения в обратном
+    порядке, она идёт по индексу idx_students_birth_date.
+    """
+    if sort_by == "age":
+        return "birth_date", not descending
+    return sort_by, descending
+
+
+def _keyset_segments(sort_by, descending, after):
+    """Условия «строка идёт после ключа after» для ORDER BY sort_by, id.
+
+    SQLite ставит NULL первым при ASC и последним при DESC. Сравнение кортежей
+    с NULL не работает, а OR с IS NULL мешает идти по индексу, поэтому
+    продолжение разбивается на отрезки, каждый из которых — диапазон индекса.
+    Отрезки читаются по очереди, пока не наберётся страница.
+    """
+    if after is None:
+        return [(None, [])]
+    sort_value, last_id = after
+    if sort_by is None:
+        return [("id < ?" if descending else "id > ?", [last_id])]
+    if descending:
+        if sort_value is None:
+            return [(f"{sort_by} IS NULL AND id < ?", [last_id])]
+        return [(f"({sort_by}, id) < (?, ?)", [sort_value, last_id]), (f"{sort_by} IS NULL", [])]
+    if sort_value is None:
+        return [(f"{sort_by} IS NULL AND id > ?", [last_id]), (f"{sort_by} IS NOT NULL", [])]
+    return [(f"({sort_by}, id) > (?, ?)", [sort_value, last_id])]
+
 
 class DatabaseManager:
-    def __init__(self, db_name="sport_school.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
-        self.create_tables()
+    def __init__(self, db_name=None, connections=None):
+        """Открывает базу и обновляет её схему.
+
+        Args:
+            db_name (str, optional): Путь к базе; по умолчанию из настроек (utils.config).
+            connections (ConnectionManager, optional): Соединения уже открытой базы.
+                Так рабочий поток читает базу главного окна через своё соединение;
+                схему такой экземпляр не обновляет и запись в нём недоступна.
+        """
+        self._owns_connections = connections is None
+        self.connections = connections if connections is not None else ConnectionManager(db_name)
+        self.db_name = self.connections.path
+        self._listeners = []
+        # ID -> строка ученика; порядок — от давно прочитанных к недавним
+        self._student_cache = OrderedDict()
+        # Номер версии данных учеников: растёт с каждым уведомлением об изменении,
+        # по нему кэши сводок понимают, что их данные устарели
+        self.generation = 0
+        if self._owns_connections:
+            self.create_tables()
+
+    @property
+    def conn(self):
+        """Соединение для записи; используется только потоком, открывшим базу"""
+        return self.connections.writer
+
+    @property
+    def reader(self):
+        """Соединение только для чтения текущего потока"""
+        return self.connections.reader()
+
+    def close(self):
+        """Закрывает соединения базы или, если они общие, соединение текущего потока"""
+        if self._owns_connections:
+            self.connections.close()
+        else:
+            self.connections.release()
+
+    def add_listener(self, callback):
+        """Подписывает callback(action, student_id, row, old_row) на изменения учеников.
+
+        action — "insert", "update" или "delete"; row и old_row — строки в формате
+        STUDENT_FIELDS (None, если строки нет до или после изменения).
+        После массовых изменений приходит action "reset" без строк: подписчик
+        должен перечитать данные целиком.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def notify_reset(self):
+        """Сообщает подписчикам "reset" после изменений через другое соединение (например, в потоке импорта)"""
+        self._notify("reset", None, None, None)
+
+    def _notify(self, action, student_id, row, old_row):
+        # Все изменения учеников проходят через уведомления, здесь же сбрасывается кэш
+        self.generation += 1
+        if action == "reset":
+            self._student_cache.clear()
+        else:
+            self._student_cache.pop(student_id, None)
+        for callback in list(self._listeners):
+            callback(action, student_id, row, old_row)
+
+    def get_student(self, student_id):
+        """Строка ученика по ID (формат STUDENT_FIELDS) или None.
+
+        Последние STUDENT_CACHE_SIZE прочитанных строк хранятся в кэше, пока
+        ученик не изменится; для одного ID кэш отдаёт один и тот же объект.
+        """
+        row = self._student_cache.get(student_id)
+        if row is not None:
+            self._student_cache.move_to_end(student_id)
+            return row
+        row = self.reader.execute(STUDENT_SELECT + ' WHERE id=?', (student_id,)).fetchone()
+        if row is not None:
+            self._student_cache[student_id] = row
+            if len(self._student_cache) > STUDENT_CACHE_SIZE:
+                self._student_cache.popitem(last=False)
+        return row
+
+    def _fetch_student_row(self, student_id):
+        return self.conn.execute(STUDENT_SELECT + ' WHERE id=?', (student_id,)).fetchone()
 
     def create_tables(self):
-        # Создаем таблицу students с новым полем medical_clearance
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                age INTEGER,
-                birth_date TEXT,
-                department TEXT,
-                group_name TEXT,
-                coach TEXT,
-                school TEXT,
-                rank TEXT,
-                rank_date TEXT,
-                snils TEXT,
-                passport TEXT,
-                enrollment_date TEXT,
-                medical_clearance BOOLEAN DEFAULT 0
-            )
-        ''')
-        self.conn.commit()
-
-        # Проверяем, существует ли колонка medical_clearance, и добавляем её, если отсутствует
-        self.cursor.execute("PRAGMA table_info(students)")
-        columns = [col[1] for col in self.cursor.fetchall()]
-        if 'medical_clearance' not in columns:
-            self.cursor.execute('ALTER TABLE students ADD COLUMN medical_clearance BOOLEAN DEFAULT 0')
-            self.conn.commit()
+        # Схема создаётся и обновляется версионными миграциями (PRAGMA user_version)
+        migrate(self.conn)
+
+    def _group_id(self, student_data):
+        department, group_name, coach = student_data[3], student_data[4], student_data[5]
+        return resolve_group_id(self.conn.cursor(), department, group_name, coach)
 
     def add_student(self, student_data):
-        self.cursor.execute('''
-            INSERT INTO students (name, age, birth_date, department, group_name, coach, school, rank, rank_date, snils, passport, enrollment_date, medical_clearance)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', student_data)
+        cursor = self.conn.execute('''
+            INSERT INTO students (name, age, birth_date, department, group_name, coach, school, rank, rank_date, snils, passport, enrollment_date, medical_clearance, group_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (*student_data, self._group_id(student_data)))
         self.conn.commit()
+        student_id = cursor.lastrowid
+        self._notify("insert", student_id, self._fetch_student_row(student_id), None)
+        return student_id
+
+    def import_students(self, rows, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+        """Массовая запись учеников с обновлением существующих по СНИЛС.
+
+        Строки читаются из итератора порциями по chunk_size, каждая порция
+        записывается в одной транзакции: executemany кладёт её во временную таблицу
+        без индексов, а в students она переносится одним INSERT ... ON CONFLICT.
+        FTS5 сбрасывает свой буфер в начале каждого выражения, поэтому executemany
+        прямо в students с триггером поиска по имени в несколько раз медленнее.
+
+        СНИЛС уже записанных учеников держатся в словаре, поэтому поиск
+        совпадений не требует запроса на каждую строку. Если СНИЛС повторяется
+        в самом файле, побеждает последняя строка.
+
+        Args:
+            rows (iterable): Кортежи значений в порядке STUDENT_COLUMNS.
+            chunk_size (int, optional): Строк в одной транзакции.
+            progress (callable, optional): Вызывается с числом обработанных строк.
+
+        Returns:
+            tuple: (число добавленных, число изменившихся учеников)
+        """
+        snils_index = STUDENT_COLUMNS.index("snils")
+        self.conn.execute(_IMPORT_STAGING)
+        cache_size = self.conn.execute("PRAGMA cache_size").fetchone()[0]
+        self.conn.execute(f"PRAGMA cache_size = {_IMPORT_CACHE_SIZE}")
+        existing = dict(self.conn.execute("SELECT snils, id FROM students WHERE snils IS NOT NULL AND snils != ''"))
+        group_ids = {}
+        inserted = updated = processed = 0
+        rows = iter(rows)
+        try:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                with self.conn:
+                    new_rows = []
+                    pending = {}
+                    changed_rows = {}
+                    for data in chunk:
+                        group_key = (data[3], data[4], data[5])
+                        if group_key not in group_ids:
+                            group_ids[group_key] = self._group_id(data)
+                        snils = data[snils_index]
+                        if snils and snils in existing:
+                            changed_rows[existing[snils]] = (*data, group_ids[group_key], existing[snils])
+                            continue
+                        row = (*data, group_ids[group_key], None)
+                        if snils and snils in pending:
+                            new_rows[pending[snils]] = row
+                        else:
+                            if snils:
+                                pending[snils] = len(new_rows)
+                            new_rows.append(row)
+                    last_id = self.conn.execute("SELECT IFNULL(MAX(id), 0) FROM students").fetchone()[0]
+                    self.conn.executemany(_IMPORT_STAGE, new_rows)
+                    self.conn.executemany(_IMPORT_STAGE, changed_rows.values())
+                    changed = self.conn.execute(_IMPORT_UPSERT).rowcount
+                    self.conn.execute("DELETE FROM temp.import_rows")
+                    if pending:
+                        # Новые СНИЛС попадают в словарь, чтобы следующие порции их обновляли
+                        existing.update(self.conn.execute(
+                            "SELECT snils, id FROM students WHERE id > ? AND snils IS NOT NULL AND snils != ''",
+                            (last_id,)))
+                inserted += len(new_rows)
+                updated += changed - len(new_rows)
+                processed += len(chunk)
+                if progress is not None:
+                    progress(processed)
+            if inserted or updated:
+                # Статистика планировщика после массовой записи: со старой (по базе
+                # из нескольких строк) он выбирает неудачные планы для поиска и фильтров
+                self.conn.execute("ANALYZE students")
+                self.conn.commit()
+        finally:
+            self.conn.execute(f"PRAGMA cache_size = {cache_size}")
+            if inserted or updated:
+                self._notify("reset", None, None, None)
+        return inserted, updated
 
     def get_all_students(self):
-        self.cursor.execute('SELECT * FROM students')
-        return self.cursor.fetchall()
+        """Все ученики одним списком; для больших выборок используйте iter_students()"""
+        return self.reader.execute(STUDENT_SELECT).fetchall()
+
+    def _student_conditions(self, filters, search=True):
+        """WHERE-условия и параметры для фильтров query_students/iter_students.
+
+        С search=False ключ "search_text" пропускается: поиск выполняет вызывающий код.
+        """
+        conditions = []
+        params = []
+        # Условия идут в порядке колонок, чтобы одинаковые наборы фильтров давали один и тот же текст SQL
+        for column, value in sorted((filters or {}).items(), key=_filter_order):
+            if column == "search_text":
+                match = build_match_query(value) if search else None
+                if match:
+                    conditions.append("id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)")
+                    params.append(match)
+                continue
+            if column in _REFERENCE_FILTERS or column in _SCOPE_FILTERS:
+                conditions.append(_REFERENCE_FILTERS.get(column) or _SCOPE_FILTERS[column])
+                params.append(value)
+                continue
+            if column == "medical_status":
+                if value not in _MEDICAL_STATUS_FILTERS:
+                    raise ValueError(f"Неизвестное состояние медосмотра: {value}")
+                conditions.append(_MEDICAL_STATUS_FILTERS[value])
+                if value != "none":
+                    params.append(date.today().isoformat())
+                continue
+            if column in _MEDICAL_DATE_FILTERS:
+                summary_column = _MEDICAL_DATE_FILTERS[column]
+                low, high = value
+                bounds = [f"{summary_column} IS NOT NULL"]
+                if low is not None:
+                    bounds.append(f"{summary_column} >= ?")
+                    params.append(low)
+                if high is not None:
+                    bounds.append(f"{summary_column} < ?")
+                    params.append(high)
+                conditions.append(f"id IN (SELECT student_id FROM medical_status WHERE {' AND '.join(bounds)})")
+                continue
+            if column == "age":
+                # Возраст переводится в диапазон дат рождения, чтобы условие шло по индексу
+                low, high = value if isinstance(value, tuple) else (value, value + 1)
+                column, value = "birth_date", birth_date_range(low, high, date.today())
+            if column not in STUDENT_COLUMNS:
+                raise ValueError(f"Неизвестная колонка фильтра: {column}")
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    conditions.append(f"{column} >= ?")
+                    params.append(low)
+                if high is not None:
+                    conditions.append(f"{column} < ?")
+                    params.append(high)
+            else:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        return conditions, params
+
+    def query_students(self, filters=None, sort_by=None, descending=False):
+        """Открывает отдельный курсор по ученикам с фильтрами и сортировкой.
+
+        Значение фильтра — либо значение для сравнения на равенство, либо кортеж
+        (от, до) для полуинтервала [от, до); None в кортеже означает открытую границу.
+        Особый ключ "search_text" ищет по имени через полнотекстовый индекс students_fts,
+        ключи "group_id" и "coach_id" отбирают учеников группы и групп тренера,
+        ключи "scope_coach_id" и "scope_department_id" — область видимости пользователя.
+        Ключ "age" (возраст или полуинтервал возрастов) переводится в диапазон дат рождения.
+        Ключ "medical_status" ("cleared", "expired" или "none") и ключи "medical_date"
+        и "medical_due" (полуинтервалы даты последнего медосмотра и срока следующего)
+        отбирают учеников по последнему медосмотру.
+        Строки не выбираются заранее: вызывающий код читает их порциями через fetchmany().
+        """
+        conditions, params = self._student_conditions(filters)
+        query = STUDENT_SELECT
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        if sort_by:
+            if sort_by not in STUDENT_COLUMNS:
+                raise ValueError(f"Неизвестная колонка сортировки: {sort_by}")
+            sort_by, descending = sort_column(sort_by, descending)
+            order = 'DESC' if descending else 'ASC'
+            query += f" ORDER BY {sort_by} {order}, id {order}"
+
+        cursor = self.reader.cursor()
+        cursor.execute(query, params)
+        return cursor
+
+    def count_students(self, filters=None):
+        """Количество учеников, подходящих под фильтры query_students"""
+        conditions, params = self._student_conditions(filters)
+        query = "SELECT COUNT(*) FROM students"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return self.reader.execute(query, params).fetchone()[0]
+
+    def fetch_students_page(self, filters=None, sort_by=None, descending=False, after=None, limit=500):
+        """Одна страница учеников с пагинацией по ключу (sort_key, id) вместо OFFSET.
+
+        Страница читается поиском по индексу, только если индекс даёт нужный порядок:
+        без фильтров (или с поиском по имени в порядке id), с фильтром-равенством
+        в порядке id и с фильтром по отделению при сортировке по имени, дате
+        рождения или дате зачисления. Для остальных сочетаний фильтра и сортировки
+        SQLite на каждой странице заново сортирует всю отфильтрованную выборку.
+
+        Args:
+            filters (dict, optional): Фильтры в формате query_students.
+            sort_by (str, optional): Колонка сортировки; без неё строки идут по id.
+            descending (bool, optional): Обратный порядок.
+            after (tuple, optional): Ключ последней строки предыдущей страницы.
+            limit (int, optional): Размер страницы.
+
+        Returns:
+            tuple: (строки в формате STUDENT_FIELDS, ключ для следующей страницы или None)
+        """
+        if sort_by is not None and sort_by not in STUDENT_COLUMNS:
+            raise ValueError(f"Неизвестная колонка сортировки: {sort_by}")
+        match = build_match_query((filters or {}).get("search_text") or "")
+        if match and sort_by is None:
+            return self._fetch_search_page(match, filters, descending, after, limit)
+        sort_by, descending = sort_column(sort_by, descending)
+        conditions, params = self._student_conditions(filters)
+        order = 'DESC' if descending else 'ASC'
+        order_by = f" ORDER BY {sort_by} {order}, id {order}" if sort_by else f" ORDER BY id {order}"
+
+        rows = []
+        for key_condition, key_params in _keyset_segments(sort_by, descending, after):
+            segment_conditions = conditions + ([key_condition] if key_condition else [])
+            query = STUDENT_SELECT
+            if segment_conditions:
+                query += " WHERE " + " AND ".join(segment_conditions)
+            query += order_by + " LIMIT ?"
+            rows += self.reader.execute(query, params + key_params + [limit - len(rows)]).fetchall()
+            if len(rows) == limit:
+                break
+
+        if len(rows) < limit:
+            return rows, None
+        last = rows[-1]
+        sort_value = last[STUDENT_FIELDS.index(sort_by)] if sort_by else None
+        return rows, (sort_value, last[0])
+
+    def _fetch_search_page(self, match, filters, descending, after, limit):
+        """Страница результатов поиска в порядке id, которую ведёт сам полнотекстовый индекс.
+
+        FTS5 отдаёт rowid по возрастанию (или убыванию) и умеет начинать с ключа,
+        поэтому чтение останавливается, как только набрана страница. Условие
+        id IN (SELECT ...) сначала строит весь список совпадений, а на первых
+        буквах поиска под него попадает почти вся таблица.
+        """
+        conditions, params = self._student_conditions(filters, search=False)
+        order = 'DESC' if descending else 'ASC'
+        if after is not None:
+            conditions.append("found.found_id < ?" if descending else "found.found_id > ?")
+            params.append(after[1])
+        query = (f"SELECT {STUDENT_FIELDS_SQL} "
+                 f"FROM (SELECT rowid AS found_id FROM students_fts WHERE students_fts MATCH ?) AS found "
+                 f"CROSS JOIN students ON students.id = found.found_id")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY found.found_id {order} LIMIT ?"
+        rows = self.reader.execute(query, [match] + params + [limit]).fetchall()
+        if len(rows) < limit:
+            return rows, None
+        return rows, (None, rows[-1][0])
+
+    def iter_students(self, filters=None, sort_by=None, descending=False, page_size=500):
+        """Генератор учеников, читающий таблицу страницами фиксированного размера.
+
+        В памяти одновременно находится не больше одной страницы. Следующая страница
+        продолжается с ключа предыдущей, поэтому там, где порядок даёт индекс
+        (см. fetch_students_page), обход не замедляется к концу таблицы.
+        """
+        after = None
+        while True:
+            rows, after = self.fetch_students_page(filters, sort_by, descending, after, page_size)
+            yield from rows
+            if after is None:
+                return
 
     def update_student(self, student_id, student_data):
-        self.cursor.execute('''
-            UPDATE students SET name=?, age=?, birth_date=?, department=?, group_name=?, coach=?, school=?, rank=?, rank_date=?, snils=?, passport=?, enrollment_date=?, medical_clearance=?
+        old_row = self._fetch_student_row(student_id)
+        self.conn.execute('''
+            UPDATE students SET name=?, age=?, birth_date=?, department=?, group_name=?, coach=?, school=?, rank=?, rank_date=?, snils=?, passport=?, enrollment_date=?, medical_clearance=?, group_id=?
             WHERE id=?
-        ''', (*student_data, student_id))
+        ''', (*student_data, self._group_id(student_data), student_id))
         self.conn.commit()
+        if old_row is not None:
+            self._notify("update", student_id, self._fetch_student_row(student_id), old_row)
 
     def delete_student(self, student_id):
-        self.cursor.execute('DELETE FROM students WHERE id=?', (student_id,))
+        old_row = self._fetch_student_row(student_id)
+        with self.conn:
+            competitions = self._competitions_of([student_id])
+            self.conn.execute('DELETE FROM students WHERE id=?', (student_id,))
+            # Участники ниже удалённого ученика поднимаются на место выше
+            self._rerank_competitions(competitions)
+        if old_row is not None:
+            self._notify("delete", student_id, None, old_row)
+
+    def _fetch_student_rows(self, student_ids):
+        return self.conn.execute(STUDENT_SELECT + " WHERE " + _BULK_IDS, (json.dumps(student_ids),)).fetchall()
+
+    def _notify_bulk(self, action, old_rows):
+        """Уведомления после групповой операции: по строке или один "reset" для больших выборок"""
+        if len(old_rows) > BULK_NOTIFY_LIMIT:
+            self._notify("reset", None, None, None)
+            return
+        new_rows = {}
+        if action != "delete":
+            new_rows = {row[0]: row for row in self._fetch_student_rows([row[0] for row in old_rows])}
+        for old_row in old_rows:
+            self._notify(action, old_row[0], new_rows.get(old_row[0]), old_row)
+
+    def delete_students(self, student_ids):
+        """Удаляет учеников одним запросом в одной транзакции.
+
+        Returns:
+            int: Число удалённых учеников
+        """
+        student_ids = list(student_ids)
+        with self.conn:
+            old_rows = self._fetch_student_rows(student_ids)
+            competitions = self._competitions_of(student_ids)
+            self.conn.execute("DELETE FROM students WHERE " + _BULK_IDS, (json.dumps(student_ids),))
+            self._rerank_competitions(competitions)
+        self._notify_bulk("delete", old_rows)
+        return len(old_rows)
+
+    def reassign_students(self, student_ids, changes):
+        """Переводит учеников в другое отделение, группу или к другому тренеру.
+
+        Группа (group_id) каждого ученика определяется по новым значениям вместе
+        с теми, которые не меняются. Справочники заполняются один раз на каждое
+        сочетание значений, а students обновляется одним UPDATE в той же транзакции.
+
+        Args:
+            student_ids (iterable): ID учеников.
+            changes (dict): Новые значения колонок из BULK_COLUMNS.
+
+        Returns:
+            int: Число изменённых учеников
+        """
+        unknown = set(changes) - set(BULK_COLUMNS)
+        if unknown:
+            raise ValueError(f"Недопустимые колонки для группового изменения: {', '.join(sorted(unknown))}")
+        if not changes:
+            raise ValueError("Не указано, что изменить")
+        student_ids = list(student_ids)
+        columns = [column for column in BULK_COLUMNS if column in changes]
+        positions = [STUDENT_FIELDS.index(column) for column in BULK_COLUMNS]
+        with self.conn:
+            old_rows = self._fetch_student_rows(student_ids)
+            group_ids = {}
+            staged = []
+            for row in old_rows:
+                key = tuple(changes.get(column, row[position]) for column, position in zip(BULK_COLUMNS, positions))
+                if key not in group_ids:
+                    group_ids[key] = resolve_group_id(self.conn.cursor(), *key)
+                staged.append((row[0], group_ids[key]))
+            self.conn.execute(_BULK_GROUPS_STAGING)
+            self.conn.executemany("INSERT INTO temp.bulk_groups VALUES (?, ?)", staged)
+            self.conn.execute(
+                f"UPDATE students SET {', '.join(f'{column} = ?' for column in columns)}, "
+                f"group_id = (SELECT group_id FROM temp.bulk_groups WHERE bulk_groups.id = students.id) "
+                f"WHERE id IN (SELECT id FROM temp.bulk_groups)",
+                [changes[column] for column in columns])
+            self.conn.execute("DELETE FROM temp.bulk_groups")
+        self._notify_bulk("update", old_rows)
+        return len(old_rows)
+
+    def set_students_medical_clearance(self, student_ids, cleared):
+        """Отмечает допуск по медосмотру сразу у нескольких учеников одним запросом.
+
+        Returns:
+            int: Число учеников, у которых отметка изменилась
+        """
+        student_ids = list(student_ids)
+        value = 1 if cleared else 0
+        with self.conn:
+            old_rows = [row for row in self._fetch_student_rows(student_ids)
+                        if row[STUDENT_FIELDS.index("medical_clearance")] != value]
+            self.conn.execute(f"UPDATE students SET medical_clearance = ? WHERE {_BULK_IDS} AND medical_clearance IS NOT ?",
+                              (value, json.dumps(student_ids), value))
+        self._notify_bulk("update", old_rows)
+        return len(old_rows)
+
+    def set_medical_clearance(self, student_id, cleared):
+        old_row = self._fetch_student_row(student_id)
+        self.conn.execute('UPDATE students SET medical_clearance=? WHERE id=?', (1 if cleared else 0, student_id))
+        self.conn.commit()
+        if old_row is not None:
+            self._notify("update", student_id, self._fetch_student_row(student_id), old_row)
+
+    def student_matches(self, student_id, filters):
+        """Проходит ли ученик фильтры query_students; одна выборка по первичному ключу"""
+        conditions, params = self._student_conditions(filters)
+        where = " AND ".join(["id = ?"] + conditions)
+        return self.conn.execute(f"SELECT 1 FROM students WHERE {where}", [student_id] + params).fetchone() is not None
+
+    def _notify_medical(self, student_ids):
+        # Строка students не меняется, но меняется результат фильтров по медосмотру:
+        # подписчики получают "update" с одинаковыми строками и перепроверяют фильтры
+        for student_id in dict.fromkeys(student_ids):
+            row = self._fetch_student_row(student_id)
+            if row is not None:
+                self._notify("update", student_id, row, row)
+
+    def add_medical_exam(self, exam_data):
+        """Записывает медосмотр (student_id, examination_date, result, clearance,
+        next_examination_date, notes) и возвращает его ID.
+
+        Сводку medical_status обновляет триггер в той же транзакции. Без даты
+        следующего осмотра допуск действует EXAM_VALID_MONTHS месяцев от осмотра.
+        """
+        if exam_data[4] is None and exam_data[1]:
+            exam_data = (*exam_data[:4], default_next_date(exam_data[1]), *exam_data[5:])
+        cursor = self.conn.execute('''
+            INSERT INTO medical_exams (student_id, examination_date, result, clearance, next_examination_date, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', exam_data)
+        self.conn.commit()
+        self._notify_medical([exam_data[0]])
+        return cursor.lastrowid
+
+    def update_medical_exam(self, exam_id, exam_data):
+        """Перезаписывает медосмотр данными в порядке add_medical_exam"""
+        old = self.conn.execute('SELECT student_id FROM medical_exams WHERE id=?', (exam_id,)).fetchone()
+        self.conn.execute('''
+            UPDATE medical_exams SET student_id=?, examination_date=?, result=?, clearance=?, next_examination_date=?, notes=?
+            WHERE id=?
+        ''', (*exam_data, exam_id))
+        self.conn.commit()
+        if old is not None:
+            self._notify_medical([old[0], exam_data[0]])
+
+    def delete_medical_exam(self, exam_id):
+        old = self.conn.execute('SELECT student_id FROM medical_exams WHERE id=?', (exam_id,)).fetchone()
+        self.conn.execute('DELETE FROM medical_exams WHERE id=?', (exam_id,))
+        self.conn.commit()
+        if old is not None:
+            self._notify_medical([old[0]])
+
+    def medical_status(self, student_id):
+        """Последний медосмотр ученика: (exam_id, examination_date, clearance,
+        next_examination_date) или None, если осмотров не было"""
+        return self.reader.execute(
+            'SELECT exam_id, examination_date, clearance, next_examination_date FROM medical_status WHERE student_id=?',
+            (student_id,)).fetchone()
+
+    def hall_id(self, name):
+        """ID зала по названию; новый зал заносится в справочник"""
+        hall_id = resolve_hall_id(self.conn.cursor(), name)
+        self.conn.commit()
+        return hall_id
+
+    def add_schedule_session(self, session_data):
+        """Записывает занятие (group_id, coach_id, hall_id, weekday, start_minute,
+        end_minute, valid_from, valid_to) и возвращает его ID"""
+        cursor = self.conn.execute('''
+            INSERT INTO schedule_sessions (group_id, coach_id, hall_id, weekday, start_minute, end_minute, valid_from, valid_to)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', session_data)
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def update_schedule_session(self, session_id, session_data):
+        self.conn.execute('''
+            UPDATE schedule_sessions SET group_id=?, coach_id=?, hall_id=?, weekday=?, start_minute=?, end_minute=?, valid_from=?, valid_to=?
+            WHERE id=?
+        ''', (*session_data, session_id))
+        self.conn.commit()
+
+    def delete_schedule_session(self, session_id):
+        self.conn.execute('DELETE FROM schedule_sessions WHERE id=?', (session_id,))
+        self.conn.commit()
+
+    def add_competition(self, competition_data):
+        """Записывает соревнование (name, date, season, department_id, result_type) и возвращает его ID"""
+        cursor = self.conn.execute('''
+            INSERT INTO competitions (name, date, season, department_id, result_type) VALUES (?, ?, ?, ?, ?)
+        ''', competition_data)
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def delete_competition(self, competition_id):
+        """Удаляет соревнование и вычитает его очки из зачёта сезона"""
+        with self.conn:
+            competition = self._competition_key(competition_id)
+            if competition is None:
+                return
+            entries = self.conn.execute(
+                'SELECT student_id, points FROM competition_entries WHERE competition_id = ? AND place IS NOT NULL',
+                (competition_id,)).fetchall()
+            self._apply_standings(competition, [(student_id, -points, -1) for student_id, points in entries])
+            self.conn.execute('DELETE FROM competitions WHERE id = ?', (competition_id,))
+
+    def set_competition_result(self, competition_id, student_id, value):
+        """Записывает заявку ученика с результатом (None — без результата) и пересчитывает места.
+
+        Raises:
+            ValueError: если соревнования нет
+        """
+        with self.conn:
+            row = self.conn.execute('SELECT result_type FROM competitions WHERE id = ?', (competition_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Соревнование {competition_id} не найдено")
+            self.conn.execute('''
+                INSERT INTO competition_entries (competition_id, student_id, value, sort_key) VALUES (?, ?, ?, ?)
+                ON CONFLICT (competition_id, student_id) DO UPDATE SET value = excluded.value, sort_key = excluded.sort_key
+            ''', (competition_id, student_id, value, sort_key(row[0], value)))
+            self._rerank_competitions([competition_id])
+
+    def remove_competition_entry(self, competition_id, student_id):
+        """Снимает заявку ученика; участники ниже поднимаются на место выше"""
+        with self.conn:
+            competition = self._competition_key(competition_id)
+            entry = self.conn.execute(
+                'SELECT place, points FROM competition_entries WHERE competition_id = ? AND student_id = ?',
+                (competition_id, student_id)).fetchone()
+            if competition is None or entry is None:
+                return
+            place, points = entry
+            if place is not None:
+                self._apply_standings(competition, [(student_id, -points, -1)])
+            self.conn.execute('DELETE FROM competition_entries WHERE competition_id = ? AND student_id = ?',
+                              (competition_id, student_id))
+            self._rerank_competitions([competition_id])
+
+    def _competition_key(self, competition_id):
+        """(сезон, отделение) соревнования — ключ его строк в season_standings"""
+        return self.conn.execute('SELECT season, IFNULL(department_id, 0) FROM competitions WHERE id = ?',
+                                 (competition_id,)).fetchone()
+
+    def _competitions_of(self, student_ids):
+        return [row[0] for row in self.conn.execute(
+            'SELECT DISTINCT competition_id FROM competition_entries WHERE student_id IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(student_ids)),))]
+
+    def _rerank_competitions(self, competition_ids):
+        """Пересчитывает места в соревнованиях и обновляет зачёт сезона на разницу очков.
+
+        Записываются только заявки, у которых место изменилось: новый результат
+        сдвигает лишь участников ниже него, а таблица сезона не пересортировывается.
+        """
+        for competition_id in competition_ids:
+            competition = self._competition_key(competition_id)
+            if competition is None:
+                continue
+            changed = []
+            deltas = []
+            for student_id, old_place, old_points, place in self.conn.execute(_COMPETITION_RANKS, (competition_id,)):
+                if place == old_place:
+                    continue
+                points = points_for_place(place)
+                changed.append((place, points, competition_id, student_id))
+                deltas.append((student_id, points - old_points, (place is not None) - (old_place is not None)))
+            self.conn.executemany('UPDATE competition_entries SET place = ?, points = ? '
+                                  'WHERE competition_id = ? AND student_id = ?', changed)
+            self._apply_standings(competition, deltas)
+
+    def _apply_standings(self, competition, deltas):
+        """Прибавляет (student_id, очки, соревнования) к зачёту сезона отделения"""
+        season, department_id = competition
+        deltas = [delta for delta in deltas if delta[1] or delta[2]]
+        self.conn.executemany(_STANDINGS_DELTA, [(season, department_id, *delta) for delta in deltas])
+        # Ученик без мест в сезоне из зачёта убирается
+        self.conn.executemany(
+            'DELETE FROM season_standings WHERE season = ? AND department_id = ? AND student_id = ? AND events <= 0',
+            [(season, department_id, delta[0]) for delta in deltas if delta[2] < 0])
+
+    def save_attendance_sheet(self, sheet_data):
+        """Записывает журнал (group_id, month, coach_id, roster, sessions, marks) целиком"""
+        self.conn.execute('''
+            INSERT OR REPLACE INTO attendance_sheets (group_id, month, coach_id, roster, sessions, marks)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', sheet_data)
+        self.conn.commit()
+
+    def add_user(self, user_data):
+        """Создаёт пользователя (login, password_hash, role_id, coach_id, department_id, active)
+        и возвращает его ID.
+
+        Raises:
+            sqlite3.IntegrityError: если логин уже занят
+        """
+        cursor = self.conn.execute('''
+            INSERT INTO users (login, password_hash, role_id, coach_id, department_id, active)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', user_data)
         self.conn.commit()
+        return cursor.lastrowid
+
+    def update_user(self, user_id, user_data):
+        """Меняет роль и привязки пользователя (role_id, coach_id, department_id, active)"""
+        self.conn.execute('''
+            UPDATE users SET role_id = ?, coach_id = ?, department_id = ?, active = ? WHERE id = ?
+        ''', (*user_data, user_id))
+        self.conn.commit()
+
+    def set_journal_user(self, user_id):
+        """Пользователь, которому журнал изменений приписывает следующие записи этого соединения (None — никто)"""
+        self.connections.journal_user_id = user_id
+
+    def set_user_password(self, user_id, password_hash):
+        self.conn.execute("UPDATE users SET password_hash = ? WHERE id = ?", (password_hash, user_id))
+        self.conn.commit()
+
+    def distinct_values(self, column):
+        """Отсортированные различные значения колонки (без NULL)"""
+        if column not in STUDENT_COLUMNS:
+            raise ValueError(f"Неизвестная колонка: {column}")
+        rows = self.reader.execute(f'SELECT DISTINCT {column} FROM students WHERE {column} IS NOT NULL ORDER BY {column}')
+        return [row[0] for row in rows.fetchall()]
+
+    def value_counts(self, column, filters=None):
+        """Число учеников для каждого значения колонки (без NULL) среди подходящих под фильтры query_students
+
+        Returns:
+            dict: {значение: число учеников}
+        """
+        if column not in STUDENT_COLUMNS:
+            raise ValueError(f"Неизвестная колонка: {column}")
+        conditions, params = self._student_conditions(filters)
+        where = " AND ".join([f"{column} IS NOT NULL"] + conditions)
+        return dict(self.reader.execute(
+            f'SELECT {column}, COUNT(*) FROM students WHERE {where} GROUP BY {column}', params).fetchall())
+
+    def group_in_scope(self, group_id, scope):
+        """Видны ли ученики группы group_id в области scope (Session.scope_filters).
 
-    def __del__(self):
-        self.conn.close()
\ No newline at end of file
+        Условия области зависят только от группы ученика, поэтому проверяются
+        без строки students — в том числе для старой строки удалённого ученика.
+        """
+        if not scope:
+            return True
+        unknown = set(scope) - set(SCOPE_FILTERS)
+        if unknown:
+            raise ValueError(f"Неизвестные условия области видимости: {', '.join(sorted(unknown))}")
+        conditions, params = self._student_conditions(scope)
+        return self.reader.execute(f"SELECT 1 FROM (SELECT ? AS group_id) WHERE {' AND '.join(conditions)}",
+                                   [group_id] + params).fetchone() is not None
\ No newline at end of file
@@ -0,0 +1,92 @@
+# database/facets.py
+"""Значения фильтров главного окна с числом учеников для каждого значения."""
+from database.db_manager import STUDENT_COLUMNS, STUDENT_FIELDS
+
+# Колонки, для которых главное окно строит выпадающие списки
+FACET_COLUMNS = ("department", "school", "rank")
+
+
+class FacetCache:
+    """Различные значения колонок students и число строк с каждым значением.
+
+    Счётчики читаются из базы один раз (GROUP BY по индексу колонки), а дальше
+    поддерживаются по уведомлениям DatabaseManager: добавление, изменение или
+    удаление ученика меняет не больше двух счётчиков на колонку. После
+    массовых изменений (action "reset") счётчики перечитываются целиком.
+    С областью видимости (scope) считаются только видимые пользователю ученики.
+    """
+
+    def __init__(self, db, columns=FACET_COLUMNS, scope=None):
+        for column in columns:
+            if column not in STUDENT_COLUMNS:
+                raise ValueError(f"Неизвестная колонка: {column}")
+        self.db = db
+        self.columns = tuple(columns)
+        self.scope = dict(scope or {})
+        self._group_position = STUDENT_FIELDS.index("group_id")
+        self._positions = {column: STUDENT_FIELDS.index(column) for column in self.columns}
+        self._counts = {}
+        self._listeners = []
+        self.reload()
+        self.db.add_listener(self._on_student_changed)
+
+    def close(self):
+        self.db.remove_listener(self._on_student_changed)
+
+    def add_listener(self, callback):
+        """Подписывает callback(column, value, count) на изменения счётчиков.
+
+        count == 0 означает, что значение исчезло. После перечитывания всех
+        счётчиков приходит callback(None, None, None).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def reload(self):
+        """Перечитывает счётчики из базы"""
+        self._counts = {column: self.db.value_counts(column, self.scope) for column in self.columns}
+
+    def values(self, column):
+        """Отсортированные пары (значение, число учеников) для колонки"""
+        return sorted(self._counts[column].items())
+
+    def count(self, column, value):
+        """Число учеников с указанным значением колонки"""
+        return self._counts[column].get(value, 0)
+
+    def _on_student_changed(self, action, student_id, row, old_row):
+        if action == "reset":
+            self.reload()
+            self._notify(None, None, None)
+            return
+        # Ученик вне области видимости не входит в счётчики ни до, ни после изменения
+        if row is not None and not self._visible(row):
+            row = None
+        if old_row is not None and not self._visible(old_row):
+            old_row = None
+        for column, position in self._positions.items():
+            new_value = row[position] if row is not None else None
+            old_value = old_row[position] if old_row is not None else None
+            if new_value == old_value:
+                continue
+            counts = self._counts[column]
+            if old_value is not None:
+                count = counts.get(old_value, 0) - 1
+                if count > 0:
+                    counts[old_value] = count
+                else:
+                    counts.pop(old_value, None)
+                self._notify(column, old_value, max(count, 0))
+            if new_value is not None:
+                counts[new_value] = counts.get(new_value, 0) + 1
+                self._notify(column, new_value, counts[new_value])
+
+    def _visible(self, row):
+        return not self.scope or self.db.group_in_scope(row[self._group_position], self.scope)
+
+    def _notify(self, column, value, count):
+        for callback in list(self._listeners):
+            callback(column, value, count)
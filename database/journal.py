@@ -0,0 +1,84 @@
+# database/journal.py
+"""Чтение журнала изменений change_journal.
+
+Журнал пишут триггеры в той же транзакции, что и само изменение (см.
+миграцию _create_change_journal). Отчёты и выгрузки запоминают номер
+последней прочитанной записи и в следующий раз читают только то, что
+изменилось после него, вместо повторного обхода всей базы.
+"""
+from models.change import Change
+
+_SELECT = ("SELECT seq, table_name, row_id, action, old_values, new_values, user_id, changed_at "
+           "FROM change_journal")
+
+
+def _change_factory(cursor, row):
+    return Change.from_row(row)
+
+
+class ChangeJournal:
+    """Изменения учеников и медосмотров по порядку записи"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def _cursor(self):
+        cursor = self.db.reader.cursor()
+        cursor.row_factory = _change_factory
+        return cursor
+
+    def last_seq(self):
+        """Номер последней записи журнала; 0, если журнал пуст"""
+        return self.db.reader.execute("SELECT IFNULL(MAX(seq), 0) FROM change_journal").fetchone()[0]
+
+    def since(self, seq, table=None, limit=None):
+        """Записи с номером больше seq по возрастанию номера.
+
+        Args:
+            seq (int): Номер последней уже обработанной записи (0 — с начала журнала)
+            table (str, optional): Только изменения этой таблицы. Defaults to None.
+            limit (int, optional): Не больше стольких записей. Defaults to None.
+
+        Returns:
+            list: Объекты Change
+        """
+        sql, params = _SELECT + " WHERE seq > ?", [seq]
+        if table is not None:
+            sql += " AND table_name = ?"
+            params.append(table)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._cursor().execute(sql, params).fetchall()
+
+    def history(self, table, row_id):
+        """Все изменения одной строки от старых к новым (поиск по индексу idx_change_journal_row)"""
+        return self._cursor().execute(_SELECT + " WHERE table_name = ? AND row_id = ? ORDER BY seq",
+                                      (table, row_id)).fetchall()
+
+    def changed_rows(self, seq, table="students"):
+        """Строки таблицы, изменившиеся после записи seq, — для инкрементальной выгрузки.
+
+        Returns:
+            tuple: (номер последней записи, ID добавленных или изменённых строк, ID удалённых строк);
+                строка, добавленная и удалённая после seq, не попадает никуда
+        """
+        last = seq
+        created, changed, deleted = set(), set(), set()
+        rows = self.db.reader.execute(
+            "SELECT seq, row_id, action FROM change_journal WHERE seq > ? AND table_name = ? ORDER BY seq",
+            (seq, table))
+        for last, row_id, action in rows:
+            if action == "delete":
+                changed.discard(row_id)
+                if row_id in created:
+                    created.discard(row_id)
+                else:
+                    deleted.add(row_id)
+            else:
+                changed.add(row_id)
+                if action == "insert":
+                    created.add(row_id)
+                    deleted.discard(row_id)
+        return last, changed, deleted
@@ -0,0 +1,532 @@
+# database/migrations.py
+"""Версионные миграции схемы.
+
+Номер применённой миграции хранится в PRAGMA user_version. Каждая миграция
+выполняется в своей транзакции вместе с обновлением номера версии, поэтому
+прерванный запуск не оставляет схему в промежуточном состоянии.
+"""
+from database.references import resolve_group_id
+
+
+def _create_students(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            age INTEGER,
+            birth_date TEXT,
+            department TEXT,
+            group_name TEXT,
+            coach TEXT,
+            school TEXT,
+            rank TEXT,
+            rank_date TEXT,
+            snils TEXT,
+            passport TEXT,
+            enrollment_date TEXT,
+            medical_clearance BOOLEAN DEFAULT 0
+        )
+    ''')
+    # Старые базы создавались без колонки medical_clearance
+    cursor.execute("PRAGMA table_info(students)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if 'medical_clearance' not in columns:
+        cursor.execute('ALTER TABLE students ADD COLUMN medical_clearance BOOLEAN DEFAULT 0')
+
+
+def _create_reference_tables(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS departments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS coaches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name TEXT NOT NULL DEFAULT '',
+            last_name TEXT NOT NULL,
+            middle_name TEXT NOT NULL DEFAULT '',
+            phone TEXT DEFAULT '',
+            email TEXT DEFAULT '',
+            department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+            UNIQUE (last_name, first_name, middle_name)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+            coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL
+        )
+    ''')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_groups_department_name '
+                   'ON groups(IFNULL(department_id, 0), name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_groups_coach ON groups(coach_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_coaches_department ON coaches(department_id)')
+    cursor.execute('ALTER TABLE students ADD COLUMN group_id INTEGER REFERENCES groups(id) ON DELETE SET NULL')
+
+    # Заполняем справочники по уже введённым текстовым значениям
+    cursor.execute('SELECT DISTINCT department, group_name, coach FROM students')
+    mapping = [(department, group_name, coach, resolve_group_id(cursor, department, group_name, coach))
+               for department, group_name, coach in cursor.fetchall()]
+    cursor.execute('CREATE TEMP TABLE group_mapping (department TEXT, group_name TEXT, coach TEXT, group_id INTEGER)')
+    cursor.executemany('INSERT INTO group_mapping VALUES (?, ?, ?, ?)', mapping)
+    cursor.execute('CREATE INDEX temp.idx_group_mapping ON group_mapping(group_name)')
+    cursor.execute('''
+        UPDATE students SET group_id = (
+            SELECT m.group_id FROM group_mapping m
+            WHERE m.group_name = students.group_name
+              AND m.department IS students.department AND m.coach IS students.coach
+        )
+    ''')
+    cursor.execute('DROP TABLE group_mapping')
+
+
+# Сортировки, для которых у фильтра по отделению есть составной индекс
+_DEPARTMENT_SORT_COLUMNS = ("name", "birth_date", "enrollment_date")
+
+
+def _create_student_indexes(cursor):
+    # Фильтры главного окна. Порядок по умолчанию — id, а rowid входит в каждый
+    # индекс, поэтому WHERE <колонка> = ? ORDER BY id идёт по индексу без сортировки
+    for column in ("department", "school", "rank", "group_name", "medical_clearance"):
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_students_{column} ON students({column})')
+    # Колонки сортировки; по той же причине ORDER BY <колонка>, id тоже идёт по индексу
+    for column in ("name", "coach", "birth_date", "rank_date", "enrollment_date", "snils", "group_id"):
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_students_{column} ON students({column})')
+    # Отделение — основной фильтр: для него и основных сортировок нужен составной
+    # индекс, иначе каждая страница заново сортирует всё отделение
+    for column in _DEPARTMENT_SORT_COLUMNS:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_students_department_{column} '
+                       f'ON students(department, {column})')
+    cursor.execute('ANALYZE')
+
+
+def _convert_dates_to_iso(cursor):
+    # ДД/ММ/ГГГГ -> ГГГГ-ММ-ДД одним проходом по таблице; пустые даты становятся NULL
+    for column in ("birth_date", "rank_date", "enrollment_date"):
+        cursor.execute(f'''
+            UPDATE students
+            SET {column} = substr({column}, 7, 4) || '-' || substr({column}, 4, 2) || '-' || substr({column}, 1, 2)
+            WHERE {column} GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]'
+        ''')
+        cursor.execute(f"UPDATE students SET {column} = NULL WHERE {column} = ''")
+    cursor.execute('ANALYZE students')
+
+
+def _create_name_search(cursor):
+    # Отдельная копия имён в FTS5; «ё» сворачивается в «е», регистр снимает unicode61.
+    # prefix='1 2 3' строит индексы префиксов для поиска по мере набора
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+            name, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO students_fts (rowid, name)
+        SELECT id, replace(replace(name, 'ё', 'е'), 'Ё', 'Е') FROM students
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+            INSERT INTO students_fts (rowid, name)
+            VALUES (new.id, replace(replace(new.name, 'ё', 'е'), 'Ё', 'Е'));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+            DELETE FROM students_fts WHERE rowid = old.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF name ON students BEGIN
+            UPDATE students_fts SET name = replace(replace(new.name, 'ё', 'е'), 'Ё', 'Е')
+            WHERE rowid = new.id;
+        END
+    ''')
+
+
+def _create_medical_exams(cursor):
+    # История УМО. В старых базах таблица medical_exams уже есть, но с другими
+    # колонками и без каскадного удаления, поэтому записи переносятся в новую таблицу
+    cursor.execute('''
+        CREATE TABLE medical_exams_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            examination_date TEXT NOT NULL,
+            result TEXT NOT NULL DEFAULT '',
+            clearance BOOLEAN NOT NULL DEFAULT 0,
+            next_examination_date TEXT,
+            notes TEXT NOT NULL DEFAULT ''
+        )
+    ''')
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'medical_exams'")
+    if cursor.fetchone():
+        cursor.execute('''
+            INSERT INTO medical_exams_new (id, student_id, examination_date, result, clearance)
+            SELECT id, student_id,
+                   CASE WHEN exam_date GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]'
+                        THEN substr(exam_date, 7, 4) || '-' || substr(exam_date, 4, 2) || '-' || substr(exam_date, 1, 2)
+                        ELSE exam_date END,
+                   IFNULL(results, ''), IFNULL(clearance, 0)
+            FROM medical_exams
+            WHERE student_id IN (SELECT id FROM students) AND exam_date IS NOT NULL AND exam_date != ''
+        ''')
+        cursor.execute('DROP TABLE medical_exams')
+    cursor.execute('ALTER TABLE medical_exams_new RENAME TO medical_exams')
+    cursor.execute('CREATE INDEX idx_medical_exams_student_date ON medical_exams(student_id, examination_date)')
+
+
+def _clear_stored_age(cursor):
+    # Возраст считается при чтении по дате рождения; сохранённые значения устарели
+    cursor.execute('UPDATE students SET age = NULL WHERE age IS NOT NULL')
+
+
+def _medical_status_refresh(student_id):
+    return f'''
+            DELETE FROM medical_status WHERE student_id = {student_id};
+            INSERT INTO medical_status (student_id, exam_id, examination_date, clearance, next_examination_date)
+            SELECT student_id, id, examination_date, clearance, next_examination_date FROM medical_exams
+            WHERE student_id = {student_id} ORDER BY examination_date DESC, id DESC LIMIT 1;'''
+
+
+def _create_medical_status(cursor):
+    # Последний медосмотр каждого ученика. Триггеры пересчитывают строку ученика
+    # при любом изменении его истории (поиск по индексу student_id, examination_date),
+    # поэтому фильтры по допуску и сроку идут по индексам этой таблицы,
+    # а не по коррелированным подзапросам ко всей истории
+    cursor.execute('''
+        CREATE TABLE medical_status (
+            student_id INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+            exam_id INTEGER NOT NULL,
+            examination_date TEXT NOT NULL,
+            clearance BOOLEAN NOT NULL,
+            next_examination_date TEXT
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO medical_status (student_id, exam_id, examination_date, clearance, next_examination_date)
+        SELECT student_id, id, examination_date, clearance, next_examination_date FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY examination_date DESC, id DESC) AS position
+            FROM medical_exams
+        ) WHERE position = 1
+    ''')
+    cursor.execute('CREATE INDEX idx_medical_status_examination_date ON medical_status(examination_date)')
+    cursor.execute('CREATE INDEX idx_medical_status_next_date ON medical_status(next_examination_date)')
+    cursor.execute('CREATE INDEX idx_medical_status_clearance ON medical_status(clearance, next_examination_date)')
+    cursor.execute(f'''
+        CREATE TRIGGER medical_status_ai AFTER INSERT ON medical_exams BEGIN{_medical_status_refresh("new.student_id")}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER medical_status_ad AFTER DELETE ON medical_exams BEGIN{_medical_status_refresh("old.student_id")}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER medical_status_au AFTER UPDATE ON medical_exams BEGIN{_medical_status_refresh("old.student_id")}{_medical_status_refresh("new.student_id")}
+        END
+    ''')
+
+
+def _create_schedule(cursor):
+    # Еженедельные занятия групп. Время хранится в минутах от полуночи, чтобы
+    # пересечения проверялись сравнением чисел; valid_to — последний день
+    # действия занятия включительно, NULL — без окончания
+    cursor.execute('''
+        CREATE TABLE halls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE schedule_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_id INTEGER NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+            coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+            hall_id INTEGER REFERENCES halls(id) ON DELETE SET NULL,
+            weekday INTEGER NOT NULL CHECK (weekday BETWEEN 0 AND 6),
+            start_minute INTEGER NOT NULL CHECK (start_minute >= 0),
+            end_minute INTEGER NOT NULL CHECK (end_minute <= 1440 AND end_minute > start_minute),
+            valid_from TEXT NOT NULL,
+            valid_to TEXT
+        )
+    ''')
+    # Занятия одного ресурса в один день недели — диапазон индекса, по нему
+    # проверяются пересечения при записи нового занятия
+    cursor.execute('CREATE INDEX idx_schedule_group ON schedule_sessions(group_id, weekday, start_minute)')
+    cursor.execute('CREATE INDEX idx_schedule_coach ON schedule_sessions(coach_id, weekday, start_minute)')
+    cursor.execute('CREATE INDEX idx_schedule_hall ON schedule_sessions(hall_id, weekday, start_minute)')
+
+
+def _create_competitions(cursor):
+    # Заявки учеников на соревнования. sort_key — результат со знаком, при котором
+    # лучший результат меньше, поэтому протокол соревнования — диапазон индекса
+    # idx_competition_entries_rank. Место и очки пересчитываются при записи результата
+    cursor.execute('''
+        CREATE TABLE competitions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            date TEXT NOT NULL,
+            season INTEGER NOT NULL,
+            department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+            result_type TEXT NOT NULL CHECK (result_type IN ('time', 'weight', 'score', 'place'))
+        )
+    ''')
+    cursor.execute('CREATE INDEX idx_competitions_date ON competitions(date)')
+    cursor.execute('''
+        CREATE TABLE competition_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            competition_id INTEGER NOT NULL REFERENCES competitions(id) ON DELETE CASCADE,
+            student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            value REAL,
+            sort_key REAL,
+            place INTEGER,
+            points INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (competition_id, student_id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX idx_competition_entries_rank ON competition_entries(competition_id, sort_key)')
+    cursor.execute('CREATE INDEX idx_competition_entries_student ON competition_entries(student_id)')
+    # Зачёт сезона по отделениям: суммы очков обновляются на разницу при каждом
+    # изменении мест, таблица лидеров — диапазон индекса idx_season_standings_points.
+    # Соревнования без отделения учитываются с department_id = 0
+    cursor.execute('''
+        CREATE TABLE season_standings (
+            season INTEGER NOT NULL,
+            department_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            points INTEGER NOT NULL DEFAULT 0,
+            events INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (season, department_id, student_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX idx_season_standings_points ON season_standings(season, department_id, points DESC)')
+    cursor.execute('CREATE INDEX idx_season_standings_student ON season_standings(student_id)')
+
+
+def _create_attendance(cursor):
+    # Журнал посещаемости группы за месяц одной строкой: roster и sessions — JSON-списки
+    # ID учеников и занятий, marks — битовые строки учеников подряд (см. models.attendance)
+    cursor.execute('''
+        CREATE TABLE attendance_sheets (
+            group_id INTEGER NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+            month TEXT NOT NULL,
+            coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+            roster TEXT NOT NULL DEFAULT '[]',
+            sessions TEXT NOT NULL DEFAULT '[]',
+            marks BLOB NOT NULL DEFAULT x'',
+            PRIMARY KEY (group_id, month)
+        )
+    ''')
+    cursor.execute('CREATE INDEX idx_attendance_sheets_month ON attendance_sheets(month)')
+
+
+# Роли на момент миграции: (name, title, scope, права). Область видимости учеников:
+# all — все, department — группы отделения пользователя, coach — группы тренера
+_INITIAL_ROLES = (
+    ("admin", "Администратор", "all",
+     ("students.edit", "students.delete", "students.import", "students.export", "medical.edit",
+      "schedule.edit", "competitions.edit", "attendance.edit", "analytics.view", "users.manage")),
+    ("manager", "Методист", "all",
+     ("students.edit", "students.delete", "students.import", "students.export", "medical.edit",
+      "schedule.edit", "competitions.edit", "attendance.edit", "analytics.view")),
+    ("department_head", "Руководитель отделения", "department",
+     ("students.edit", "students.export", "medical.edit", "schedule.edit", "competitions.edit",
+      "attendance.edit")),
+    ("coach", "Тренер", "coach",
+     ("students.export", "competitions.edit", "attendance.edit")),
+)
+
+
+def _create_users(cursor):
+    cursor.execute('''
+        CREATE TABLE roles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            scope TEXT NOT NULL DEFAULT 'all' CHECK (scope IN ('all', 'department', 'coach'))
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE role_permissions (
+            role_id INTEGER NOT NULL REFERENCES roles(id) ON DELETE CASCADE,
+            permission TEXT NOT NULL,
+            PRIMARY KEY (role_id, permission)
+        ) WITHOUT ROWID
+    ''')
+    # Пароль хранится только как хэш PBKDF2 вместе с солью и числом итераций (см. utils.passwords)
+    cursor.execute('''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            login TEXT NOT NULL UNIQUE COLLATE NOCASE,
+            password_hash TEXT NOT NULL,
+            role_id INTEGER NOT NULL REFERENCES roles(id),
+            coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+            department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+            active BOOLEAN NOT NULL DEFAULT 1
+        )
+    ''')
+    for name, title, scope, permissions in _INITIAL_ROLES:
+        cursor.execute('INSERT INTO roles (name, title, scope) VALUES (?, ?, ?)', (name, title, scope))
+        role_id = cursor.lastrowid
+        cursor.executemany('INSERT INTO role_permissions (role_id, permission) VALUES (?, ?)',
+                           [(role_id, permission) for permission in permissions])
+
+
+# Колонки, изменения которых записываются в журнал (хранимый возраст не читается с миграции 7)
+_JOURNAL_COLUMNS = {
+    "students": ("name", "birth_date", "department", "group_name", "coach", "school", "rank", "rank_date",
+                 "snils", "passport", "enrollment_date", "medical_clearance", "group_id"),
+    "medical_exams": ("student_id", "examination_date", "result", "clearance", "next_examination_date", "notes"),
+}
+
+
+def _journal_values(row, columns, skip):
+    """JSON-объект значений строки row без колонок, для которых выполняется условие skip"""
+    values = ", ".join(f"'{column}', {row}.{column}" for column in columns)
+    # Путь несуществующего ключа '$._' ничего не удаляет: json_remove с NULL вернул бы NULL
+    paths = ", ".join(f"CASE WHEN {skip.format(column)} THEN '$.{column}' ELSE '$._' END" for column in columns)
+    return f"json_remove(json_object({values}), {paths})"
+
+
+def _journal_trigger(table, action, user_id_sql):
+    """Триггер, дописывающий изменение строки table в change_journal.
+
+    Добавление записывается без значений — строка есть в самой таблице, а её
+    исходный вид восстанавливается по последующим записям. Удаление хранит
+    непустые старые значения, изменение — старые и новые значения только
+    изменившихся колонок; изменение без разницы триггер пропускает.
+    user_id_sql — выражение, дающее ID пользователя записи.
+    """
+    columns = _JOURNAL_COLUMNS[table]
+    old_values = new_values = "NULL"
+    when = ""
+    if action == "delete":
+        old_values = _journal_values("old", columns, "old.{0} IS NULL")
+    elif action == "update":
+        old_values = _journal_values("old", columns, "old.{0} IS new.{0}")
+        new_values = _journal_values("new", columns, "old.{0} IS new.{0}")
+        when = "WHEN " + " OR ".join(f"old.{column} IS NOT new.{column}" for column in columns)
+    row = "old" if action == "delete" else "new"
+    return f'''
+        CREATE TRIGGER {table}_journal_{action[0]} AFTER {action.upper()} ON {table} {when} BEGIN
+            INSERT INTO change_journal (table_name, row_id, action, old_values, new_values, user_id)
+            VALUES ('{table}', {row}.id, '{action}', {old_values}, {new_values},
+                    {user_id_sql});
+        END
+    '''
+
+
+def _create_change_journal(cursor):
+    # Журнал изменений только дополняется: строки не удаляются, поэтому seq (rowid)
+    # растёт с каждой записью и без AUTOINCREMENT, который обновлял бы sqlite_sequence
+    # на каждое изменение. «Изменения после N» — диапазон первичного ключа.
+    # Записи делают триггеры в той же транзакции, что и само изменение, включая
+    # импорт и групповые операции
+    cursor.execute('''
+        CREATE TABLE change_journal (
+            seq INTEGER PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            action TEXT NOT NULL CHECK (action IN ('insert', 'update', 'delete')),
+            old_values TEXT,
+            new_values TEXT,
+            user_id INTEGER,
+            changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+        )
+    ''')
+    cursor.execute('CREATE INDEX idx_change_journal_row ON change_journal(table_name, row_id)')
+    for action in ("update", "delete"):
+        cursor.execute(f'''
+            CREATE TRIGGER change_journal_no_{action} BEFORE {action.upper()} ON change_journal BEGIN
+                SELECT RAISE(ABORT, 'change_journal только дополняется');
+            END
+        ''')
+    # Пользователь, от имени которого пишет программа (DatabaseManager.set_journal_user):
+    # триггеры не видят соединение, поэтому он хранится в единственной строке таблицы
+    cursor.execute('''
+        CREATE TABLE journal_context (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            user_id INTEGER
+        )
+    ''')
+    cursor.execute('INSERT INTO journal_context (id, user_id) VALUES (1, NULL)')
+    for table in _JOURNAL_COLUMNS:
+        for action in ("insert", "update", "delete"):
+            cursor.execute(_journal_trigger(table, action, "(SELECT user_id FROM journal_context)"))
+
+
+def _journal_user_from_connection(cursor):
+    # Общая строка journal_context приписывала записи пользователю, который вошёл
+    # последним в любом экземпляре программы. Теперь пользователя сообщает
+    # функция current_user_id() соединения (database.connection.ConnectionManager)
+    for table in _JOURNAL_COLUMNS:
+        for action in ("insert", "update", "delete"):
+            cursor.execute(f"DROP TRIGGER {table}_journal_{action[0]}")
+            cursor.execute(_journal_trigger(table, action, "current_user_id()"))
+    cursor.execute("DROP TABLE journal_context")
+
+
+# Строки зачёта сезона удалённого отделения переходят к соревнованиям без отделения
+# (department_id = 0): competitions.department_id при удалении становится NULL,
+# а DatabaseManager._competition_key читает NULL как 0
+_MOVE_STANDINGS = (
+    "INSERT INTO season_standings (season, department_id, student_id, points, events)"
+    " SELECT season, 0, student_id, points, events FROM season_standings WHERE {where}"
+    " ON CONFLICT (season, department_id, student_id) DO UPDATE"
+    " SET points = points + excluded.points, events = events + excluded.events",
+    "DELETE FROM season_standings WHERE {where}",
+)
+
+
+def _move_standings_of_deleted_departments(cursor):
+    # Строки, оставшиеся от уже удалённых отделений
+    orphans = "department_id != 0 AND department_id NOT IN (SELECT id FROM departments)"
+    for statement in _MOVE_STANDINGS:
+        cursor.execute(statement.format(where=orphans))
+    body = "".join(statement.format(where="department_id = old.id") + ";\n" for statement in _MOVE_STANDINGS)
+    cursor.execute(f'''
+        CREATE TRIGGER departments_standings_ad AFTER DELETE ON departments BEGIN
+            {body}
+        END
+    ''')
+
+
+MIGRATIONS = [
+    _create_students,
+    _create_reference_tables,
+    _create_student_indexes,
+    _convert_dates_to_iso,
+    _create_name_search,
+    _create_medical_exams,
+    _clear_stored_age,
+    _create_medical_status,
+    _create_schedule,
+    _create_competitions,
+    _create_attendance,
+    _create_users,
+    _create_change_journal,
+    _move_standings_of_deleted_departments,
+    _journal_user_from_connection,
+]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Применяет к базе все миграции новее её текущей версии"""
+    version = schema_version(conn)
+    cursor = conn.cursor()
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        cursor.execute("BEGIN")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+    cursor.close()
@@ -0,0 +1,60 @@
+# database/references.py
+"""Справочники отделений, тренеров, групп и залов, которые строятся по введённым названиям"""
+
+
+def split_full_name(full_name):
+    """Разбивает «Фамилия Имя Отчество» на части.
+
+    Returns:
+        tuple: (last_name, first_name, middle_name), отсутствующие части — пустые строки
+    """
+    parts = full_name.split(maxsplit=2)
+    parts += [""] * (3 - len(parts))
+    return parts[0], parts[1], parts[2]
+
+
+def resolve_department_id(cursor, name):
+    if not name:
+        return None
+    cursor.execute('INSERT OR IGNORE INTO departments (name) VALUES (?)', (name,))
+    cursor.execute('SELECT id FROM departments WHERE name = ?', (name,))
+    return cursor.fetchone()[0]
+
+
+def resolve_coach_id(cursor, full_name, department_id=None):
+    if not full_name or not full_name.strip():
+        return None
+    last_name, first_name, middle_name = split_full_name(full_name)
+    cursor.execute('''
+        INSERT OR IGNORE INTO coaches (last_name, first_name, middle_name, department_id)
+        VALUES (?, ?, ?, ?)
+    ''', (last_name, first_name, middle_name, department_id))
+    cursor.execute('SELECT id FROM coaches WHERE last_name = ? AND first_name = ? AND middle_name = ?',
+                   (last_name, first_name, middle_name))
+    return cursor.fetchone()[0]
+
+
+def resolve_hall_id(cursor, name):
+    if not name or not name.strip():
+        return None
+    cursor.execute('INSERT OR IGNORE INTO halls (name) VALUES (?)', (name.strip(),))
+    cursor.execute('SELECT id FROM halls WHERE name = ?', (name.strip(),))
+    return cursor.fetchone()[0]
+
+
+def resolve_group_id(cursor, department, group_name, coach):
+    """Находит или создаёт отделение, тренера и группу и возвращает ID группы.
+
+    Отделение и тренер заносятся в справочники, даже если группа не указана.
+    Группа определяется парой (отделение, название); тренер группы берётся из первой
+    записи, в которой она встретилась.
+    """
+    department_id = resolve_department_id(cursor, department)
+    coach_id = resolve_coach_id(cursor, coach, department_id)
+    if not group_name:
+        return None
+    cursor.execute('''
+        INSERT OR IGNORE INTO groups (name, department_id, coach_id) VALUES (?, ?, ?)
+    ''', (group_name, department_id, coach_id))
+    cursor.execute('SELECT id FROM groups WHERE name = ? AND department_id IS ?', (group_name, department_id))
+    return cursor.fetchone()[0]
@@ -0,0 +1,634 @@
+# database/repositories.py
+"""Репозитории — слой доступа к данным между DatabaseManager и интерфейсом.
+
+Репозитории возвращают объекты моделей, которые фабрики строк собирают прямо
+из кортежей sqlite3. Все запросы берутся из постоянного набора SQL-шаблонов,
+поэтому подготовленные выражения переиспользуются через кэш соединения.
+"""
+from database.db_manager import STUDENT_SELECT
+from datetime import date, datetime, timedelta
+
+from models.attendance import AttendanceSheet
+from models.coach import Coach
+from models.competition import Competition, CompetitionResult
+from models.department import Department
+from models.group import Group
+from models.medical import MedicalExamination
+from models.schedule import ScheduleSession
+from models.student import Student
+from models.user import Session, User
+from utils.attendance import season_report
+from utils.dates import SEASON_START_MONTH, from_storage, to_storage, year_range
+from utils.passwords import hash_password, needs_rehash, verify_password
+from utils.schedule import conflicts_with, describe_conflict, find_conflicts, occurrences
+
+
+def _student_factory(cursor, row):
+    return Student.from_row(row)
+
+
+def _coach_factory(cursor, row):
+    return Coach.from_row(row)
+
+
+def _group_factory(cursor, row):
+    return Group.from_row(row)
+
+
+def _department_factory(cursor, row):
+    return Department.from_row(row)
+
+
+def _exam_factory(cursor, row):
+    return MedicalExamination.from_row(row)
+
+
+def _session_factory(cursor, row):
+    return ScheduleSession.from_row(row)
+
+
+def _sheet_factory(cursor, row):
+    return AttendanceSheet.from_row(row)
+
+
+def _competition_factory(cursor, row):
+    return Competition.from_row(row)
+
+
+def _result_factory(cursor, row):
+    return CompetitionResult.from_row(row)
+
+
+def _user_factory(cursor, row):
+    return User.from_row(row)
+
+
+class StudentRepository:
+    def __init__(self, db):
+        self.db = db
+        self._listeners = {}
+
+    def add_listener(self, callback):
+        """Подписывает callback(action, student_id, student, old_student) на изменения учеников.
+
+        В отличие от DatabaseManager.add_listener, вместо строк передаются объекты Student.
+        """
+        def listener(action, student_id, row, old_row):
+            callback(action, student_id,
+                     Student.from_row(row) if row is not None else None,
+                     Student.from_row(old_row) if old_row is not None else None)
+
+        self._listeners[callback] = listener
+        self.db.add_listener(listener)
+
+    def remove_listener(self, callback):
+        listener = self._listeners.pop(callback, None)
+        if listener is not None:
+            self.db.remove_listener(listener)
+
+    def query(self, filters=None, sort_by=None, descending=False):
+        """Курсор по ученикам (см. DatabaseManager.query_students), выдающий объекты Student"""
+        cursor = self.db.query_students(filters, sort_by, descending)
+        cursor.row_factory = _student_factory
+        return cursor
+
+    def page(self, filters=None, sort_by=None, descending=False, after=None, limit=500):
+        """Страница учеников (см. DatabaseManager.fetch_students_page)
+
+        Returns:
+            tuple: (список Student, ключ следующей страницы или None)
+        """
+        rows, next_key = self.db.fetch_students_page(filters, sort_by, descending, after, limit)
+        return [Student.from_row(row) for row in rows], next_key
+
+    def rows(self, filters=None, sort_by=None, descending=False):
+        """Курсор по ученикам с кортежами STUDENT_FIELDS — для экспорта, где объекты не нужны"""
+        return self.db.query_students(filters, sort_by, descending)
+
+    def count(self, filters=None):
+        return self.db.count_students(filters)
+
+    def iter_students(self, filters=None, sort_by=None, descending=False, page_size=500):
+        """Потоковый обход учеников страницами (см. DatabaseManager.iter_students)"""
+        for row in self.db.iter_students(filters, sort_by, descending, page_size):
+            yield Student.from_row(row)
+
+    def get_all(self):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _student_factory
+        return cursor.execute(STUDENT_SELECT).fetchall()
+
+    def get(self, student_id):
+        """Ученик по ID через кэш DatabaseManager.get_student; None, если его нет"""
+        row = self.db.get_student(student_id)
+        return Student.from_row(row) if row is not None else None
+
+    def query_filters(self, filters=None):
+        """Перевод фильтров StudentFilterForm в формат DatabaseManager.query_students
+
+        :param filters: словарь с параметрами фильтрации, например:
+            {
+                'birth_year': 2010,  # Год рождения
+                'age_from': 10,      # Возраст от (включительно)
+                'age_to': 12,        # Возраст до (включительно)
+                'department_id': 1,  # ID отделения
+                'group_id': 2,       # ID группы
+                'coach_id': 3,       # ID тренера
+                'training_allowed': True,           # Допуск к тренировкам
+                'enrollment_date_from': date(2023, 9, 1),  # Дата зачисления от
+                'enrollment_date_to': date(2024, 5, 31),   # Дата зачисления до
+                'medical_date_from': '2024-01-01',  # Дата последнего медосмотра от
+                'medical_date_to': '2024-06-30',    # Дата последнего медосмотра до
+                'medical_status': 'expired',        # Состояние допуска по последнему медосмотру
+                'search_text': 'Иван'               # Поиск по имени/фамилии
+            }
+        :return: словарь фильтров по колонкам students
+        """
+        filters = filters or {}
+        result = {}
+        if filters.get('search_text'):
+            result['search_text'] = filters['search_text']
+        if filters.get('birth_year'):
+            result['birth_date'] = year_range(filters['birth_year'])
+        age_from, age_to = filters.get('age_from'), filters.get('age_to')
+        if age_from is not None or age_to is not None:
+            # Фильтр query_students по возрасту — полуинтервал [от, до)
+            result['age'] = (age_from, age_to + 1 if age_to is not None else None)
+        if filters.get('department_id'):
+            department = DepartmentRepository(self.db).get(filters['department_id'])
+            # Несуществующее отделение не должно снимать фильтр
+            result['department'] = department.name if department else ""
+        for key in ('group_id', 'coach_id'):
+            if filters.get(key):
+                result[key] = filters[key]
+        date_from = to_storage(filters.get('enrollment_date_from'))
+        date_to = to_storage(filters.get('enrollment_date_to'))
+        if date_from or date_to:
+            # Граница «до» включительная, а фильтр query_students — полуинтервал
+            date_to = to_storage(from_storage(date_to) + timedelta(days=1)) if date_to else None
+            result['enrollment_date'] = (date_from, date_to)
+        if filters.get('training_allowed') is not None:
+            result['medical_clearance'] = 1 if filters['training_allowed'] else 0
+        medical_from = to_storage(filters.get('medical_date_from'))
+        medical_to = to_storage(filters.get('medical_date_to'))
+        if medical_from or medical_to:
+            medical_to = to_storage(from_storage(medical_to) + timedelta(days=1)) if medical_to else None
+            result['medical_date'] = (medical_from, medical_to)
+        if filters.get('medical_status'):
+            result['medical_status'] = filters['medical_status']
+        return result
+
+    def matches(self, student_id, filters):
+        """Проходит ли ученик фильтры в формате query_students"""
+        return self.db.student_matches(student_id, filters)
+
+    def filter(self, filters=None):
+        """Ученики по параметрам формы StudentFilterForm (см. query_filters)
+
+        :return: список объектов Student
+        """
+        return self.query(self.query_filters(filters)).fetchall()
+
+    def add(self, student):
+        """Сохраняет нового ученика и возвращает его ID"""
+        student.id = self.db.add_student(student.to_row())
+        return student.id
+
+    def update(self, student):
+        self.db.update_student(student.id, student.to_row())
+
+    def delete(self, student_id):
+        self.db.delete_student(student_id)
+
+    def delete_many(self, student_ids):
+        """Удаляет учеников одной транзакцией и возвращает их число"""
+        return self.db.delete_students(student_ids)
+
+    def reassign(self, student_ids, department=None, group_name=None, coach=None):
+        """Переводит учеников; None означает, что значение не меняется
+
+        :return: число изменённых учеников
+        """
+        changes = {column: value for column, value in
+                   (("department", department), ("group_name", group_name), ("coach", coach))
+                   if value is not None}
+        return self.db.reassign_students(student_ids, changes)
+
+    def set_medical_clearance(self, student_ids, cleared):
+        """Отмечает допуск по медосмотру у нескольких учеников и возвращает число изменённых"""
+        return self.db.set_students_medical_clearance(student_ids, cleared)
+
+    def import_rows(self, rows, progress=None):
+        """Массовая запись строк в порядке STUDENT_COLUMNS (см. DatabaseManager.import_students)"""
+        return self.db.import_students(rows, progress=progress)
+
+    def distinct_values(self, column):
+        return self.db.distinct_values(column)
+
+
+class DepartmentRepository:
+    _SELECT = "SELECT id, name FROM departments"
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_all(self):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _department_factory
+        return cursor.execute(self._SELECT + " ORDER BY name").fetchall()
+
+    def get(self, department_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _department_factory
+        return cursor.execute(self._SELECT + " WHERE id = ?", (department_id,)).fetchone()
+
+
+class CoachRepository:
+    _SELECT = "SELECT id, first_name, last_name, middle_name, phone, email, department_id FROM coaches"
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_all(self):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _coach_factory
+        return cursor.execute(self._SELECT + " ORDER BY last_name, first_name, middle_name").fetchall()
+
+    def get(self, coach_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _coach_factory
+        return cursor.execute(self._SELECT + " WHERE id = ?", (coach_id,)).fetchone()
+
+    def for_department(self, department_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _coach_factory
+        return cursor.execute(self._SELECT + " WHERE department_id = ? ORDER BY last_name, first_name",
+                              (department_id,)).fetchall()
+
+
+class GroupRepository:
+    _SELECT = "SELECT id, name, department_id, coach_id FROM groups"
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_all(self):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _group_factory
+        return cursor.execute(self._SELECT + " ORDER BY name").fetchall()
+
+    def get(self, group_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _group_factory
+        return cursor.execute(self._SELECT + " WHERE id = ?", (group_id,)).fetchone()
+
+    def for_coach(self, coach_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _group_factory
+        return cursor.execute(self._SELECT + " WHERE coach_id = ? ORDER BY name", (coach_id,)).fetchall()
+
+
+class MedicalRepository:
+    """Медосмотры (УМО) и допуск учеников"""
+    _SELECT = ("SELECT id, student_id, examination_date, result, clearance, next_examination_date, notes "
+               "FROM medical_exams")
+
+    def __init__(self, db):
+        self.db = db
+
+    def for_student(self, student_id):
+        """История медосмотров ученика, от последнего к первому"""
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _exam_factory
+        return cursor.execute(self._SELECT + " WHERE student_id = ? ORDER BY examination_date DESC, id DESC",
+                              (student_id,)).fetchall()
+
+    def latest(self, student_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _exam_factory
+        return cursor.execute(self._SELECT + " WHERE student_id = ? ORDER BY examination_date DESC, id DESC LIMIT 1",
+                              (student_id,)).fetchone()
+
+    def add(self, exam):
+        """Сохраняет медосмотр и возвращает его ID"""
+        exam.id = self.db.add_medical_exam(exam.to_row())
+        return exam.id
+
+    def update(self, exam):
+        self.db.update_medical_exam(exam.id, exam.to_row())
+
+    def delete(self, exam_id):
+        self.db.delete_medical_exam(exam_id)
+
+    def status(self, student_id, today=None):
+        """Состояние допуска по последнему медосмотру: "cleared", "expired",
+        "not_cleared" или None, если осмотров не было"""
+        row = self.db.medical_status(student_id)
+        if row is None:
+            return None
+        _, _, clearance, next_date = row
+        if next_date is not None and next_date < to_storage(today or date.today()):
+            return "expired"
+        return "cleared" if clearance else "not_cleared"
+
+    def is_cleared(self, student_id):
+        """Допуск по последнему медосмотру; без осмотров — ручная отметка medical_clearance"""
+        status = self.status(student_id)
+        if status is not None:
+            return status == "cleared"
+        row = self.db.conn.execute("SELECT medical_clearance FROM students WHERE id = ?", (student_id,)).fetchone()
+        return bool(row and row[0])
+
+    def set_clearance(self, student_id, cleared):
+        self.db.set_medical_clearance(student_id, cleared)
+
+
+_SESSION_SELECT = ("SELECT id, group_id, coach_id, hall_id, weekday, start_minute, end_minute, valid_from, valid_to "
+                   "FROM schedule_sessions")
+# Занятия в тот же день недели, пересекающиеся по времени и занимающие тот же
+# ресурс: три диапазона индексов idx_schedule_* вместо чтения всего расписания
+_SESSION_SAME_RESOURCE = " UNION ".join(
+    f"{_SESSION_SELECT} WHERE {column} = ? AND weekday = ? AND start_minute < ? AND end_minute > ?"
+    for column in ("group_id", "coach_id", "hall_id"))
+
+
+class ScheduleRepository:
+    """Еженедельное расписание групп с проверкой пересечений"""
+    _SELECT = _SESSION_SELECT
+
+    def __init__(self, db):
+        self.db = db
+
+    def _cursor(self):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _session_factory
+        return cursor
+
+    def get_all(self):
+        return self._cursor().execute(self._SELECT + " ORDER BY weekday, start_minute, id").fetchall()
+
+    def get(self, session_id):
+        return self._cursor().execute(self._SELECT + " WHERE id = ?", (session_id,)).fetchone()
+
+    def for_group(self, group_id):
+        return self._cursor().execute(self._SELECT + " WHERE group_id = ? ORDER BY weekday, start_minute",
+                                      (group_id,)).fetchall()
+
+    def halls(self):
+        """Пары (ID, название) залов по алфавиту"""
+        return self.db.conn.execute("SELECT id, name FROM halls ORDER BY name").fetchall()
+
+    def hall_id(self, name):
+        return self.db.hall_id(name)
+
+    def conflicts_with(self, session):
+        """Пересечения занятия с записанными (см. utils.schedule.find_conflicts)"""
+        params = []
+        for column in ("group_id", "coach_id", "hall_id"):
+            params += [getattr(session, column), session.weekday, session.end_minute, session.start_minute]
+        return conflicts_with(session, self._cursor().execute(_SESSION_SAME_RESOURCE, params).fetchall())
+
+    def conflicts(self):
+        """Все пересечения в расписании"""
+        return find_conflicts(self.get_all())
+
+    def _check(self, session):
+        if session.coach_id is None:
+            # По умолчанию занятие ведёт тренер группы
+            group = self.db.conn.execute("SELECT coach_id FROM groups WHERE id = ?", (session.group_id,)).fetchone()
+            session.coach_id = group[0] if group else None
+        conflicts = self.conflicts_with(session)
+        if conflicts:
+            raise ValueError("\n".join(describe_conflict(conflict) for conflict in conflicts))
+
+    def add(self, session):
+        """Сохраняет занятие и возвращает его ID
+
+        :raises ValueError: если занятие пересекается с другими по группе, тренеру или залу
+        """
+        self._check(session)
+        session.id = self.db.add_schedule_session(session.to_row())
+        return session.id
+
+    def update(self, session):
+        """:raises ValueError: если занятие пересекается с другими по группе, тренеру или залу"""
+        self._check(session)
+        self.db.update_schedule_session(session.id, session.to_row())
+
+    def delete(self, session_id):
+        self.db.delete_schedule_session(session_id)
+
+
+_RESULT_SELECT = ("SELECT competition_entries.id, competition_id, student_id, value, place, points, students.name "
+                  "FROM competition_entries JOIN students ON students.id = competition_entries.student_id "
+                  "WHERE competition_id = ?")
+
+
+class CompetitionRepository:
+    """Соревнования, протоколы и зачёт сезона"""
+    _SELECT = "SELECT id, name, date, department_id, result_type FROM competitions"
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_all(self):
+        """Соревнования от последнего к первому"""
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _competition_factory
+        return cursor.execute(self._SELECT + " ORDER BY date DESC, id DESC").fetchall()
+
+    def get(self, competition_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _competition_factory
+        return cursor.execute(self._SELECT + " WHERE id = ?", (competition_id,)).fetchone()
+
+    def add(self, competition):
+        """Сохраняет соревнование и возвращает его ID"""
+        competition.id = self.db.add_competition(competition.to_row())
+        return competition.id
+
+    def delete(self, competition_id):
+        self.db.delete_competition(competition_id)
+
+    def results(self, competition_id):
+        """Протокол соревнования: участники с результатом по местам, затем заявки без результата
+
+        :return: список объектов CompetitionResult
+        """
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _result_factory
+        # Участники с результатом читаются по индексу (competition_id, sort_key) уже по порядку мест
+        ranked = cursor.execute(_RESULT_SELECT + " AND sort_key IS NOT NULL ORDER BY sort_key, competition_entries.id",
+                                (competition_id,)).fetchall()
+        entered = cursor.execute(_RESULT_SELECT + " AND sort_key IS NULL ORDER BY students.name",
+                                 (competition_id,)).fetchall()
+        return ranked + entered
+
+    def set_result(self, competition_id, student_id, value):
+        """Записывает результат ученика; None — заявка без результата"""
+        self.db.set_competition_result(competition_id, student_id, value)
+
+    def remove_entry(self, competition_id, student_id):
+        self.db.remove_competition_entry(competition_id, student_id)
+
+    def seasons(self):
+        """Годы начала сезонов, в которых были соревнования, от последнего"""
+        return [row[0] for row in self.db.conn.execute("SELECT DISTINCT season FROM competitions ORDER BY season DESC")]
+
+    def standings(self, season, department_id=None, limit=None):
+        """Зачёт сезона отделения (None — соревнования без отделения)
+
+        :return: список кортежей (место, student_id, ФИО, очки, число соревнований с местом);
+            равные очки делят место
+        """
+        query = ("SELECT season_standings.student_id, students.name, points, events FROM season_standings "
+                 "JOIN students ON students.id = season_standings.student_id "
+                 "WHERE season = ? AND department_id = ? ORDER BY points DESC, season_standings.student_id")
+        params = [season, department_id or 0]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        table = []
+        for position, (student_id, name, points, events) in enumerate(self.db.conn.execute(query, params), start=1):
+            place = table[-1][0] if table and table[-1][3] == points else position
+            table.append((place, student_id, name, points, events))
+        return table
+
+
+class AttendanceRepository:
+    """Журналы посещаемости групп по месяцам"""
+    _SELECT = "SELECT group_id, month, coach_id, roster, sessions, marks FROM attendance_sheets"
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, group_id, month):
+        """Сохранённый журнал группы за месяц «ГГГГ-ММ» или None"""
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _sheet_factory
+        return cursor.execute(self._SELECT + " WHERE group_id = ? AND month = ?", (group_id, month)).fetchone()
+
+    def sheet(self, group_id, month):
+        """Журнал для заполнения: сохранённый, дополненный новыми учениками группы
+        и занятиями месяца по расписанию"""
+        sheet = self.get(group_id, month)
+        if sheet is None:
+            coach = self.db.conn.execute("SELECT coach_id FROM groups WHERE id = ?", (group_id,)).fetchone()
+            sheet = AttendanceSheet(group_id, month, coach[0] if coach else None)
+        for (student_id,) in self.db.conn.execute("SELECT id FROM students WHERE group_id = ? ORDER BY name, id",
+                                                  (group_id,)):
+            sheet.add_student(student_id)
+        start = date.fromisoformat(month + "-01")
+        end = (start + timedelta(days=31)).replace(day=1)
+        for occurrence in occurrences(ScheduleRepository(self.db).for_group(group_id), start, end):
+            sheet.add_session(occurrence.key)
+        return sheet
+
+    def save(self, sheet):
+        self.db.save_attendance_sheet(sheet.to_row())
+
+    def for_period(self, month_from, month_to):
+        """Журналы всех групп за месяцы [month_from, month_to)"""
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _sheet_factory
+        return cursor.execute(self._SELECT + " WHERE month >= ? AND month < ?", (month_from, month_to)).fetchall()
+
+    def season_report(self, season, until=None):
+        """Посещаемость за сезон по ученикам, группам и тренерам (см. utils.attendance.season_report)
+
+        :param until: учитывать занятия не позже этого момента (datetime), по умолчанию — сейчас
+        """
+        until = (until or datetime.now()).strftime("%Y-%m-%d %H:%M")
+        return season_report(self.for_period(f"{season}-{SEASON_START_MONTH:02d}",
+                                             f"{season + 1}-{SEASON_START_MONTH:02d}"), until)
+
+
+class UserRepository:
+    """Пользователи программы, их роли и вход"""
+    _SELECT = "SELECT id, login, password_hash, role_id, coach_id, department_id, active FROM users"
+
+    def __init__(self, db, iterations):
+        """
+        :param iterations: число итераций PBKDF2 для новых хэшей паролей (настройка [auth])
+        """
+        self.db = db
+        self.iterations = iterations
+        self._dummy_hash = None
+
+    def get_all(self):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _user_factory
+        return cursor.execute(self._SELECT + " ORDER BY login").fetchall()
+
+    def get(self, user_id):
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _user_factory
+        return cursor.execute(self._SELECT + " WHERE id = ?", (user_id,)).fetchone()
+
+    def get_by_login(self, login):
+        """Пользователь по логину без учёта регистра или None"""
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = _user_factory
+        return cursor.execute(self._SELECT + " WHERE login = ?", (login.strip(),)).fetchone()
+
+    def has_users(self):
+        """Есть ли хотя бы один пользователь; без них при первом запуске создаётся администратор"""
+        return self.db.conn.execute("SELECT EXISTS (SELECT 1 FROM users)").fetchone()[0] == 1
+
+    def roles(self):
+        """Роли: список кортежей (id, name, title, scope) в порядке создания"""
+        return self.db.conn.execute("SELECT id, name, title, scope FROM roles ORDER BY id").fetchall()
+
+    def role_id(self, name):
+        row = self.db.conn.execute("SELECT id FROM roles WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, user, password):
+        """Сохраняет нового пользователя с паролем и возвращает его ID
+
+        :raises sqlite3.IntegrityError: если логин уже занят
+        """
+        user.login = user.login.strip()
+        user.password_hash = hash_password(password, self.iterations)
+        user.id = self.db.add_user(user.to_row())
+        return user.id
+
+    def update(self, user):
+        """Сохраняет роль, привязки и признак активности пользователя"""
+        self.db.update_user(user.id, (user.role_id, user.coach_id, user.department_id, int(user.active)))
+
+    def set_password(self, user_id, password):
+        self.db.set_user_password(user_id, hash_password(password, self.iterations))
+
+    def authenticate(self, login, password):
+        """Проверяет логин и пароль и открывает сеанс.
+
+        Права роли читаются один раз и хранятся в сеансе. Хэш, посчитанный
+        с другим числом итераций, пересчитывается с текущей настройкой.
+        Для неизвестного логина пароль всё равно проверяется (с подставным
+        хэшем), чтобы по времени ответа нельзя было узнать, есть ли такой логин.
+
+        :return: объект Session или None, если вход не разрешён
+        """
+        user = self.get_by_login(login)
+        if user is None or not user.active:
+            if self._dummy_hash is None:
+                self._dummy_hash = hash_password("", self.iterations)
+            verify_password(password, self._dummy_hash)
+            return None
+        if not verify_password(password, user.password_hash):
+            return None
+        if needs_rehash(user.password_hash, self.iterations):
+            self.set_password(user.id, password)
+        return self.session(user)
+
+    def session(self, user):
+        """Сеанс пользователя: роль и все её права одним запросом"""
+        rows = self.db.conn.execute(
+            "SELECT roles.name, roles.title, roles.scope, role_permissions.permission FROM roles "
+            "LEFT JOIN role_permissions ON role_permissions.role_id = roles.id WHERE roles.id = ?",
+            (user.role_id,)).fetchall()
+        if not rows:
+            return None
+        name, title, scope, _ = rows[0]
+        return Session(user, name, title, scope, [row[3] for row in rows if row[3] is not None])
@@ -1,25 +1,35 @@
 -- database/schema.sql
-CREATE TABLE IF NOT EXISTS students (
+-- Справочная схема. Реальная база создаётся и обновляется миграциями из database/migrations.py
+CREATE TABLE IF NOT EXISTS departments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS coaches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name TEXT NOT NULL DEFAULT '',
+    last_name TEXT NOT NULL,
+    middle_name TEXT NOT NULL DEFAULT '',
+    phone TEXT DEFAULT '',
+    email TEXT DEFAULT '',
+    department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+    UNIQUE (last_name, first_name, middle_name)
+);
+
+CREATE TABLE IF NOT EXISTS groups (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL,
-    age INTEGER,
-    birth_date TEXT,
-    department TEXT,
-    group_name TEXT,
-    coach TEXT,
-    school TEXT,
-    rank TEXT,
-    rank_date TEXT,
-    snils TEXT,
-    passport TEXT,
-    enrollment_date TEXT,
-    medical_clearance BOOLEAN DEFAULT 0
+    department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+    coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL
 );
+CREATE UNIQUE INDEX IF NOT EXISTS idx_groups_department_name ON groups(IFNULL(department_id, 0), name);
+CREATE INDEX IF NOT EXISTS idx_groups_coach ON groups(coach_id);
+CREATE INDEX IF NOT EXISTS idx_coaches_department ON coaches(department_id);
 
 CREATE TABLE IF NOT EXISTS students (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL,
-    age INTEGER,
+    age INTEGER,  -- не заполняется: возраст считается в запросе по birth_date
     birth_date TEXT,
     department TEXT,
     group_name TEXT,
@@ -29,14 +39,193 @@ CREATE TABLE IF NOT EXISTS students (
     rank_date TEXT,
     snils TEXT,
     passport TEXT,
-    enrollment_date TEXT
+    enrollment_date TEXT,
+    medical_clearance BOOLEAN DEFAULT 0,
+    group_id INTEGER REFERENCES groups(id) ON DELETE SET NULL
 );
+CREATE INDEX IF NOT EXISTS idx_students_department ON students(department);
+CREATE INDEX IF NOT EXISTS idx_students_school ON students(school);
+CREATE INDEX IF NOT EXISTS idx_students_rank ON students(rank);
+CREATE INDEX IF NOT EXISTS idx_students_group_name ON students(group_name);
+CREATE INDEX IF NOT EXISTS idx_students_medical_clearance ON students(medical_clearance);
+CREATE INDEX IF NOT EXISTS idx_students_name ON students(name);
+CREATE INDEX IF NOT EXISTS idx_students_coach ON students(coach);
+CREATE INDEX IF NOT EXISTS idx_students_birth_date ON students(birth_date);
+CREATE INDEX IF NOT EXISTS idx_students_rank_date ON students(rank_date);
+CREATE INDEX IF NOT EXISTS idx_students_enrollment_date ON students(enrollment_date);
+CREATE INDEX IF NOT EXISTS idx_students_snils ON students(snils);
+CREATE INDEX IF NOT EXISTS idx_students_group_id ON students(group_id);
+CREATE INDEX IF NOT EXISTS idx_students_department_name ON students(department, name);
+CREATE INDEX IF NOT EXISTS idx_students_department_birth_date ON students(department, birth_date);
+CREATE INDEX IF NOT EXISTS idx_students_department_enrollment_date ON students(department, enrollment_date);
 
 CREATE TABLE IF NOT EXISTS medical_exams (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    student_id INTEGER,
-    exam_date TEXT,
-    results TEXT,
-    clearance BOOLEAN,
-    FOREIGN KEY (student_id) REFERENCES students(id)
-);
\ No newline at end of file
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    examination_date TEXT NOT NULL,
+    result TEXT NOT NULL DEFAULT '',
+    clearance BOOLEAN NOT NULL DEFAULT 0,
+    next_examination_date TEXT,
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_medical_exams_student_date ON medical_exams(student_id, examination_date);
+
+-- Последний медосмотр каждого ученика, поддерживается триггерами medical_status_*
+CREATE TABLE IF NOT EXISTS medical_status (
+    student_id INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    exam_id INTEGER NOT NULL,
+    examination_date TEXT NOT NULL,
+    clearance BOOLEAN NOT NULL,
+    next_examination_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_medical_status_examination_date ON medical_status(examination_date);
+CREATE INDEX IF NOT EXISTS idx_medical_status_next_date ON medical_status(next_examination_date);
+CREATE INDEX IF NOT EXISTS idx_medical_status_clearance ON medical_status(clearance, next_examination_date);
+CREATE TRIGGER IF NOT EXISTS medical_status_ai AFTER INSERT ON medical_exams BEGIN
+    DELETE FROM medical_status WHERE student_id = new.student_id;
+    INSERT INTO medical_status (student_id, exam_id, examination_date, clearance, next_examination_date)
+    SELECT student_id, id, examination_date, clearance, next_examination_date FROM medical_exams
+    WHERE student_id = new.student_id ORDER BY examination_date DESC, id DESC LIMIT 1;
+END;
+CREATE TRIGGER IF NOT EXISTS medical_status_ad AFTER DELETE ON medical_exams BEGIN
+    DELETE FROM medical_status WHERE student_id = old.student_id;
+    INSERT INTO medical_status (student_id, exam_id, examination_date, clearance, next_examination_date)
+    SELECT student_id, id, examination_date, clearance, next_examination_date FROM medical_exams
+    WHERE student_id = old.student_id ORDER BY examination_date DESC, id DESC LIMIT 1;
+END;
+CREATE TRIGGER IF NOT EXISTS medical_status_au AFTER UPDATE ON medical_exams BEGIN
+    DELETE FROM medical_status WHERE student_id = old.student_id;
+    INSERT INTO medical_status (student_id, exam_id, examination_date, clearance, next_examination_date)
+    SELECT student_id, id, examination_date, clearance, next_examination_date FROM medical_exams
+    WHERE student_id = old.student_id ORDER BY examination_date DESC, id DESC LIMIT 1;
+    DELETE FROM medical_status WHERE student_id = new.student_id;
+    INSERT INTO medical_status (student_id, exam_id, examination_date, clearance, next_examination_date)
+    SELECT student_id, id, examination_date, clearance, next_examination_date FROM medical_exams
+    WHERE student_id = new.student_id ORDER BY examination_date DESC, id DESC LIMIT 1;
+END;
+
+CREATE TABLE IF NOT EXISTS halls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+
+-- Еженедельные занятия групп; время в минутах от полуночи, valid_to включительно
+CREATE TABLE IF NOT EXISTS schedule_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_id INTEGER NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+    coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+    hall_id INTEGER REFERENCES halls(id) ON DELETE SET NULL,
+    weekday INTEGER NOT NULL CHECK (weekday BETWEEN 0 AND 6),
+    start_minute INTEGER NOT NULL CHECK (start_minute >= 0),
+    end_minute INTEGER NOT NULL CHECK (end_minute <= 1440 AND end_minute > start_minute),
+    valid_from TEXT NOT NULL,
+    valid_to TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_schedule_group ON schedule_sessions(group_id, weekday, start_minute);
+CREATE INDEX IF NOT EXISTS idx_schedule_coach ON schedule_sessions(coach_id, weekday, start_minute);
+CREATE INDEX IF NOT EXISTS idx_schedule_hall ON schedule_sessions(hall_id, weekday, start_minute);
+
+CREATE TABLE IF NOT EXISTS competitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+    result_type TEXT NOT NULL CHECK (result_type IN ('time', 'weight', 'score', 'place'))
+);
+CREATE INDEX IF NOT EXISTS idx_competitions_date ON competitions(date);
+
+-- sort_key: результат со знаком, при котором лучший результат меньше
+CREATE TABLE IF NOT EXISTS competition_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    competition_id INTEGER NOT NULL REFERENCES competitions(id) ON DELETE CASCADE,
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    value REAL,
+    sort_key REAL,
+    place INTEGER,
+    points INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (competition_id, student_id)
+);
+CREATE INDEX IF NOT EXISTS idx_competition_entries_rank ON competition_entries(competition_id, sort_key);
+CREATE INDEX IF NOT EXISTS idx_competition_entries_student ON competition_entries(student_id);
+
+-- Зачёт сезона по отделениям, обновляется на разницу очков при изменении мест
+CREATE TABLE IF NOT EXISTS season_standings (
+    season INTEGER NOT NULL,
+    department_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    points INTEGER NOT NULL DEFAULT 0,
+    events INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (season, department_id, student_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_season_standings_points ON season_standings(season, department_id, points DESC);
+CREATE INDEX IF NOT EXISTS idx_season_standings_student ON season_standings(student_id);
+-- Соревнования удалённого отделения остаются без отделения, их очки переходят в department_id = 0
+CREATE TRIGGER IF NOT EXISTS departments_standings_ad AFTER DELETE ON departments BEGIN
+    INSERT INTO season_standings (season, department_id, student_id, points, events)
+    SELECT season, 0, student_id, points, events FROM season_standings WHERE department_id = old.id
+    ON CONFLICT (season, department_id, student_id) DO UPDATE
+    SET points = points + excluded.points, events = events + excluded.events;
+    DELETE FROM season_standings WHERE department_id = old.id;
+END;
+
+-- Журнал посещаемости группы за месяц: JSON-списки учеников и занятий и битовые строки отметок
+CREATE TABLE IF NOT EXISTS attendance_sheets (
+    group_id INTEGER NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+    month TEXT NOT NULL,
+    coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+    roster TEXT NOT NULL DEFAULT '[]',
+    sessions TEXT NOT NULL DEFAULT '[]',
+    marks BLOB NOT NULL DEFAULT x'',
+    PRIMARY KEY (group_id, month)
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_sheets_month ON attendance_sheets(month);
+
+-- Роли пользователей и их права; scope — какие ученики видны: все, отделения или групп тренера.
+-- Начальный набор ролей добавляет миграция _create_users
+CREATE TABLE IF NOT EXISTS roles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    scope TEXT NOT NULL DEFAULT 'all' CHECK (scope IN ('all', 'department', 'coach'))
+);
+CREATE TABLE IF NOT EXISTS role_permissions (
+    role_id INTEGER NOT NULL REFERENCES roles(id) ON DELETE CASCADE,
+    permission TEXT NOT NULL,
+    PRIMARY KEY (role_id, permission)
+) WITHOUT ROWID;
+
+-- Пользователи; пароль — хэш PBKDF2 вида pbkdf2_sha256$итерации$соль$хэш
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    password_hash TEXT NOT NULL,
+    role_id INTEGER NOT NULL REFERENCES roles(id),
+    coach_id INTEGER REFERENCES coaches(id) ON DELETE SET NULL,
+    department_id INTEGER REFERENCES departments(id) ON DELETE SET NULL,
+    active BOOLEAN NOT NULL DEFAULT 1
+);
+
+-- Журнал изменений students и medical_exams, только дополняется. Записи делают триггеры
+-- <таблица>_journal_i/u/d, которые миграция _create_change_journal строит по списку колонок:
+-- добавление — без значений, изменение — JSON старых и новых значений изменившихся колонок,
+-- удаление — JSON непустых старых значений. user_id записи даёт функция current_user_id(),
+-- которую database.connection.ConnectionManager регистрирует на каждом соединении
+CREATE TABLE IF NOT EXISTS change_journal (
+    seq INTEGER PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    action TEXT NOT NULL CHECK (action IN ('insert', 'update', 'delete')),
+    old_values TEXT,
+    new_values TEXT,
+    user_id INTEGER,
+    changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_change_journal_row ON change_journal(table_name, row_id);
+CREATE TRIGGER IF NOT EXISTS change_journal_no_update BEFORE UPDATE ON change_journal BEGIN
+    SELECT RAISE(ABORT, 'change_journal только дополняется');
+END;
+CREATE TRIGGER IF NOT EXISTS change_journal_no_delete BEFORE DELETE ON change_journal BEGIN
+    SELECT RAISE(ABORT, 'change_journal только дополняется');
+END;
+
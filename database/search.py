@@ -0,0 +1,36 @@
+# database/search.py
+"""Полнотекстовый поиск учеников по имени (FTS5).
+
+Имена в индексе и в запросе приводятся к одному виду: регистр снимает токенизатор
+unicode61, а «ё» заменяется на «е» здесь и в триггерах students_fts_*.
+"""
+import re
+
+_WORD = re.compile(r'\w+')
+
+
+def fold_name(text):
+    return text.lower().replace('ё', 'е')
+
+
+def search_terms(text):
+    """Слова поискового запроса в нормализованном виде"""
+    return _WORD.findall(fold_name(text or ''))
+
+
+def build_match_query(text):
+    """Строка для MATCH: каждое слово ищется как префикс, все слова обязательны.
+
+    Returns:
+        str | None: выражение FTS5 или None, если в тексте нет ни одного слова
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def matches_name(name, text):
+    """Та же проверка, что и MATCH, но для одной строки в памяти"""
+    words = search_terms(name)
+    return all(any(word.startswith(term) for word in words) for term in search_terms(text))
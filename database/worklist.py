@@ -0,0 +1,75 @@
+# database/worklist.py
+"""Список учеников, у которых истекает или уже истёк допуск по медосмотру."""
+from datetime import date, timedelta
+
+from database.db_manager import STUDENT_FIELDS_SQL
+
+# Срок следующего осмотра берётся из сводки medical_status (последний осмотр ученика).
+# Условие по next_examination_date — диапазон индекса idx_medical_status_next_date,
+# поэтому чтение очереди не перебирает всех учеников
+_DUE_SELECT = (f"SELECT {STUDENT_FIELDS_SQL}, medical_status.next_examination_date "
+               "FROM medical_status JOIN students ON students.id = medical_status.student_id")
+_DUE_COUNT = "SELECT COUNT(*) FROM medical_status"
+
+
+def _bounds(low, high):
+    conditions, params = ["next_examination_date IS NOT NULL"], []
+    if low is not None:
+        conditions.append("next_examination_date >= ?")
+        params.append(low)
+    if high is not None:
+        conditions.append("next_examination_date < ?")
+        params.append(high)
+    return " WHERE " + " AND ".join(conditions), params
+
+
+class MedicalWorklist:
+    """Очередь медосмотров по сроку следующего осмотра.
+
+    Сводку medical_status поддерживают триггеры medical_exams, поэтому новый
+    осмотр сразу перемещает ученика в очереди. Просроченные — срок раньше
+    сегодняшнего дня, «скоро» — срок в ближайшие due_days дней, включая сегодня.
+    """
+
+    def __init__(self, db, due_days=30):
+        self.db = db
+        self.due_days = due_days
+
+    def due_range(self, today=None, days=None):
+        """Полуинтервал дат ГГГГ-ММ-ДД (от, до) для «скоро истекает», он же фильтр medical_due"""
+        today = today or date.today()
+        end = today + timedelta(days=self.due_days if days is None else days)
+        return today.isoformat(), end.isoformat()
+
+    def _read(self, low, high, limit):
+        where, params = _bounds(low, high)
+        sql = _DUE_SELECT + where + " ORDER BY medical_status.next_examination_date, medical_status.student_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.db.reader.execute(sql, params).fetchall()
+
+    def _count(self, low, high):
+        where, params = _bounds(low, high)
+        return self.db.reader.execute(_DUE_COUNT + where, params).fetchone()[0]
+
+    def overdue(self, today=None, limit=None):
+        """Строки учеников с просроченным осмотром, от самого давнего срока.
+
+        Returns:
+            list: Строки в порядке STUDENT_FIELDS, последним полем — срок осмотра
+        """
+        return self._read(None, (today or date.today()).isoformat(), limit)
+
+    def due_soon(self, today=None, days=None, limit=None):
+        """Строки учеников, чей срок наступает в ближайшие дни, от ближайшего срока"""
+        return self._read(*self.due_range(today, days), limit)
+
+    def counts(self, today=None, days=None):
+        """Число просроченных и число истекающих осмотров.
+
+        Returns:
+            tuple: (overdue, due_soon)
+        """
+        low, high = self.due_range(today, days)
+        return self._count(None, low), self._count(low, high)
@@ -1,10 +1,25 @@
 # main.py
 import sys
 from PyQt5.QtWidgets import QApplication
+from database.db_manager import DatabaseManager
+from database.repositories import UserRepository
+from ui.forms.login_form import LoginForm
 from ui.forms.main_window import MainWindow
+from utils.config import auth_settings
+from utils.logger import log_uncaught_exceptions, setup_logging, shutdown_logging
 
 if __name__ == '__main__':
+    setup_logging()
+    log_uncaught_exceptions()
     app = QApplication(sys.argv)
-    window = MainWindow()
+    db = DatabaseManager()
+    login = LoginForm(UserRepository(db, auth_settings()["iterations"]))
+    if not login.exec_():
+        db.close()
+        shutdown_logging()
+        sys.exit(0)
+    window = MainWindow(db, login.session)
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    code = app.exec_()
+    shutdown_logging()
+    sys.exit(code)
@@ -0,0 +1,110 @@
+import json
+
+from utils.attendance import longest_run
+
+
+class AttendanceSheet:
+    """Журнал посещаемости группы за месяц.
+
+    Отметки ученика — целое число, в котором бит i означает присутствие на
+    i-м занятии месяца (занятия упорядочены по времени). Ученики только
+    добавляются в конец журнала; занятие, внесённое задним числом, встаёт
+    на своё место по времени со сдвигом битов последующих занятий. В базе
+    отметки хранятся одним BLOB: строки учеников фиксированной ширины подряд.
+    """
+
+    def __init__(self, group_id=None, month="", coach_id=None, roster=None, sessions=None, marks=None):
+        """Инициализация журнала
+
+        Args:
+            group_id (int, optional): ID группы. Defaults to None.
+            month (str, optional): Месяц «ГГГГ-ММ». Defaults to "".
+            coach_id (int, optional): ID тренера группы в этом месяце. Defaults to None.
+            roster (list, optional): ID учеников в порядке строк. Defaults to None.
+            sessions (list, optional): Занятия «ГГГГ-ММ-ДД ЧЧ:ММ» по возрастанию. Defaults to None.
+            marks (list, optional): Битовые маски отметок по строкам roster. Defaults to None.
+        """
+        self.group_id = group_id
+        self.month = month
+        self.coach_id = coach_id
+        self.roster = list(roster or [])
+        self.sessions = list(sessions or [])
+        self.marks = list(marks or [0] * len(self.roster))
+        self._positions = {student_id: position for position, student_id in enumerate(self.roster)}
+
+    def add_student(self, student_id):
+        """Добавляет ученика в конец журнала; возвращает номер его строки"""
+        if student_id not in self._positions:
+            self._positions[student_id] = len(self.roster)
+            self.roster.append(student_id)
+            self.marks.append(0)
+        return self._positions[student_id]
+
+    def add_session(self, key):
+        """Вставляет занятие по порядку времени, сдвигая биты последующих занятий"""
+        if key in self.sessions:
+            return self.sessions.index(key)
+        position = sum(1 for session in self.sessions if session < key)
+        self.sessions.insert(position, key)
+        low = (1 << position) - 1
+        self.marks = [(bits & low) | ((bits >> position) << (position + 1)) for bits in self.marks]
+        return position
+
+    def is_present(self, student_id, session):
+        position = self._positions.get(student_id)
+        return position is not None and bool(self.marks[position] >> session & 1)
+
+    def mark(self, student_id, session, present=True):
+        """Отмечает присутствие (или отсутствие) ученика на занятии с номером session"""
+        position = self.add_student(student_id)
+        if present:
+            self.marks[position] |= 1 << session
+        else:
+            self.marks[position] &= ~(1 << session)
+
+    def attended(self, student_id):
+        """Число посещённых занятий"""
+        position = self._positions.get(student_id)
+        return self.marks[position].bit_count() if position is not None else 0
+
+    def session_counts(self):
+        """Число присутствовавших на каждом занятии"""
+        return [sum(bits >> session & 1 for bits in self.marks) for session in range(len(self.sessions))]
+
+    def total(self):
+        """Посещения всех учеников и число возможных посещений (учеников × занятий)"""
+        return sum(bits.bit_count() for bits in self.marks), len(self.roster) * len(self.sessions)
+
+    def longest_streak(self, student_id):
+        position = self._positions.get(student_id)
+        return longest_run(self.marks[position]) if position is not None else 0
+
+    def to_row(self):
+        """Значения для записи в таблицу attendance_sheets
+
+        Returns:
+            tuple: (group_id, month, coach_id, roster, sessions, marks): списки в JSON,
+                отметки — BLOB из строк по ceil(занятий / 8) байт
+        """
+        width = (len(self.sessions) + 7) // 8
+        blob = b"".join(bits.to_bytes(width, "little") for bits in self.marks)
+        return (self.group_id, self.month, self.coach_id, json.dumps(self.roster),
+                json.dumps(self.sessions), blob)
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание журнала из строки таблицы attendance_sheets
+
+        Args:
+            row (tuple): Строка результата запроса (group_id, month, coach_id, roster, sessions, marks)
+
+        Returns:
+            AttendanceSheet: Журнал
+        """
+        group_id, month, coach_id, roster, sessions, blob = row
+        roster = json.loads(roster)
+        sessions = json.loads(sessions)
+        width = (len(sessions) + 7) // 8
+        marks = [int.from_bytes(blob[position * width:(position + 1) * width], "little")
+                 for position in range(len(roster))]
+        return cls(group_id, month, coach_id, roster, sessions, marks)
@@ -0,0 +1,48 @@
+import json
+
+
+class Change:
+    """Запись журнала изменений change_journal"""
+
+    def __init__(self, seq=None, table_name="", row_id=None, action="", old_values=None, new_values=None,
+                 user_id=None, changed_at=""):
+        """Инициализация записи журнала
+
+        Args:
+            seq (int, optional): Порядковый номер записи. Defaults to None.
+            table_name (str, optional): Таблица изменённой строки. Defaults to "".
+            row_id (int, optional): ID строки. Defaults to None.
+            action (str, optional): "insert", "update" или "delete". Defaults to "".
+            old_values (dict, optional): Прежние значения изменившихся колонок. Defaults to None.
+            new_values (dict, optional): Новые значения изменившихся колонок. Defaults to None.
+            user_id (int, optional): ID пользователя, сделавшего изменение. Defaults to None.
+            changed_at (str, optional): Время изменения «ГГГГ-ММ-ДД ЧЧ:ММ:СС.ссс». Defaults to "".
+        """
+        self.seq = seq
+        self.table_name = table_name
+        self.row_id = row_id
+        self.action = action
+        self.old_values = old_values or {}
+        self.new_values = new_values or {}
+        self.user_id = user_id
+        self.changed_at = changed_at
+
+    @property
+    def columns(self):
+        """Колонки, затронутые изменением, по алфавиту"""
+        return sorted(set(self.old_values) | set(self.new_values))
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание записи из строки таблицы change_journal
+
+        Args:
+            row (tuple): Строка результата запроса (seq, table_name, row_id, action, old_values,
+                new_values, user_id, changed_at); значения — JSON-объекты или NULL
+
+        Returns:
+            Change: Запись журнала
+        """
+        seq, table_name, row_id, action, old_values, new_values, user_id, changed_at = row
+        return cls(seq, table_name, row_id, action, json.loads(old_values) if old_values else None,
+                   json.loads(new_values) if new_values else None, user_id, changed_at)
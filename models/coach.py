@@ -68,3 +68,15 @@ class Coach:
             email=data.get('email', ''),
             department_id=data.get('department_id')
         )
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы coaches
+
+        Args:
+            row (tuple): Строка результата запроса (id, first_name, last_name, middle_name, phone, email, department_id)
+
+        Returns:
+            Coach: Объект тренера
+        """
+        return cls(*row)
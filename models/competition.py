@@ -0,0 +1,149 @@
+from datetime import datetime
+
+from utils.dates import from_storage, season_of, to_storage
+
+# Форматы результата: название и направление — меньше лучше (время, место) или больше лучше
+RESULT_TYPES = {
+    "time": ("Время", True),
+    "weight": ("Вес, кг", False),
+    "score": ("Баллы", False),
+    "place": ("Место", True),
+}
+# Очки в зачёт сезона за места 1–15; дальше очков нет
+PLACE_POINTS = (25, 20, 16, 13, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1)
+
+
+def points_for_place(place):
+    """Очки сезона за место в соревновании; 0 без места"""
+    if place is None or place > len(PLACE_POINTS):
+        return 0
+    return PLACE_POINTS[place - 1]
+
+
+def sort_key(result_type, value):
+    """Ключ ранжирования: у лучшего результата наименьший ключ"""
+    if value is None:
+        return None
+    return value if RESULT_TYPES[result_type][1] else -value
+
+
+def parse_result(result_type, text):
+    """Разбирает введённый результат в число для хранения.
+
+    Время вводится как «сс.сс», «мм:сс.сс» или «чч:мм:сс» и хранится в секундах,
+    место — целым числом, вес и баллы — числом; запятая допускается вместо точки.
+
+    Raises:
+        ValueError: если результат не разобран
+    """
+    if result_type not in RESULT_TYPES:
+        raise ValueError(f"Неизвестный формат результата: {result_type}")
+    text = text.strip().replace(",", ".")
+    try:
+        if result_type == "time":
+            seconds = 0.0
+            for part in text.split(":"):
+                seconds = seconds * 60 + float(part)
+            value = seconds
+        elif result_type == "place":
+            value = int(text)
+        else:
+            value = float(text)
+    except ValueError:
+        raise ValueError(f"Некорректный результат: {text!r}") from None
+    if value < 0 or (result_type == "place" and value == 0):
+        raise ValueError(f"Некорректный результат: {text!r}")
+    return value
+
+
+def format_result(result_type, value):
+    """Результат для отображения; "" без результата"""
+    if value is None:
+        return ""
+    if result_type == "time":
+        minutes, seconds = divmod(value, 60)
+        hours, minutes = divmod(int(minutes), 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:05.2f}"
+        return f"{minutes}:{seconds:05.2f}" if minutes else f"{seconds:.2f}"
+    if result_type == "place":
+        return str(int(value))
+    return f"{value:g}"
+
+
+class Competition:
+    """Модель соревнования"""
+
+    def __init__(self, id=None, name="", date=None, department_id=None, result_type="place"):
+        """Инициализация объекта соревнования
+
+        Args:
+            id (int, optional): ID соревнования. Defaults to None.
+            name (str, optional): Название. Defaults to "".
+            date (datetime.date, optional): Дата проведения. Defaults to None (сегодня).
+            department_id (int, optional): ID отделения (вида спорта). Defaults to None.
+            result_type (str, optional): Формат результата из RESULT_TYPES. Defaults to "place".
+        """
+        self.id = id
+        self.name = name
+        self.date = date if date else datetime.now().date()
+        self.department_id = department_id
+        self.result_type = result_type
+
+    @property
+    def season(self):
+        """Год начала сезона, в зачёт которого идёт соревнование"""
+        return season_of(self.date)
+
+    def to_row(self):
+        """Значения для записи в таблицу competitions (без ID)
+
+        Returns:
+            tuple: (name, date, season, department_id, result_type)
+        """
+        return self.name, to_storage(self.date), self.season, self.department_id, self.result_type
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы competitions
+
+        Args:
+            row (tuple): Строка результата запроса (id, name, date, department_id, result_type)
+
+        Returns:
+            Competition: Объект соревнования
+        """
+        competition = cls.__new__(cls)
+        competition.id, competition.name, date, competition.department_id, competition.result_type = row
+        competition.date = from_storage(date)
+        return competition
+
+
+class CompetitionResult:
+    """Участник соревнования с результатом и местом"""
+
+    def __init__(self, id=None, competition_id=None, student_id=None, value=None, place=None,
+                 points=0, student_name=""):
+        """Инициализация объекта результата
+
+        Args:
+            id (int, optional): ID заявки. Defaults to None.
+            competition_id (int, optional): ID соревнования. Defaults to None.
+            student_id (int, optional): ID ученика. Defaults to None.
+            value (float, optional): Результат в единицах формата; None — результата нет. Defaults to None.
+            place (int, optional): Место; None — результата нет. Defaults to None.
+            points (int, optional): Очки в зачёт сезона. Defaults to 0.
+            student_name (str, optional): ФИО ученика для отображения. Defaults to "".
+        """
+        self.id = id
+        self.competition_id = competition_id
+        self.student_id = student_id
+        self.value = value
+        self.place = place
+        self.points = points
+        self.student_name = student_name
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки запроса (id, competition_id, student_id, value, place, points, student_name)"""
+        return cls(*row)
@@ -1,6 +1,8 @@
 # Файл models/student.py
 from PyQt5.QtCore import QDate
-from datetime import datetime
+from datetime import date, datetime
+
+from utils.dates import age_on, from_storage, to_storage
 
 
 class Student:
@@ -60,17 +62,7 @@ class Student:
         Returns:
             int: Возраст в годах
         """
-        if not self.birth_date:
-            return 0
-
-        today = datetime.now().date()
-        age = today.year - self.birth_date.year
-
-        # Проверка, был ли уже день рождения в этом году
-        if (today.month, today.day) < (self.birth_date.month, self.birth_date.day):
-            age -= 1
-
-        return age
+        return age_on(self.birth_date, date.today())
 
     def to_dict(self):
         """Преобразование в словарь для сохранения в БД
@@ -83,16 +75,15 @@ class Student:
             'first_name': self.first_name,
             'last_name': self.last_name,
             'middle_name': self.middle_name,
-            'birth_date': self.birth_date.strftime('%Y-%m-%d') if self.birth_date else None,
+            'birth_date': to_storage(self.birth_date),
             'group_id': self.group_id,
             'coach_id': self.coach_id,
             'educational_institution': self.educational_institution,
             'sports_rank': self.sports_rank,
-            'rank_assignment_date': self.rank_assignment_date.strftime(
-                '%Y-%m-%d') if self.rank_assignment_date else None,
+            'rank_assignment_date': to_storage(self.rank_assignment_date),
             'snils': self.snils,
             'passport_data': self.passport_data,
-            'enrollment_date': self.enrollment_date.strftime('%Y-%m-%d') if self.enrollment_date else None
+            'enrollment_date': to_storage(self.enrollment_date)
         }
 
     @classmethod
@@ -110,17 +101,15 @@ class Student:
             first_name=data.get('first_name', ''),
             last_name=data.get('last_name', ''),
             middle_name=data.get('middle_name', ''),
-            birth_date=datetime.strptime(data.get('birth_date'), '%Y-%m-%d').date() if data.get('birth_date') else None,
+            birth_date=from_storage(data.get('birth_date')),
             group_id=data.get('group_id'),
             coach_id=data.get('coach_id'),
             educational_institution=data.get('educational_institution', ''),
             sports_rank=data.get('sports_rank', ''),
-            rank_assignment_date=datetime.strptime(data.get('rank_assignment_date'), '%Y-%m-%d').date() if data.get(
-                'rank_assignment_date') else None,
+            rank_assignment_date=from_storage(data.get('rank_assignment_date')),
             snils=data.get('snils', ''),
             passport_data=data.get('passport_data', ''),
-            enrollment_date=datetime.strptime(data.get('enrollment_date'), '%Y-%m-%d').date() if data.get(
-                'enrollment_date') else None
+            enrollment_date=from_storage(data.get('enrollment_date'))
         )
 
 
@@ -162,4 +151,16 @@ class Department:
         return cls(
             id=data.get('id'),
             name=data.get('name', '')
-        )
\ No newline at end of file
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы departments
+
+        Args:
+            row (tuple): Строка результата запроса (id, name)
+
+        Returns:
+            Department: Объект отделения
+        """
+        return cls(*row)
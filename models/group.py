@@ -43,4 +43,16 @@ class Group:
             name=data.get('name', ''),
             department_id=data.get('department_id'),
             coach_id=data.get('coach_id')
-        )
\ No newline at end of file
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы groups
+
+        Args:
+            row (tuple): Строка результата запроса (id, name, department_id, coach_id)
+
+        Returns:
+            Group: Объект группы
+        """
+        return cls(*row)
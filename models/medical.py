@@ -1,11 +1,23 @@
 from datetime import datetime
 
+from utils.dates import add_months, from_storage, to_storage
+
+# Срок действия допуска, если дата следующего осмотра не указана
+EXAM_VALID_MONTHS = 6
+
+
+def default_next_date(examination_date):
+    """Дата следующего осмотра по умолчанию для date или значения колонки базы (в том же виде)"""
+    if isinstance(examination_date, str):
+        return to_storage(add_months(from_storage(examination_date), EXAM_VALID_MONTHS))
+    return add_months(examination_date, EXAM_VALID_MONTHS)
+
 
 class MedicalExamination:
     """Модель углубленного медицинского осмотра (УМО)"""
 
     def __init__(self, id=None, student_id=None, examination_date=None,
-                 result="", next_examination_date=None, notes=""):
+                 result="", next_examination_date=None, notes="", clearance=False):
         """Инициализация объекта медосмотра
 
         Args:
@@ -15,6 +27,7 @@ class MedicalExamination:
             result (str, optional): Результат осмотра. Defaults to "".
             next_examination_date (datetime.date, optional): Дата следующего осмотра. Defaults to None.
             notes (str, optional): Примечания. Defaults to "".
+            clearance (bool, optional): Допуск к тренировкам по итогам осмотра. Defaults to False.
         """
         self.id = id
         self.student_id = student_id
@@ -22,6 +35,7 @@ class MedicalExamination:
         self.result = result
         self.next_examination_date = next_examination_date
         self.notes = notes
+        self.clearance = clearance
 
     def to_dict(self):
         """Преобразование в словарь для сохранения в БД
@@ -32,11 +46,11 @@ class MedicalExamination:
         return {
             'id': self.id,
             'student_id': self.student_id,
-            'examination_date': self.examination_date.strftime('%Y-%m-%d') if self.examination_date else None,
+            'examination_date': to_storage(self.examination_date),
             'result': self.result,
-            'next_examination_date': self.next_examination_date.strftime(
-                '%Y-%m-%d') if self.next_examination_date else None,
-            'notes': self.notes
+            'next_examination_date': to_storage(self.next_examination_date),
+            'notes': self.notes,
+            'clearance': self.clearance
         }
 
     @classmethod
@@ -52,10 +66,37 @@ class MedicalExamination:
         return cls(
             id=data.get('id'),
             student_id=data.get('student_id'),
-            examination_date=datetime.strptime(data.get('examination_date'), '%Y-%m-%d').date() if data.get(
-                'examination_date') else None,
+            examination_date=from_storage(data.get('examination_date')),
             result=data.get('result', ''),
-            next_examination_date=datetime.strptime(data.get('next_examination_date'), '%Y-%m-%d').date() if data.get(
-                'next_examination_date') else None,
-            notes=data.get('notes', '')
-        )
\ No newline at end of file
+            next_examination_date=from_storage(data.get('next_examination_date')),
+            notes=data.get('notes', ''),
+            clearance=bool(data.get('clearance', False))
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы medical_exams
+
+        Args:
+            row (tuple): Строка результата запроса (id, student_id, examination_date,
+                result, clearance, next_examination_date, notes)
+
+        Returns:
+            MedicalExamination: Объект медосмотра
+        """
+        exam = cls.__new__(cls)
+        (exam.id, exam.student_id, examination_date, exam.result, clearance,
+         next_examination_date, exam.notes) = row
+        exam.examination_date = from_storage(examination_date)
+        exam.next_examination_date = from_storage(next_examination_date)
+        exam.clearance = bool(clearance)
+        return exam
+
+    def to_row(self):
+        """Значения для записи в таблицу medical_exams (без ID)
+
+        Returns:
+            tuple: (student_id, examination_date, result, clearance, next_examination_date, notes)
+        """
+        return (self.student_id, to_storage(self.examination_date), self.result,
+                1 if self.clearance else 0, to_storage(self.next_examination_date), self.notes)
\ No newline at end of file
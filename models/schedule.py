@@ -0,0 +1,105 @@
+from datetime import datetime, time, timedelta
+
+from utils.dates import from_storage, to_storage
+
+WEEKDAYS = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье")
+
+
+def format_minutes(minutes):
+    """Время «ЧЧ:ММ» по числу минут от полуночи"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class ScheduleSession:
+    """Модель еженедельного занятия группы"""
+
+    def __init__(self, id=None, group_id=None, coach_id=None, hall_id=None, weekday=0,
+                 start_minute=0, end_minute=0, valid_from=None, valid_to=None):
+        """Инициализация объекта занятия
+
+        Args:
+            id (int, optional): ID занятия. Defaults to None.
+            group_id (int, optional): ID группы. Defaults to None.
+            coach_id (int, optional): ID тренера. Defaults to None.
+            hall_id (int, optional): ID зала. Defaults to None.
+            weekday (int, optional): День недели, 0 — понедельник. Defaults to 0.
+            start_minute (int, optional): Начало, минут от полуночи. Defaults to 0.
+            end_minute (int, optional): Окончание, минут от полуночи. Defaults to 0.
+            valid_from (datetime.date, optional): Первый день действия. Defaults to None (сегодня).
+            valid_to (datetime.date, optional): Последний день действия включительно. Defaults to None.
+        """
+        self.id = id
+        self.group_id = group_id
+        self.coach_id = coach_id
+        self.hall_id = hall_id
+        self.weekday = weekday
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.valid_from = valid_from if valid_from else datetime.now().date()
+        self.valid_to = valid_to
+
+    @property
+    def time_range(self):
+        """Время занятия
+
+        Returns:
+            str: «ЧЧ:ММ–ЧЧ:ММ»
+        """
+        return f"{format_minutes(self.start_minute)}–{format_minutes(self.end_minute)}"
+
+    def active_on(self, day):
+        """Действует ли занятие в указанный день (без учёта дня недели)"""
+        return self.valid_from <= day and (self.valid_to is None or day <= self.valid_to)
+
+    def to_row(self):
+        """Значения для записи в таблицу schedule_sessions (без ID)
+
+        Returns:
+            tuple: (group_id, coach_id, hall_id, weekday, start_minute, end_minute, valid_from, valid_to)
+        """
+        return (self.group_id, self.coach_id, self.hall_id, self.weekday, self.start_minute,
+                self.end_minute, to_storage(self.valid_from), to_storage(self.valid_to))
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы schedule_sessions
+
+        Args:
+            row (tuple): Строка результата запроса (id, group_id, coach_id, hall_id, weekday,
+                start_minute, end_minute, valid_from, valid_to)
+
+        Returns:
+            ScheduleSession: Объект занятия
+        """
+        session = cls.__new__(cls)
+        (session.id, session.group_id, session.coach_id, session.hall_id, session.weekday,
+         session.start_minute, session.end_minute, valid_from, valid_to) = row
+        session.valid_from = from_storage(valid_from)
+        session.valid_to = from_storage(valid_to)
+        return session
+
+
+class Occurrence:
+    """Конкретное занятие в определённый день"""
+
+    def __init__(self, session, day):
+        """
+        Args:
+            session (ScheduleSession): Еженедельное занятие
+            day (datetime.date): День занятия
+        """
+        self.session = session
+        self.day = day
+
+    @property
+    def key(self):
+        """Занятие в журнале посещаемости: «ГГГГ-ММ-ДД ЧЧ:ММ», строки сортируются по времени"""
+        return f"{self.day.isoformat()} {format_minutes(self.session.start_minute)}"
+
+    @property
+    def start(self):
+        return datetime.combine(self.day, time()) + timedelta(minutes=self.session.start_minute)
+
+    @property
+    def end(self):
+        return datetime.combine(self.day, time()) + timedelta(minutes=self.session.end_minute)
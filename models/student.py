@@ -1,5 +1,27 @@
-from PyQt5.QtCore import QDate
-from datetime import datetime
+from datetime import date, datetime
+from operator import attrgetter
+
+from utils.dates import age_on, from_storage, to_storage
+
+
+# Колонка таблицы students -> значение из атрибутов ученика в том виде, в каком оно хранится в БД
+_COLUMN_VALUES = {
+    "name": attrgetter("full_name"),
+    "age": attrgetter("age"),
+    "birth_date": lambda student: to_storage(student.birth_date),
+    "department": attrgetter("department"),
+    "group_name": attrgetter("group_name"),
+    "group_id": attrgetter("group_id"),
+    "coach": attrgetter("coach_name"),
+    "coach_id": attrgetter("coach_id"),
+    "school": attrgetter("educational_institution"),
+    "rank": attrgetter("sports_rank"),
+    "rank_date": lambda student: to_storage(student.rank_assignment_date),
+    "snils": attrgetter("snils"),
+    "passport": attrgetter("passport_data"),
+    "enrollment_date": lambda student: to_storage(student.enrollment_date),
+    "medical_clearance": lambda student: 1 if student.medical_clearance else 0,
+}
 
 
 class Student:
@@ -9,7 +31,8 @@ class Student:
                  birth_date=None, group_id=None, coach_id=None,
                  educational_institution="", sports_rank="",
                  rank_assignment_date=None, snils="", passport_data="",
-                 enrollment_date=None):
+                 enrollment_date=None, department="", group_name="", coach_name="",
+                 medical_clearance=False):
         """Инициализация объекта ученика
 
         Args:
@@ -26,6 +49,10 @@ class Student:
             snils (str, optional): СНИЛС. Defaults to "".
             passport_data (str, optional): Паспортные данные. Defaults to "".
             enrollment_date (datetime.date, optional): Дата зачисления. Defaults to None.
+            department (str, optional): Отделение. Defaults to "".
+            group_name (str, optional): Название группы. Defaults to "".
+            coach_name (str, optional): Тренер. Defaults to "".
+            medical_clearance (bool, optional): Прошёл медосмотр. Defaults to False.
         """
         self.id = id
         self.first_name = first_name
@@ -40,6 +67,62 @@ class Student:
         self.snils = snils
         self.passport_data = passport_data
         self.enrollment_date = enrollment_date if enrollment_date else datetime.now().date()
+        self.department = department
+        self.group_name = group_name
+        self.coach_name = coach_name
+        self.medical_clearance = medical_clearance
+        self._computed_age = None
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы students (порядок STUDENT_FIELDS)
+
+        Конструктор не вызывается: объект заполняется напрямую, поэтому фабрика
+        годится как row_factory для курсоров с большим числом строк.
+
+        Args:
+            row (tuple): Строка результата запроса
+
+        Returns:
+            Student: Объект ученика
+        """
+        student = cls.__new__(cls)
+        (student.id, name, age, birth_date, student.department, student.group_name,
+         student.coach_name, student.educational_institution, student.sports_rank, rank_date,
+         student.snils, student.passport_data, enrollment_date, medical_clearance,
+         student.group_id, student.coach_id) = row
+        student.full_name = name
+        student.birth_date = from_storage(birth_date)
+        student.rank_assignment_date = from_storage(rank_date)
+        student.enrollment_date = from_storage(enrollment_date)
+        student.medical_clearance = bool(medical_clearance)
+        # Возраст посчитан запросом и верен, пока не изменилась дата рождения
+        student._computed_age = (student.birth_date, age)
+        return student
+
+    def to_row(self):
+        """Значения для записи в таблицу students (порядок STUDENT_COLUMNS)
+
+        Колонка age не заполняется: возраст считается в запросе по дате рождения.
+
+        Returns:
+            tuple: Значения колонок без ID
+        """
+        return (self.full_name, None, to_storage(self.birth_date),
+                self.department, self.group_name, self.coach_name, self.educational_institution,
+                self.sports_rank, to_storage(self.rank_assignment_date), self.snils,
+                self.passport_data, to_storage(self.enrollment_date), 1 if self.medical_clearance else 0)
+
+    def column_value(self, column):
+        """Значение колонки таблицы students в том виде, в каком оно хранится в БД
+
+        Args:
+            column (str): Имя колонки или ссылки на справочник (group_id, coach_id)
+
+        Returns:
+            Значение колонки
+        """
+        return _COLUMN_VALUES[column](self)
 
     @property
     def full_name(self):
@@ -48,28 +131,24 @@ class Student:
         Returns:
             str: Полное имя (Фамилия Имя Отчество)
         """
-        if self.middle_name:
-            return f"{self.last_name} {self.first_name} {self.middle_name}"
-        return f"{self.last_name} {self.first_name}"
+        return " ".join(part for part in (self.last_name, self.first_name, self.middle_name) if part)
+
+    @full_name.setter
+    def full_name(self, value):
+        parts = (value or "").split(maxsplit=2)
+        parts += [""] * (3 - len(parts))
+        self.last_name, self.first_name, self.middle_name = parts
 
     @property
     def age(self):
         """Возраст ученика
 
         Returns:
-            int: Возраст в годах
+            int: Возраст в годах или None без даты рождения
         """
-        if not self.birth_date:
-            return 0
-
-        today = datetime.now().date()
-        age = today.year - self.birth_date.year
-
-        # Проверка, был ли уже день рождения в этом году
-        if (today.month, today.day) < (self.birth_date.month, self.birth_date.day):
-            age -= 1
-
-        return age
+        if self._computed_age is not None and self._computed_age[0] == self.birth_date:
+            return self._computed_age[1]
+        return age_on(self.birth_date, date.today())
 
     def to_dict(self):
         """Преобразование в словарь для сохранения в БД
@@ -82,16 +161,15 @@ class Student:
             'first_name': self.first_name,
             'last_name': self.last_name,
             'middle_name': self.middle_name,
-            'birth_date': self.birth_date.strftime('%Y-%m-%d') if self.birth_date else None,
+            'birth_date': to_storage(self.birth_date),
             'group_id': self.group_id,
             'coach_id': self.coach_id,
             'educational_institution': self.educational_institution,
             'sports_rank': self.sports_rank,
-            'rank_assignment_date': self.rank_assignment_date.strftime(
-                '%Y-%m-%d') if self.rank_assignment_date else None,
+            'rank_assignment_date': to_storage(self.rank_assignment_date),
             'snils': self.snils,
             'passport_data': self.passport_data,
-            'enrollment_date': self.enrollment_date.strftime('%Y-%m-%d') if self.enrollment_date else None
+            'enrollment_date': to_storage(self.enrollment_date)
         }
 
     @classmethod
@@ -109,189 +187,13 @@ class Student:
             first_name=data.get('first_name', ''),
             last_name=data.get('last_name', ''),
             middle_name=data.get('middle_name', ''),
-            birth_date=datetime.strptime(data.get('birth_date'), '%Y-%m-%d').date() if data.get('birth_date') else None,
+            birth_date=from_storage(data.get('birth_date')),
             group_id=data.get('group_id'),
             coach_id=data.get('coach_id'),
             educational_institution=data.get('educational_institution', ''),
             sports_rank=data.get('sports_rank', ''),
-            rank_assignment_date=datetime.strptime(data.get('rank_assignment_date'), '%Y-%m-%d').date() if data.get(
-                'rank_assignment_date') else None,
+            rank_assignment_date=from_storage(data.get('rank_assignment_date')),
             snils=data.get('snils', ''),
             passport_data=data.get('passport_data', ''),
-            enrollment_date=datetime.strptime(data.get('enrollment_date'), '%Y-%m-%d').date() if data.get(
-                'enrollment_date') else None
+            enrollment_date=from_storage(data.get('enrollment_date'))
         )
-
-    def filter_students(self, filters=None):
-        """
-        Фильтрация учеников по различным параметрам
-
-        :param filters: словарь с параметрами фильтрации, например:
-            {
-                'birth_year': 2010,  # Год рождения
-                'department_id': 1,  # ID отделения
-                'group_id': 2,       # ID группы
-                'coach_id': 3,       # ID тренера
-                'medical_date_from': '2023-01-01',  # Дата медосмотра от
-                'medical_date_to': '2023-12-31',    # Дата медосмотра до
-                'training_allowed': True,           # Допуск к тренировкам
-                'search_text': 'Иван'               # Поиск по имени/фамилии
-            }
-        :return: список отфильтрованных учеников
-        """
-        if not filters:
-            return self.get_all_students()
-
-        query_parts = ["SELECT s.*, g.name as group_name, d.name as department_name, "
-                       "c.last_name || ' ' || c.first_name as coach_name "
-                       "FROM students s "
-                       "LEFT JOIN groups g ON s.group_id = g.id "
-                       "LEFT JOIN departments d ON g.department_id = d.id "
-                       "LEFT JOIN coaches c ON g.coach_id = c.id "
-                       "WHERE 1=1"]
-        parameters = []
-
-        # Фильтр по году рождения
-        if 'birth_year' in filters and filters['birth_year']:
-            query_parts.append("AND strftime('%Y', s.birth_date) = ?")
-            parameters.append(str(filters['birth_year']))
-
-        # Фильтр по отделению
-        if 'department_id' in filters and filters['department_id']:
-            query_parts.append("AND g.department_id = ?")
-            parameters.append(filters['department_id'])
-
-        # Фильтр по группе
-        if 'group_id' in filters and filters['group_id']:
-            query_parts.append("AND s.group_id = ?")
-            parameters.append(filters['group_id'])
-
-        # Фильтр по тренеру
-        if 'coach_id' in filters and filters['coach_id']:
-            query_parts.append("AND g.coach_id = ?")
-            parameters.append(filters['coach_id'])
-
-        # Фильтр по дате медосмотра (от)
-        if 'medical_date_from' in filters and filters['medical_date_from']:
-            query_parts.append("AND s.medical_exam_date >= ?")
-            parameters.append(filters['medical_date_from'])
-
-        # Фильтр по дате медосмотра (до)
-        if 'medical_date_to' in filters and filters['medical_date_to']:
-            query_parts.append("AND s.medical_exam_date <= ?")
-            parameters.append(filters['medical_date_to'])
-
-        # Фильтр по допуску к тренировкам
-        if 'training_allowed' in filters:
-            if filters['training_allowed']:
-                query_parts.append("AND s.training_allowed = 1")
-            else:
-                query_parts.append("AND s.training_allowed = 0")
-
-        # Поиск по тексту (имя, фамилия)
-        if 'search_text' in filters and filters['search_text']:
-            query_parts.append("AND (s.last_name LIKE ? OR s.first_name LIKE ? OR s.middle_name LIKE ?)")
-            search_term = f"%{filters['search_text']}%"
-            parameters.extend([search_term, search_term, search_term])
-
-        # Составляем финальный запрос
-        query = " ".join(query_parts)
-
-        # Выполняем запрос
-        cursor = self.db_manager.execute_query(query, parameters)
-        if not cursor:
-            return []
-
-        # Преобразуем результаты в список словарей
-        students = []
-        for row in cursor:
-            student = dict(row)
-            students.append(student)
-
-        return students
-
-    def filter_students(self, filters=None):
-        """
-        Фильтрация учеников по различным параметрам
-
-        :param filters: словарь с параметрами фильтрации, например:
-            {
-                'birth_year': 2010,  # Год рождения
-                'department_id': 1,  # ID отделения
-                'group_id': 2,       # ID группы
-                'coach_id': 3,       # ID тренера
-                'medical_date_from': '2023-01-01',  # Дата медосмотра от
-                'medical_date_to': '2023-12-31',    # Дата медосмотра до
-                'training_allowed': True,           # Допуск к тренировкам
-                'search_text': 'Иван'               # Поиск по имени/фамилии
-            }
-        :return: список отфильтрованных учеников
-        """
-        if not filters:
-            return self.get_all_students()
-
-        query_parts = ["SELECT s.*, g.name as group_name, d.name as department_name, "
-                       "c.last_name || ' ' || c.first_name as coach_name "
-                       "FROM students s "
-                       "LEFT JOIN groups g ON s.group_id = g.id "
-                       "LEFT JOIN departments d ON g.department_id = d.id "
-                       "LEFT JOIN coaches c ON g.coach_id = c.id "
-                       "WHERE 1=1"]
-        parameters = []
-
-        # Фильтр по году рождения
-        if 'birth_year' in filters and filters['birth_year']:
-            query_parts.append("AND strftime('%Y', s.birth_date) = ?")
-            parameters.append(str(filters['birth_year']))
-
-        # Фильтр по отделению
-        if 'department_id' in filters and filters['department_id']:
-            query_parts.append("AND g.department_id = ?")
-            parameters.append(filters['department_id'])
-
-        # Фильтр по группе
-        if 'group_id' in filters and filters['group_id']:
-            query_parts.append("AND s.group_id = ?")
-            parameters.append(filters['group_id'])
-
-        # Фильтр по тренеру
-        if 'coach_id' in filters and filters['coach_id']:
-            query_parts.append("AND g.coach_id = ?")
-            parameters.append(filters['coach_id'])
-
-        # Фильтр по дате медосмотра (от)
-        if 'medical_date_from' in filters and filters['medical_date_from']:
-            query_parts.append("AND s.medical_exam_date >= ?")
-            parameters.append(filters['medical_date_from'])
-
-        # Фильтр по дате медосмотра (до)
-        if 'medical_date_to' in filters and filters['medical_date_to']:
-            query_parts.append("AND s.medical_exam_date <= ?")
-            parameters.append(filters['medical_date_to'])
-
-        # Фильтр по допуску к тренировкам
-        if 'training_allowed' in filters and filters['training_allowed'] is not None:
-            query_parts.append("AND s.training_allowed = ?")
-            parameters.append(1 if filters['training_allowed'] else 0)
-
-        # Поиск по тексту (имя, фамилия)
-        if 'search_text' in filters and filters['search_text']:
-            query_parts.append("AND (s.last_name LIKE ? OR s.first_name LIKE ? OR s.middle_name LIKE ?)")
-            search_term = f"%{filters['search_text']}%"
-            parameters.extend([search_term, search_term, search_term])
-
-        # Составляем финальный запрос
-        query = " ".join(query_parts)
-
-        # Выполняем запрос
-        cursor = self.db_manager.execute_query(query, parameters)
-        if not cursor:
-            return []
-
-        # Преобразуем результаты в список словарей
-        students = []
-        for row in cursor:
-            student = dict(row)
-            students.append(student)
-
-        return students
\ No newline at end of file
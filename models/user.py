@@ -0,0 +1,109 @@
+# Права, которые проверяет интерфейс; набор прав роли хранится в role_permissions
+PERMISSIONS = {
+    "students.edit": "Добавление и изменение учеников",
+    "students.delete": "Удаление учеников",
+    "students.import": "Импорт учеников",
+    "students.export": "Экспорт учеников",
+    "medical.edit": "Отметки о медосмотре",
+    "schedule.edit": "Расписание",
+    "competitions.edit": "Соревнования",
+    "attendance.edit": "Посещаемость",
+    "analytics.view": "Статистика",
+    "users.manage": "Пользователи",
+}
+# Области видимости учеников: все, ученики групп отделения пользователя, ученики групп тренера
+SCOPES = {
+    "all": "Все ученики",
+    "department": "Ученики отделения",
+    "coach": "Ученики своих групп",
+}
+
+
+class User:
+    """Модель пользователя программы"""
+
+    def __init__(self, id=None, login="", password_hash="", role_id=None, coach_id=None,
+                 department_id=None, active=True):
+        """Инициализация объекта пользователя
+
+        Args:
+            id (int, optional): ID пользователя. Defaults to None.
+            login (str, optional): Имя для входа. Defaults to "".
+            password_hash (str, optional): Хэш пароля (utils.passwords). Defaults to "".
+            role_id (int, optional): ID роли. Defaults to None.
+            coach_id (int, optional): ID тренера, если пользователь — тренер. Defaults to None.
+            department_id (int, optional): ID отделения руководителя отделения. Defaults to None.
+            active (bool, optional): Разрешён ли вход. Defaults to True.
+        """
+        self.id = id
+        self.login = login
+        self.password_hash = password_hash
+        self.role_id = role_id
+        self.coach_id = coach_id
+        self.department_id = department_id
+        self.active = bool(active)
+
+    def to_row(self):
+        """Значения для записи в таблицу users (без id)
+
+        Returns:
+            tuple: (login, password_hash, role_id, coach_id, department_id, active)
+        """
+        return (self.login, self.password_hash, self.role_id, self.coach_id, self.department_id, int(self.active))
+
+    @classmethod
+    def from_row(cls, row):
+        """Создание объекта из строки таблицы users
+
+        Args:
+            row (tuple): Строка результата запроса (id, login, password_hash, role_id, coach_id,
+                department_id, active)
+
+        Returns:
+            User: Объект пользователя
+        """
+        return cls(*row)
+
+
+class Session:
+    """Вошедший пользователь и его права.
+
+    Права роли читаются из базы один раз при входе; дальнейшие проверки —
+    поиск во множестве в памяти. Область видимости переводится в фильтры
+    query_students, поэтому ограничение попадает в WHERE запроса.
+    """
+
+    def __init__(self, user, role_name, role_title, scope, permissions):
+        """Инициализация сеанса
+
+        Args:
+            user (User): Пользователь
+            role_name (str): Код роли
+            role_title (str): Название роли
+            scope (str): Область видимости учеников (ключ SCOPES)
+            permissions (iterable): Права роли
+        """
+        self.user = user
+        self.role_name = role_name
+        self.role_title = role_title
+        self.scope = scope
+        self.permissions = frozenset(permissions)
+
+    def can(self, permission):
+        """Есть ли у пользователя право permission"""
+        return permission in self.permissions
+
+    def scope_filters(self):
+        """Фильтры query_students, ограничивающие учеников областью видимости.
+
+        У тренера или руководителя без привязки к тренеру или отделению
+        фильтр со значением None не пропускает ни одного ученика.
+
+        Returns:
+            dict: Пустой словарь для области "all"
+        """
+        if self.scope == "coach":
+            return {"scope_coach_id": self.user.coach_id}
+        if self.scope == "department":
+            return {"scope_department_id": self.user.department_id}
+        return {}
@@ -0,0 +1,42 @@
+# resourses/app_config.ini.py
+# Настройки по умолчанию в формате INI; читаются utils/config.py.
+# Для конкретной установки значения переопределяются файлом app_config.ini
+# в рабочем каталоге или файлом из переменной окружения SPORT_SCHOOL_CONFIG.
+
+[database]
+# Файл базы данных
+path = sport_school.db
+# Журнал WAL: чтение не ждёт записи, запись не ждёт чтения
+journal_mode = WAL
+# В режиме WAL NORMAL не теряет целостность базы при сбое
+synchronous = NORMAL
+# Кэш страниц на соединение; отрицательное значение — в КиБ
+cache_size = -32000
+# Сколько байт файла базы читается через отображение в память
+mmap_size = 268435456
+# Временные таблицы и сортировки — в памяти
+temp_store = MEMORY
+# Сколько миллисекунд ждать снятия блокировки записи
+busy_timeout = 5000
+
+[medical]
+# За сколько дней до срока следующего медосмотра ученик попадает в список «скоро истекает»
+due_days = 30
+
+[auth]
+# Число итераций PBKDF2 при хэшировании паролей. Чем больше, тем дольше подбор
+# пароля по украденной базе, но и вход медленнее; хэши пересчитываются при входе
+iterations = 600000
+
+[logging]
+# Журнал работы программы (JSON Lines); false — записи не делаются и не замеряются
+enabled = true
+# Минимальный уровень записей: DEBUG, INFO, WARNING, ERROR или CRITICAL.
+# Длительность всех замеренных операций пишется только на уровне DEBUG
+level = INFO
+path = sport_school.log
+# Размер файла, после которого начинается новый, и число хранимых старых файлов
+max_bytes = 1048576
+backup_count = 5
+# Операции дольше стольких миллисекунд записываются как WARNING
+slow_ms = 200
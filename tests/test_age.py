@@ -0,0 +1,52 @@
+# tests/test_age.py
+from datetime import date
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from utils.dates import age_on, birth_date_range
+
+BIRTH_DATES = ("2000-02-29", "2010-01-01", "2010-12-31", "2012-06-15", "2015-03-01", None)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number, birth_date in enumerate(BIRTH_DATES):
+        db.add_student((f"Ученик{number}", 99, birth_date, "Бокс", None, None, None, None,
+                        None, None, None, "2020-09-01", 0))
+    return db
+
+
+def test_age_is_computed_from_birth_date(db):
+    today = date.today()
+    for row in db.query_students().fetchall():
+        assert row[2] == age_on(row[3], today)
+
+
+@pytest.mark.parametrize("descending", (False, True))
+def test_sort_by_age_uses_birth_date(db, descending):
+    rows = db.query_students(None, "age", descending).fetchall()
+    walked = list(db.iter_students(None, "age", descending, page_size=2))
+    assert [row[0] for row in walked] == [row[0] for row in rows]
+    ages = [row[2] for row in rows if row[2] is not None]
+    assert ages == sorted(ages, reverse=descending)
+
+
+@pytest.mark.parametrize("age", (None, 0, 9, 10, 13, 26))
+def test_age_filter_matches_age(db, age):
+    today = date.today()
+    low, high = (age, age + 3) if age is not None else (None, 12)
+    expected = {row[0] for row in db.query_students().fetchall()
+                if row[2] is not None and (low is None or row[2] >= low) and row[2] < high}
+    found = {row[0] for row in db.query_students({"age": (low, high)}).fetchall()}
+    assert found == expected
+    assert db.count_students({"age": (low, high)}) == len(expected)
+
+
+@pytest.mark.parametrize("today", (date(2024, 2, 29), date(2023, 2, 28), date(2023, 3, 1)))
+def test_birth_date_range_on_leap_days(today):
+    for birth_date in ("2000-02-29", "2020-02-29", "2023-02-28", "2023-03-01", "2003-03-01"):
+        age = age_on(birth_date, today)
+        date_from, date_to = birth_date_range(age, age + 1, today)
+        assert date_from <= birth_date < date_to
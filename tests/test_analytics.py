@@ -0,0 +1,60 @@
+# tests/test_analytics.py
+from datetime import date
+
+import pytest
+
+from database.analytics import StudentAnalytics
+from database.db_manager import DatabaseManager
+
+TODAY = date(2024, 10, 15)
+
+
+def student(department, group_name, coach, birth_date, enrolled, school=None, rank=None):
+    return ("Иванов Иван", None, birth_date, department, group_name, coach, school, rank,
+            None, None, None, enrolled, 0)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    db.add_student(student("Бокс", "Г1", "Петров Пётр", "2017-10-16", "2024-09-01", "Школа №1"))
+    db.add_student(student("Бокс", "Г1", "Петров Пётр", "2014-10-15", "2024-09-10", "Школа №1", "1 разряд"))
+    db.add_student(student("Дзюдо", "Г2", "Сидоров Сидор", "2006-01-01", "2023-09-01", rank="КМС"))
+    db.add_student(student("Дзюдо", None, None, None, None))
+    return db
+
+
+def test_counts_by_dimension(db):
+    db.add_medical_exam((1, "2024-09-01", "", 1, "2025-09-01", ""))
+    db.add_medical_exam((2, "2023-09-01", "", 1, "2024-09-01", ""))
+    db.add_medical_exam((3, "2024-09-01", "", 0, None, ""))
+    summary = StudentAnalytics(db).summary(TODAY)
+    assert summary.total == 4
+    assert summary.values("department") == [("Бокс", 2), ("Дзюдо", 2)]
+    assert summary.counts["group"] == {"Г1 (Бокс)": 2, "Г2 (Дзюдо)": 1, None: 1}
+    assert summary.counts["coach"] == {"Петров Пётр": 2, "Сидоров Сидор": 1, None: 1}
+    assert summary.counts["school"] == {"Школа №1": 2, None: 2}
+    # Возраст на TODAY: 6 лет (день рождения завтра), ровно 10 лет, 18 лет
+    assert summary.counts["age_band"] == {"до 7 лет": 1, "10–12 лет": 1, "18 лет и старше": 1, None: 1}
+    assert summary.counts["clearance"] == {"Допуск действует": 1, "Допуск просрочен": 1,
+                                           "Не допущен": 1, "Нет медосмотров": 1}
+    assert summary.enrollment_trend() == [("2023-09", 1, 1), ("2024-09", 2, 3)]
+
+
+def test_cache_follows_writes(db):
+    analytics = StudentAnalytics(db)
+    first = analytics.summary(TODAY)
+    assert analytics.summary(TODAY) is first
+
+    db.update_student(4, student("Бокс", "Г1", "Петров Пётр", None, None))
+    assert not analytics.is_current(TODAY)
+    assert analytics.summary(TODAY).counts["department"] == {"Бокс": 3, "Дзюдо": 1}
+
+    db.add_medical_exam((4, "2024-09-01", "", 1, None, ""))
+    assert analytics.summary(TODAY).counts["clearance"]["Допуск действует"] == 1
+
+    db.import_students([student("Плавание", "Г3", "Петров Пётр", None, "2024-10-01")])
+    summary = analytics.summary(TODAY)
+    assert summary.total == 5 and summary.counts["coach"]["Петров Пётр"] == 4
+    # Новый день — новая сводка, даже без изменений
+    assert analytics.summary(date(2024, 10, 16)) is not summary
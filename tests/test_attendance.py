@@ -0,0 +1,84 @@
+# tests/test_attendance.py
+import random
+
+from database.db_manager import DatabaseManager
+from models.attendance import AttendanceSheet
+from utils.attendance import current_run, longest_run, season_report
+
+
+def sheet(month, roster, pattern, group_id=1, coach_id=7):
+    """Журнал по строкам вида "1101" — присутствие на занятиях по порядку"""
+    sessions = [f"{month}-{day:02d} 18:00" for day in range(1, len(pattern[0]) + 1)]
+    marks = [int(row[::-1], 2) for row in pattern]
+    return AttendanceSheet(group_id, month, coach_id, roster, sessions, marks)
+
+
+def test_runs():
+    assert longest_run(0b0111011110) == 4
+    assert longest_run(0) == 0
+    assert current_run(0b1100111, 7) == 2
+    assert current_run(0b0111111, 7) == 0
+    assert current_run(0b1111111, 7) == 7
+
+
+def test_marks_and_late_session():
+    journal = sheet("2024-10", [1, 2], ["1011", "0110"])
+    assert journal.attended(1) == 3
+    assert journal.session_counts() == [1, 1, 2, 1]
+    # Занятие задним числом встаёт между 2 и 3 октября, отметки после него сдвигаются
+    assert journal.add_session("2024-10-02 20:00") == 2
+    assert [journal.is_present(1, session) for session in range(5)] == [True, False, False, True, True]
+    journal.mark(3, 2)
+    assert journal.roster == [1, 2, 3] and journal.total() == (6, 15)
+
+
+def test_blob_round_trip():
+    generator = random.Random(5)
+    roster = list(range(1, 26))
+    pattern = ["".join(generator.choice("01") for _ in range(13)) for _ in roster]
+    journal = sheet("2024-11", roster, pattern)
+    row = journal.to_row()
+    assert len(row[5]) == 25 * 2
+    restored = AttendanceSheet.from_row(row)
+    assert restored.marks == journal.marks and restored.sessions == journal.sessions
+
+    db = DatabaseManager(":memory:")
+    db.add_student(("Иванов Иван", None, "2010-01-01", "Бокс", "Г1", "Петров Пётр",
+                    None, None, None, None, None, "2020-09-01", 0))
+    journal.group_id = 1
+    journal.coach_id = None
+    db.save_attendance_sheet(journal.to_row())
+    stored = db.conn.execute("SELECT group_id, month, coach_id, roster, sessions, marks FROM attendance_sheets").fetchone()
+    assert AttendanceSheet.from_row(stored).marks == journal.marks
+
+
+def test_season_report_joins_months():
+    september = sheet("2024-09", [1, 2], ["0111", "1000"], group_id=1, coach_id=7)
+    october = sheet("2024-10", [1, 3], ["110", "101"], group_id=1, coach_id=7)
+    other = sheet("2024-10", [4], ["11"], group_id=2, coach_id=8)
+    report = season_report([october, other, september])
+    # Серия ученика 1 идёт через границу месяцев: 3 занятия в сентябре и 2 в октябре
+    assert report["students"][1] == (5, 7, 71.4, 5, 0)
+    assert report["students"][2] == (1, 4, 25.0, 1, 0)
+    assert report["groups"][1] == (8, 14, 57.1, 7)
+    assert report["coaches"][8] == (2, 2, 100.0, 2)
+
+
+def test_roster_gap_breaks_run():
+    september = sheet("2024-09", [1, 2, 3], ["0011", "1111", "1111"])
+    october = sheet("2024-10", [2], ["111"])
+    holidays = AttendanceSheet(1, "2024-11", 7, [1, 2], [], [0, 0])
+    december = sheet("2024-12", [1, 2], ["1100", "1100"])
+    report = season_report([september, october, holidays, december])
+    # В октябре ученика 1 не было в списке: серии сентября и декабря не склеиваются
+    assert report["students"][1] == (4, 8, 50.0, 2, 0)
+    # Месяц без занятий серию не прерывает
+    assert report["students"][2] == (9, 11, 81.8, 9, 0)
+    # Ученик 3 ушёл после сентября, поэтому текущей серии у него нет
+    assert report["students"][3] == (4, 4, 100.0, 4, 0)
+
+
+def test_report_skips_future_sessions():
+    october = sheet("2024-10", [1], ["1100"])
+    assert season_report([october], until="2024-10-02 23:59")["students"][1] == (2, 2, 100.0, 2, 2)
+    assert season_report([october], until="2024-09-30 00:00")["students"] == {}
@@ -0,0 +1,71 @@
+# tests/test_auth.py
+import pytest
+
+from database.db_manager import DatabaseManager
+from models.user import Session, User
+from utils.passwords import hash_password, needs_rehash, verify_password
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for group_name, coach, department in (("Г1", "Петров Пётр", "Бокс"), ("Г2", "Сидоров Сидор", "Бокс"),
+                                          ("Г3", "Петров Пётр", "Дзюдо")):
+        db.add_student((f"Ученик {group_name}", None, "2010-01-01", department, group_name, coach,
+                        None, None, None, None, None, "2020-09-01", 0))
+    return db
+
+
+def ids(db, filters):
+    return sorted(row[0] for row in db.query_students(filters).fetchall())
+
+
+def test_password_hash():
+    encoded = hash_password("секрет123", 1000)
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert verify_password("секрет123", encoded)
+    assert not verify_password("секрет124", encoded)
+    assert not verify_password("секрет123", "md5$abc")
+    assert hash_password("секрет123", 1000) != encoded
+    assert not needs_rehash(encoded, 1000) and needs_rehash(encoded, 2000)
+
+
+def test_scope_is_part_of_where(db):
+    petrov = db.conn.execute("SELECT id FROM coaches WHERE last_name = 'Петров'").fetchone()[0]
+    boxing = db.conn.execute("SELECT id FROM departments WHERE name = 'Бокс'").fetchone()[0]
+    coach = Session(User(login="petrov", coach_id=petrov), "coach", "Тренер", "coach", ["attendance.edit"])
+    head = Session(User(login="head", department_id=boxing), "department_head", "", "department", [])
+    assert ids(db, coach.scope_filters()) == [1, 3]
+    assert ids(db, head.scope_filters()) == [1, 2]
+    assert db.count_students(dict(coach.scope_filters(), department="Бокс")) == 1
+    # Фильтр по другому тренеру не расширяет область видимости
+    sidorov = db.conn.execute("SELECT id FROM coaches WHERE last_name = 'Сидоров'").fetchone()[0]
+    assert ids(db, dict(coach.scope_filters(), coach_id=sidorov)) == []
+    assert db.student_matches(3, coach.scope_filters()) and not db.student_matches(2, coach.scope_filters())
+    # Тренер без привязки не видит никого
+    unbound = Session(User(login="new"), "coach", "Тренер", "coach", [])
+    assert ids(db, unbound.scope_filters()) == []
+    assert coach.can("attendance.edit") and not coach.can("students.delete")
+
+
+def test_login_and_rehash(db):
+    # Модели отделений используют QDate
+    pytest.importorskip("PyQt5")
+    from database.repositories import UserRepository
+
+    users = UserRepository(db, 1000)
+    assert not users.has_users()
+    users.add(User(login="Admin", role_id=users.role_id("admin")), "пароль-123")
+    assert users.authenticate("admin", "неверный") is None
+    assert users.authenticate("nobody", "пароль-123") is None
+    session = users.authenticate("admin ", "пароль-123")
+    assert session.role_name == "admin" and session.can("users.manage") and session.scope_filters() == {}
+
+    stronger = UserRepository(db, 2000)
+    stronger.authenticate("admin", "пароль-123")
+    assert stronger.get_by_login("admin").password_hash.startswith("pbkdf2_sha256$2000$")
+
+    user = users.get_by_login("admin")
+    user.active = False
+    users.update(user)
+    assert users.authenticate("admin", "пароль-123") is None
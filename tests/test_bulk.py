@@ -0,0 +1,58 @@
+# tests/test_bulk.py
+import pytest
+
+from database.db_manager import DatabaseManager, STUDENT_FIELDS
+
+GROUP_ID = STUDENT_FIELDS.index("group_id")
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number in range(6):
+        db.add_student((f"Ученик{number} Тест", None, "2010-01-01", "Бокс" if number % 2 else "Дзюдо",
+                        f"Группа{number % 3}", "Петров Пётр", None, None, None, None, None,
+                        "2020-09-01", 0))
+    return db
+
+
+def events(db):
+    received = []
+    db.add_listener(lambda action, student_id, row, old_row: received.append((action, student_id)))
+    return received
+
+
+def test_delete_students(db):
+    received = events(db)
+    assert db.delete_students([1, 3, 99]) == 2
+    assert db.count_students() == 4
+    assert received == [("delete", 1), ("delete", 3)]
+
+
+def test_reassign_resolves_groups_per_student(db):
+    received = events(db)
+    assert db.reassign_students([1, 2, 4], {"coach": "Сидоров Иван"}) == 3
+    rows = {row[0]: row for row in db.query_students({"coach": "Сидоров Иван"}).fetchall()}
+    assert sorted(rows) == [1, 2, 4]
+    # Группа ученика — та же пара (отделение, название группы), что у него в записи
+    for row in rows.values():
+        group = db.conn.execute(
+            "SELECT groups.name, departments.name FROM groups "
+            "JOIN departments ON departments.id = groups.department_id WHERE groups.id = ?",
+            (row[GROUP_ID],)).fetchone()
+        assert group == (row[STUDENT_FIELDS.index("group_name")], row[STUDENT_FIELDS.index("department")])
+    assert db.reassign_students([1], {"department": "Самбо"}) == 1
+    moved = db.query_students({"department": "Самбо"}).fetchone()
+    assert moved[GROUP_ID] not in {row[GROUP_ID] for row in rows.values()}
+    assert received == [("update", 1), ("update", 2), ("update", 4), ("update", 1)]
+
+
+def test_reassign_rejects_other_columns(db):
+    with pytest.raises(ValueError):
+        db.reassign_students([1], {"name": "Другой"})
+
+
+def test_medical_clearance_counts_changed_rows(db):
+    assert db.set_students_medical_clearance([1, 2, 3], True) == 3
+    assert db.set_students_medical_clearance([2, 3, 4], True) == 1
+    assert db.count_students({"medical_clearance": 1}) == 4
@@ -0,0 +1,134 @@
+# tests/test_competitions.py
+import random
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from models.competition import format_result, parse_result, points_for_place
+from utils.dates import season_of
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number in range(8):
+        db.add_student((f"Ученик{number} Тест", None, "2010-01-01", "Плавание", "Группа", "Петров Пётр",
+                        None, None, None, None, None, "2020-09-01", 0))
+    return db
+
+
+def places(db, competition_id):
+    return dict(db.conn.execute(
+        "SELECT student_id, place FROM competition_entries WHERE competition_id = ?", (competition_id,)))
+
+
+def standings(db):
+    return {row[0]: row[1:] for row in db.conn.execute(
+        "SELECT student_id, points, events FROM season_standings WHERE season = 2024 AND department_id = 1")}
+
+
+def add_competition(db, result_type, day="2024-10-05"):
+    return db.add_competition(("Первенство", day, season_of(day), 1, result_type))
+
+
+def test_parse_and_format_results():
+    assert parse_result("time", "1:05,5") == 65.5
+    assert parse_result("time", "1:00:02") == 3602
+    assert format_result("time", 65.5) == "1:05.50"
+    assert format_result("time", 9.87) == "9.87"
+    assert parse_result("place", "3") == 3
+    assert format_result("weight", 102.5) == "102.5"
+    for result_type, text in (("place", "0"), ("score", "много"), ("time", "-1")):
+        with pytest.raises(ValueError):
+            parse_result(result_type, text)
+    assert season_of("2024-08-31") == 2023 and season_of("2024-09-01") == 2024
+
+
+def test_ranks_follow_result_direction(db):
+    swim = add_competition(db, "time")
+    lift = add_competition(db, "weight")
+    for student_id, value in ((1, 30.5), (2, 29.9), (3, 30.5), (4, None)):
+        db.set_competition_result(swim, student_id, value)
+        db.set_competition_result(lift, student_id, value)
+    assert places(db, swim) == {2: 1, 1: 2, 3: 2, 4: None}
+    assert places(db, lift) == {1: 1, 3: 1, 2: 3, 4: None}
+    assert standings(db)[2] == (points_for_place(1) + points_for_place(3), 2)
+    assert 4 not in standings(db)
+
+
+def test_new_result_shifts_only_lower_places(db):
+    competition = add_competition(db, "score")
+    for student_id, value in ((1, 90), (2, 80), (3, 70)):
+        db.set_competition_result(competition, student_id, value)
+    db.set_competition_result(competition, 4, 85)
+    assert places(db, competition) == {1: 1, 4: 2, 2: 3, 3: 4}
+    db.remove_competition_entry(competition, 1)
+    assert places(db, competition) == {4: 1, 2: 2, 3: 3}
+    assert standings(db) == {4: (25, 1), 2: (20, 1), 3: (16, 1)}
+    db.delete_student(4)
+    assert places(db, competition) == {2: 1, 3: 2}
+    assert standings(db) == {2: (25, 1), 3: (20, 1)}
+    db.delete_competition(competition)
+    assert standings(db) == {}
+
+
+def test_incremental_standings_match_recount(db):
+    generator = random.Random(3)
+    competitions = [add_competition(db, generator.choice(("time", "score", "place"))) for _ in range(5)]
+    for _ in range(200):
+        competition = generator.choice(competitions)
+        student_id = generator.randrange(1, 9)
+        action = generator.random()
+        if action < 0.7:
+            db.set_competition_result(competition, student_id, generator.choice((None, 1, 2, 3, 4, 5)))
+        elif action < 0.9:
+            db.remove_competition_entry(competition, student_id)
+        else:
+            db.delete_competition(competition)
+            competitions.remove(competition)
+            competitions.append(add_competition(db, "place"))
+    # Пересчёт с нуля: места по RANK() и очки за места во всех соревнованиях сезона
+    recount = {}
+    for competition in competitions:
+        expected = dict(db.conn.execute(
+            "SELECT student_id, RANK() OVER (ORDER BY sort_key) FROM competition_entries"
+            " WHERE competition_id = ? AND sort_key IS NOT NULL", (competition,)))
+        assert {student: place for student, place in places(db, competition).items() if place is not None} == expected
+        for student_id, place in expected.items():
+            points, events = recount.get(student_id, (0, 0))
+            recount[student_id] = (points + points_for_place(place), events + 1)
+    assert standings(db) == recount
+
+
+def test_deleted_department_moves_standings(db):
+    own = add_competition(db, "place")
+    other = db.add_competition(("Открытое первенство", "2024-11-05", 2024, None, "place"))
+    db.set_competition_result(own, 1, 1)
+    db.set_competition_result(own, 2, 2)
+    db.set_competition_result(other, 1, 3)
+    db.set_competition_result(other, 3, 1)
+    with db.conn:
+        db.conn.execute("DELETE FROM departments WHERE id = 1")
+    no_department = {row[0]: row[1:] for row in db.conn.execute(
+        "SELECT student_id, points, events FROM season_standings WHERE department_id = 0")}
+    assert standings(db) == {}
+    assert no_department == {1: (points_for_place(1) + points_for_place(2), 2), 2: (points_for_place(2), 1),
+                             3: (points_for_place(1), 1)}
+    # Удаление соревнования вычитает очки из тех же строк, что и получили их после переноса
+    db.delete_competition(own)
+    db.delete_competition(other)
+    assert db.conn.execute("SELECT COUNT(*) FROM season_standings").fetchone()[0] == 0
+
+
+def test_migration_moves_orphaned_standings(db):
+    from database.migrations import _move_standings_of_deleted_departments
+
+    competition = add_competition(db, "place")
+    db.set_competition_result(competition, 1, 1)
+    # База до миграции: отделение удалено без переноса строк зачёта
+    with db.conn:
+        db.conn.execute("DROP TRIGGER departments_standings_ad")
+        db.conn.execute("DELETE FROM departments WHERE id = 1")
+    with db.conn:
+        _move_standings_of_deleted_departments(db.conn.cursor())
+    assert db.conn.execute("SELECT department_id, student_id FROM season_standings").fetchall() == [(0, 1)]
@@ -0,0 +1,63 @@
+# tests/test_connection.py
+import sqlite3
+import threading
+
+import pytest
+
+from database.connection import ConnectionManager
+from database.db_manager import DatabaseManager
+from utils.config import database_settings, load_config
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "school.db"))
+    yield db
+    db.close()
+
+
+def test_settings_are_applied(db):
+    settings = database_settings()
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == settings["journal_mode"].lower()
+    assert db.reader.execute("PRAGMA cache_size").fetchone()[0] == settings["cache_size"]
+    assert db.reader.execute("PRAGMA busy_timeout").fetchone()[0] == settings["busy_timeout"]
+
+
+def test_readers_are_per_thread_and_read_only(db):
+    db.add_student(("Иванов Иван", None, "2010-01-01", "Бокс", None, None, None, None,
+                    None, None, None, "2020-09-01", 0))
+    assert db.count_students() == 1
+    with pytest.raises(sqlite3.OperationalError):
+        db.reader.execute("DELETE FROM students")
+
+    seen = {}
+
+    def read():
+        worker = DatabaseManager(connections=db.connections)
+        seen["reader"] = worker.reader
+        seen["count"] = worker.count_students()
+        worker.close()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+    assert seen["count"] == 1
+    assert seen["reader"] is not db.reader
+
+
+def test_site_file_overrides_defaults(tmp_path):
+    site = tmp_path / "app_config.ini"
+    site.write_text("[database]\njournal_mode = delete\ncache_size = -1000\n", encoding="utf-8")
+    settings = database_settings(load_config(str(site)))
+    assert settings["journal_mode"] == "DELETE"
+    assert settings["cache_size"] == -1000
+    assert settings["synchronous"] == "NORMAL"
+
+    site.write_text("[database]\ntemp_store = MEMORY; DROP TABLE students\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        database_settings(load_config(str(site)))
+
+
+def test_memory_database_reads_through_writer():
+    with ConnectionManager(":memory:") as connections:
+        assert connections.reader() is connections.writer
@@ -0,0 +1,90 @@
+# tests/test_export.py
+import csv
+import os
+from datetime import date
+
+import pytest
+
+from database.db_manager import DatabaseManager
+
+
+def student(name, department, birth_date=None, cleared=0):
+    return (name, None, birth_date, department, None, None, None, None, None, None, None, None, cleared)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number in range(25):
+        db.add_student(student(f"Ученик{number:02d}", "Бокс" if number % 2 else "Самбо",
+                               f"2010-03-{number + 1:02d}", number % 3 == 0))
+    return db
+
+
+def read_csv(filename):
+    with open(filename, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_export_uses_filters_and_sort(db, tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5")
+    from database.repositories import StudentRepository
+    from utils import export
+
+    monkeypatch.setattr(export, "CHUNK_SIZE", 4)
+    filename = str(tmp_path / "students.csv")
+    progress = []
+    written = export.export_to_csv(StudentRepository(db), filename, {"department": "Бокс"}, "name",
+                                   descending=True, progress=progress.append)
+
+    header, *rows = read_csv(filename)
+    assert header == export.HEADERS and written == len(rows) == 12
+    assert [row[0] for row in rows[:2]] == ["Ученик23", "Ученик21"]
+    assert rows[0][2] == "24/03/2010" and rows[0][12] == "Нет"
+    assert progress == [4, 8, 12]
+
+
+def test_cancelled_export_removes_file(db, tmp_path):
+    pytest.importorskip("PyQt5")
+    from database.repositories import StudentRepository
+    from utils.export import export_to_csv
+
+    filename = str(tmp_path / "students.csv")
+    assert export_to_csv(StudentRepository(db), filename, is_cancelled=lambda: True) is None
+    assert not os.path.exists(filename)
+
+
+def test_failed_export_removes_file(db, tmp_path, monkeypatch):
+    pytest.importorskip("PyQt5")
+    from database.repositories import StudentRepository
+    from utils import export
+
+    def fail(written):
+        raise OSError("Нет места на диске")
+
+    monkeypatch.setattr(export, "CHUNK_SIZE", 4)
+    filename = str(tmp_path / "students.csv")
+    with pytest.raises(OSError):
+        export.export_to_csv(StudentRepository(db), filename, progress=fail)
+    assert not os.path.exists(filename)
+
+
+def test_age_comes_from_query(db):
+    pytest.importorskip("PyQt5")
+    from database.repositories import StudentRepository
+    from utils.dates import age_on
+    from utils.export import csv_row
+
+    row = StudentRepository(db).rows(sort_by="name").fetchone()
+    assert csv_row(row)[1] == row[2] == age_on(row[3], date.today())
+
+
+def test_worker_reports_open_failure(db, tmp_path):
+    pytest.importorskip("PyQt5")
+    from ui.forms.export_dialog import CsvExportWorker
+
+    worker = CsvExportWorker(db.connections, str(tmp_path / "missing" / "students.csv"))
+    errors = []
+    worker.failed.connect(errors.append)
+    worker.run()
+    assert len(errors) == 1
@@ -0,0 +1,73 @@
+# tests/test_facets.py
+import pytest
+
+from database.db_manager import DatabaseManager
+from database.facets import FacetCache
+
+
+def student(department, school=None, rank=None):
+    return ("Иванов Иван", None, "2010-01-01", department, None, None, school, rank,
+            None, None, None, "2020-09-01", 0)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for department in ("Бокс", "Бокс", "Дзюдо"):
+        db.add_student(student(department, "Школа №1"))
+    return db
+
+
+def recount(db, column):
+    return dict(db.conn.execute(
+        f"SELECT {column}, COUNT(*) FROM students WHERE {column} IS NOT NULL GROUP BY {column}").fetchall())
+
+
+def test_counts_follow_changes(db):
+    facets = FacetCache(db)
+    events = []
+    facets.add_listener(lambda *event: events.append(event))
+    assert facets.values("department") == [("Бокс", 2), ("Дзюдо", 1)]
+
+    new_id = db.add_student(student("Самбо", rank="1 разряд"))
+    db.update_student(1, student("Дзюдо", "Школа №1"))
+    db.delete_student(new_id)
+
+    for column in facets.columns:
+        assert dict(facets.values(column)) == recount(db, column)
+    assert ("department", "Самбо", 0) in events
+    assert ("department", "Дзюдо", 2) in events
+    assert ("school", "Школа №1", 3) not in events
+
+
+def test_reset_reloads(db):
+    facets = FacetCache(db)
+    events = []
+    facets.add_listener(lambda *event: events.append(event))
+    db.import_students([student("Плавание")])
+    assert facets.count("department", "Плавание") == 1
+    assert events == [(None, None, None)]
+
+
+def test_scope_limits_counts(db):
+    def coached(department, group_name, coach, school):
+        return ("Петров Пётр", None, "2010-01-01", department, group_name, coach, school, None,
+                None, None, None, "2020-09-01", 0)
+
+    db.add_student(coached("Бокс", "Б1", "Орлов Олег", "Школа №2"))
+    db.add_student(coached("Самбо", "С1", "Орлов Олег", "Школа №3"))
+    db.add_student(coached("Самбо", "С2", "Сидоров Семён", "Школа №3"))
+    coach_id = db.conn.execute("SELECT id FROM coaches WHERE last_name = 'Орлов'").fetchone()[0]
+    facets = FacetCache(db, scope={"scope_coach_id": coach_id})
+    assert facets.values("department") == [("Бокс", 1), ("Самбо", 1)]
+    assert facets.values("school") == [("Школа №2", 1), ("Школа №3", 1)]
+
+    # Ученики чужих групп не меняют счётчики, переход в свою группу — меняет
+    db.add_student(coached("Дзюдо", "Д1", "Сидоров Семён", "Школа №4"))
+    db.update_student(6, coached("Самбо", "С1", "Орлов Олег", "Школа №3"))
+    db.delete_student(4)
+    assert facets.values("department") == [("Самбо", 2)]
+    assert facets.values("school") == [("Школа №3", 2)]
+    assert FacetCache(db, scope={"scope_coach_id": None}).values("department") == []
+    with pytest.raises(ValueError):
+        db.group_in_scope(1, {"department": "Бокс"})
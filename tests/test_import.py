@@ -0,0 +1,113 @@
+# tests/test_import.py
+import csv
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from utils.export import HEADERS
+
+# СНИЛС с верной контрольной суммой
+SNILS_1 = "11223344595"
+SNILS_2 = "12345678964"
+
+
+def student(name, snils=None, school=None):
+    return (name, None, "2010-01-01", "Бокс", "Г1", "Петров Пётр", school, None, None, snils, None,
+            "2020-09-01", 0)
+
+
+@pytest.fixture
+def db():
+    return DatabaseManager(":memory:")
+
+
+def test_upsert_by_snils(db):
+    existing = db.add_student(student("Иванов Иван", SNILS_1))
+    events, progress = [], []
+    db.add_listener(lambda action, *args: events.append(action))
+
+    rows = [student("Иванов Иван", SNILS_1, "Школа №1"), student("Петров Пётр", SNILS_2),
+            student("Сидоров Семён"), student("Петров Пётр", SNILS_2, "Школа №2"),
+            student("Иванов Иван", SNILS_1, "Школа №1")]
+    assert db.import_students(rows, chunk_size=2, progress=progress.append) == (2, 2)
+    assert progress == [2, 4, 5] and events == ["reset"]
+
+    by_name = {row[1]: row for row in db.get_all_students()}
+    assert len(by_name) == 3 and by_name["Иванов Иван"][0] == existing
+    assert by_name["Иванов Иван"][7] == "Школа №1"
+    # Повтор СНИЛС в самом файле обновляет ученика, добавленного предыдущей порцией
+    assert by_name["Петров Пётр"][7] == "Школа №2"
+    # Повторный импорт без изменений ничего не переписывает
+    assert db.import_students([row for row in rows if row[9]]) == (0, 0)
+
+
+def test_import_file_rejects_invalid_rows(db, tmp_path):
+    pytest.importorskip("PyQt5")
+    from database.repositories import StudentRepository
+    from utils.importer import import_students
+
+    db.add_student(student("Иванов Иван", SNILS_1))
+    filename = str(tmp_path / "students.csv")
+    with open(filename, "w", newline="", encoding="cp1251") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerow(["Иванов  Иван", "", "01/01/2010", "Бокс", "Г1", "", "Школа", "", "",
+                         "112-233-445 95", "", "01/09/2020", "Да"])
+        writer.writerow(["Петров Пётр", "", "01/01/2011", "Бокс", "", "", "", "", "", SNILS_2,
+                         "1234 567890", "01/09/2021", "нет"])
+        writer.writerow(["Ivanov", "", "01/01/2010", "Бокс"] + [""] * 7 + ["01/09/2020", "Да"])
+        writer.writerow(["Сидоров Семён", "", "01/01/2010", "Бокс"] + [""] * 5 + ["11223344500", "",
+                                                                               "01/09/2020", "Да"])
+
+    result = import_students(StudentRepository(db), filename)
+    assert (result.inserted, result.updated, result.rejected) == (1, 1, 2)
+    with open(result.errors_filename, newline="", encoding="utf-8") as f:
+        _header, *errors = csv.reader(f)
+    assert [error[0] for error in errors] == ["4", "5"] and "контрольная сумма" in errors[1][1]
+    (ivanov,) = [row for row in db.get_all_students() if row[1] == "Иванов Иван"]
+    assert (ivanov[7], ivanov[13]) == ("Школа", 1)
+
+
+def write_csv(filename, rows):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def test_import_can_be_cancelled(db, tmp_path):
+    pytest.importorskip("PyQt5")
+    from database.repositories import StudentRepository
+    from utils.importer import import_students
+
+    filename = str(tmp_path / "students.csv")
+    write_csv(filename, [["Петров Пётр", "", "01/01/2011", "Бокс"] + [""] * 7 + ["01/09/2021", "Да"]])
+    result = import_students(StudentRepository(db), filename, is_cancelled=lambda: True)
+    assert result.cancelled and (result.inserted, result.updated) == (0, 0)
+    assert db.get_all_students() == []
+
+
+def test_worker_imports_on_its_own_connection(tmp_path):
+    pytest.importorskip("PyQt5")
+    from ui.forms.import_dialog import StudentImportWorker
+
+    db = DatabaseManager(str(tmp_path / "school.db"))
+    events = []
+    db.add_listener(lambda action, *args: events.append(action))
+    filename = str(tmp_path / "students.csv")
+    write_csv(filename, [["Петров Пётр", "", "01/01/2011", "Бокс"] + [""] * 5 + [SNILS_2, "", "01/09/2021", "Да"]])
+
+    worker = StudentImportWorker(db.db_name, filename)
+    results, errors = [], []
+    worker.completed.connect(results.append)
+    worker.failed.connect(errors.append)
+    worker.run()
+    (result,) = results
+    assert not errors and (result.inserted, result.cancelled) == (1, False)
+    # Главное окно видит изменения другого соединения после notify_reset
+    db.notify_reset()
+    assert events == ["reset"] and [row[1] for row in db.get_all_students()] == ["Петров Пётр"]
+
+    worker = StudentImportWorker(db.db_name, str(tmp_path / "missing.csv"))
+    worker.failed.connect(errors.append)
+    worker.run()
+    assert len(errors) == 1
+    db.close()
@@ -0,0 +1,109 @@
+# tests/test_journal.py
+import sqlite3
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from database.journal import ChangeJournal
+
+
+def student(name, school=None, snils=None):
+    return (name, None, "2010-01-01", "Бокс", "Г1", "Петров Пётр", school, None,
+            None, snils, None, "2020-09-01", 0)
+
+
+@pytest.fixture
+def db():
+    return DatabaseManager(":memory:")
+
+
+def test_diffs_and_history(db):
+    journal = ChangeJournal(db)
+    student_id = db.add_student(student("Иванов Иван"))
+    db.set_journal_user(7)
+    db.update_student(student_id, student("Иванов Иван", "Школа №1"))
+    db.update_student(student_id, student("Иванов Иван", "Школа №1"))
+    db.delete_student(student_id)
+
+    insert, update, delete = journal.history("students", student_id)
+    assert (insert.action, insert.new_values, insert.user_id) == ("insert", {}, None)
+    # Изменение хранит только изменившуюся колонку; повтор без разницы не записан
+    assert update.old_values == {"school": None} and update.new_values == {"school": "Школа №1"}
+    assert update.user_id == 7 and update.columns == ["school"]
+    assert delete.old_values["name"] == "Иванов Иван" and "rank" not in delete.old_values
+    assert journal.last_seq() == delete.seq
+
+
+def test_since_and_changed_rows(db):
+    journal = ChangeJournal(db)
+    kept = db.add_student(student("Первый"))
+    start = journal.last_seq()
+    db.import_students([student("Второй", snils="1"), student("Третий", snils="2")])
+    db.import_students([student("Второй", "Школа", snils="1")])
+    removed = db.add_student(student("Временный"))
+    db.delete_student(removed)
+    db.delete_student(kept)
+    db.add_medical_exam((2, "2024-09-01", "", 1, None, ""))
+
+    assert [change.action for change in journal.since(start, "students")] == \
+        ["insert", "insert", "update", "insert", "delete", "delete"]
+    assert len(journal.since(start, limit=2)) == 2
+    assert journal.since(start, "medical_exams")[0].row_id == 1
+    last, changed, deleted = journal.changed_rows(start)
+    assert changed == {2, 3} and deleted == {kept}
+    assert journal.changed_rows(last) == (last, set(), set())
+
+
+def test_journal_is_append_only(db):
+    db.add_student(student("Иванов Иван"))
+    with pytest.raises(sqlite3.IntegrityError):
+        db.conn.execute("DELETE FROM change_journal")
+    with pytest.raises(sqlite3.IntegrityError):
+        db.conn.execute("UPDATE change_journal SET user_id = 1")
+
+
+def test_failed_write_leaves_no_entry(db):
+    journal = ChangeJournal(db)
+    db.add_student(student("Иванов Иван"))
+    before = journal.last_seq()
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.conn:
+            db.conn.execute("UPDATE students SET school = 'Школа'")
+            db.conn.execute("INSERT INTO students (name) VALUES (NULL)")
+    assert journal.last_seq() == before
+
+
+def test_user_belongs_to_connection(tmp_path):
+    path = str(tmp_path / "school.db")
+    first, second = DatabaseManager(path), DatabaseManager(path)
+    first.set_journal_user(1)
+    second.set_journal_user(2)
+    first_id = first.add_student(student("Иванов Иван"))
+    second_id = second.add_student(student("Петров Пётр"))
+    first.update_student(second_id, student("Петров Пётр", "Школа №1"))
+
+    journal = ChangeJournal(first)
+    assert [change.user_id for change in journal.history("students", first_id)] == [1]
+    assert [change.user_id for change in journal.history("students", second_id)] == [2, 1]
+    first.close()
+    second.close()
+
+
+def test_migration_drops_shared_context(db):
+    from database.migrations import MIGRATIONS, _journal_user_from_connection, migrate
+
+    assert db.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'journal_context'").fetchone() is None
+    # База до миграции: пользователь журнала в общей строке journal_context
+    conn = sqlite3.connect(":memory:")
+    before = MIGRATIONS[:MIGRATIONS.index(_journal_user_from_connection)]
+    for migration in before:
+        migration(conn.cursor())
+    conn.execute("UPDATE journal_context SET user_id = 5")
+    conn.execute(f"PRAGMA user_version = {len(before)}")
+    conn.commit()
+
+    migrate(conn)
+    conn.create_function("current_user_id", 0, lambda: 3)
+    conn.execute("INSERT INTO students (name) VALUES ('Иванов Иван')")
+    assert conn.execute("SELECT user_id FROM change_journal").fetchall() == [(3,)]
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'journal_context'").fetchone() is None
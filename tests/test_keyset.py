@@ -0,0 +1,92 @@
+# tests/test_keyset.py
+import pytest
+
+from database.db_manager import DatabaseManager, STUDENT_COLUMNS, _keyset_segments
+
+SORT_COLUMNS = (None,) + STUDENT_COLUMNS
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    # Повторяющиеся значения и NULL в каждой колонке: ключ страницы часто
+    # попадает внутрь группы одинаковых значений и на границу NULL
+    for number in range(60):
+        db.add_student((
+            f"Ученик{number % 7} Тест",
+            None if number % 5 == 0 else number % 9,
+            None if number % 4 == 0 else f"20{10 + number % 6}-0{1 + number % 9}-15",
+            None if number % 3 == 0 else f"Отделение{number % 4}",
+            None if number % 6 == 0 else f"Группа{number % 3}",
+            None if number % 7 == 0 else f"Тренер{number % 2}",
+            None if number % 2 == 0 else "Школа",
+            None if number % 8 < 3 else f"{number % 3} разряд",
+            None if number % 5 < 2 else f"2020-0{1 + number % 5}-01",
+            None if number % 3 == 1 else f"{number % 10:011d}",
+            None if number % 9 == 0 else "1234 567890",
+            None if number % 10 == 0 else f"2021-09-0{1 + number % 3}",
+            number % 2,
+        ))
+    return db
+
+
+@pytest.mark.parametrize("sort_by", SORT_COLUMNS)
+@pytest.mark.parametrize("descending", (False, True))
+@pytest.mark.parametrize("page_size", (1, 7, 60))
+def test_pages_follow_query_order(db, sort_by, descending, page_size):
+    expected = [row[0] for row in db.query_students(None, sort_by, descending).fetchall()]
+    if sort_by is None:
+        expected.sort(reverse=descending)
+    walked = [row[0] for row in db.iter_students(None, sort_by, descending, page_size)]
+    assert walked == expected
+
+
+@pytest.mark.parametrize("sort_by", ("department", "rank_date", "snils"))
+@pytest.mark.parametrize("descending", (False, True))
+def test_pages_with_filters(db, sort_by, descending):
+    filters = {"medical_clearance": 1, "birth_date": ("2011-01-01", None)}
+    expected = [row[0] for row in db.query_students(filters, sort_by, descending).fetchall()]
+    walked = [row[0] for row in db.iter_students(filters, sort_by, descending, 4)]
+    assert walked == expected
+
+
+@pytest.mark.parametrize("descending", (False, True))
+@pytest.mark.parametrize("filters", ({}, {"medical_clearance": 1}))
+def test_search_pages_follow_index(db, descending, filters):
+    # В порядке id страницы поиска читаются прямо из students_fts
+    filters = dict(filters, search_text="ученик3")
+    expected = sorted((row[0] for row in db.query_students(filters).fetchall()), reverse=descending)
+    walked = [row[0] for row in db.iter_students(filters, None, descending, 2)]
+    assert walked == expected and len(expected) > 2
+
+
+def test_last_page_has_no_key(db):
+    rows, after = db.fetch_students_page(limit=60)
+    assert len(rows) == 60
+    rows, after = db.fetch_students_page(after=after, limit=60)
+    assert rows == [] and after is None
+
+
+def test_segments_without_key():
+    assert _keyset_segments("name", False, None) == [(None, [])]
+
+
+def test_segments_by_id():
+    assert _keyset_segments(None, False, (None, 5)) == [("id > ?", [5])]
+    assert _keyset_segments(None, True, (None, 5)) == [("id < ?", [5])]
+
+
+def test_segments_ascending_nulls_come_first():
+    assert _keyset_segments("rank", False, (None, 5)) == [
+        ("rank IS NULL AND id > ?", [5]),
+        ("rank IS NOT NULL", []),
+    ]
+    assert _keyset_segments("rank", False, ("1 разряд", 5)) == [("(rank, id) > (?, ?)", ["1 разряд", 5])]
+
+
+def test_segments_descending_nulls_come_last():
+    assert _keyset_segments("rank", True, ("1 разряд", 5)) == [
+        ("(rank, id) < (?, ?)", ["1 разряд", 5]),
+        ("rank IS NULL", []),
+    ]
+    assert _keyset_segments("rank", True, (None, 5)) == [("rank IS NULL AND id < ?", [5])]
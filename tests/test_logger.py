@@ -0,0 +1,82 @@
+# tests/test_logger.py
+import json
+import logging
+
+import pytest
+
+from utils.config import load_config, logging_settings
+from utils.logger import get_logger, setup_logging, shutdown_logging, timed
+
+
+@pytest.fixture
+def settings(tmp_path):
+    settings = logging_settings()
+    settings.update(path=str(tmp_path / "app.log"), level="DEBUG", slow_ms=50)
+    yield settings
+    shutdown_logging()
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_records_are_json_lines(settings):
+    setup_logging(settings)
+    log = get_logger("tests")
+    log.info("Загружено %d учеников", 3, extra={"rows": 3})
+    try:
+        raise ValueError("ошибка")
+    except ValueError:
+        log.error("Сбой", exc_info=True)
+    shutdown_logging()
+
+    info, error = read_records(settings["path"])
+    assert (info["message"], info["rows"], info["logger"]) == ("Загружено 3 учеников", 3, "sport_school.tests")
+    assert error["level"] == "ERROR" and "ValueError: ошибка" in error["exception"]
+
+
+def test_timed_levels(settings, monkeypatch):
+    setup_logging(settings)
+    clock = iter([0.0, 0.01, 1.0, 1.2])
+    monkeypatch.setattr("utils.logger.time.perf_counter", lambda: next(clock))
+
+    @timed("load_students", rows=10)
+    def load():
+        return "ok"
+
+    assert load() == "ok"
+    with pytest.raises(KeyError):
+        with timed("save_student"):
+            raise KeyError
+    shutdown_logging()
+
+    fast, slow = read_records(settings["path"])
+    assert (fast["level"], fast["operation"], fast["rows"], fast["failed"]) == ("DEBUG", "load_students", 10, False)
+    assert (slow["level"], slow["operation"], slow["failed"]) == ("WARNING", "save_student", True)
+    assert slow["duration_ms"] == pytest.approx(200)
+
+
+def test_disabled_logging_skips_timing(settings, monkeypatch):
+    settings["enabled"] = False
+    assert setup_logging(settings) is None
+    monkeypatch.setattr("utils.logger.time.perf_counter", lambda: pytest.fail("замер при выключенном журнале"))
+    with timed("update_filters"):
+        pass
+    assert not get_logger("timing").isEnabledFor(logging.CRITICAL)
+
+
+def test_rotation(settings):
+    settings.update(max_bytes=500, backup_count=2)
+    setup_logging(settings)
+    for number in range(50):
+        get_logger("tests").info("Запись %d", number)
+    shutdown_logging()
+    assert len(read_records(settings["path"] + ".2")) > 0
+
+
+def test_invalid_settings():
+    config = load_config()
+    config["logging"]["level"] = "VERBOSE"
+    with pytest.raises(ValueError):
+        logging_settings(config)
@@ -0,0 +1,94 @@
+# tests/test_medical.py
+from datetime import date, timedelta
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from models.medical import default_next_date
+
+TODAY = date.today()
+
+
+def day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number in range(4):
+        db.add_student((f"Ученик{number} Тест", None, "2010-01-01", "Бокс", "Группа", "Петров Пётр",
+                        None, None, None, None, None, "2020-09-01", 0))
+    return db
+
+
+def status(db):
+    return dict((row[0], row[1:]) for row in db.conn.execute(
+        "SELECT student_id, exam_id, clearance, next_examination_date FROM medical_status"))
+
+
+def ids(db, filters):
+    return sorted(row[0] for row in db.query_students(filters).fetchall())
+
+
+def test_summary_follows_latest_exam(db):
+    first = db.add_medical_exam((1, day(-200), "", 1, day(-20), ""))
+    second = db.add_medical_exam((1, day(-10), "", 0, day(170), ""))
+    # Более ранний осмотр, внесённый позже, не становится последним
+    db.add_medical_exam((1, day(-300), "", 1, None, ""))
+    assert status(db) == {1: (second, 0, day(170))}
+
+    db.update_medical_exam(second, (2, day(-10), "", 1, day(170), ""))
+    assert status(db) == {1: (first, 1, day(-20)), 2: (second, 1, day(170))}
+
+    db.delete_medical_exam(first)
+    # Без даты следующего осмотра допуск действует полгода
+    assert status(db)[1][1:] == (1, default_next_date(day(-300)))
+
+    db.delete_student(2)
+    assert 2 not in status(db)
+
+
+def test_status_filters(db):
+    db.add_medical_exam((1, day(-30), "", 1, day(300), ""))
+    db.add_medical_exam((2, day(-400), "", 1, day(-35), ""))
+    db.add_medical_exam((3, day(-5), "", 0, day(360), ""))
+    assert ids(db, {"medical_status": "cleared"}) == [1]
+    assert ids(db, {"medical_status": "expired"}) == [2]
+    assert ids(db, {"medical_status": "none"}) == [4]
+    assert ids(db, {"medical_date": (day(-31), None)}) == [1, 3]
+    with pytest.raises(ValueError):
+        db.query_students({"medical_status": "unknown"})
+
+
+def test_repositories(db):
+    # Модели отделений используют QDate
+    pytest.importorskip("PyQt5")
+    from database.repositories import MedicalRepository, StudentRepository
+
+    students = StudentRepository(db)
+    medical = MedicalRepository(db)
+    db.add_medical_exam((1, day(-400), "", 1, day(-35), ""))
+    db.set_medical_clearance(1, True)
+    assert medical.status(1) == "expired"
+    assert not medical.is_cleared(1)
+    assert medical.status(4) is None
+
+    filters = students.query_filters({"medical_date_from": day(-400), "medical_date_to": day(-400)})
+    assert filters == {"medical_date": (day(-400), day(-399))}
+    assert students.matches(1, filters)
+    assert not students.matches(2, filters)
+
+
+def test_new_exam_notifies_views(db):
+    received = []
+    db.add_listener(lambda action, student_id, row, old_row: received.append((action, student_id, row == old_row)))
+    db.add_medical_exam((3, day(-1), "", 1, None, ""))
+    assert received == [("update", 3, True)]
+
+
+def test_exam_without_next_date_expires(db):
+    db.add_medical_exam((1, "2024-08-31", "", 1, None, ""))
+    db.add_medical_exam((2, "2024-01-15", "", 1, "2024-03-01", ""))
+    assert status(db)[1][2] == "2025-02-28" and status(db)[2][2] == "2024-03-01"
+    assert ids(db, {"medical_status": "expired"}) == [1, 2]
@@ -0,0 +1,79 @@
+# tests/test_query_scheduler.py
+import pytest
+
+from database.db_manager import DatabaseManager
+
+
+def student(name, department):
+    return (name, None, None, department, None, None, None, None, None, None, None, None, 0)
+
+
+@pytest.fixture
+def connections(tmp_path):
+    # Поток читает через своё соединение, поэтому база нужна в файле
+    db = DatabaseManager(str(tmp_path / "school.db"))
+    for number in range(6):
+        db.add_student(student(f"Ученик{number}", "Бокс" if number % 2 else "Самбо"))
+    yield db.connections
+    db.close()
+
+
+def test_worker_runs_only_latest_request(connections):
+    pytest.importorskip("PyQt5")
+    from ui.widgets.query_scheduler import StudentQueryWorker, _PageRequest
+
+    worker = StudentQueryWorker(connections)
+    pages = []
+    worker.page_ready.connect(lambda generation, page, next_key: pages.append((generation, page, next_key)))
+    # stop() в очереди после запросов слился бы с ними, поэтому поток останавливается после страницы
+    worker.page_ready.connect(lambda *args: worker.stop())
+    worker.submit(_PageRequest(1, {}, "name", False, None, 2))
+    worker.submit(_PageRequest(2, {"department": "Самбо"}, "name", False, None, 2))
+    worker.submit(_PageRequest(3, {"department": "Бокс"}, "name", True, None, 2))
+    worker.run()
+
+    ((generation, page, next_key),) = pages
+    assert generation == 3 and [s.full_name for s in page] == ["Ученик5", "Ученик3"]
+    assert next_key is not None
+
+
+def test_worker_interrupts_only_older_generations():
+    pytest.importorskip("PyQt5")
+    from ui.widgets.query_scheduler import StudentQueryWorker
+
+    class Connection:
+        interrupted = 0
+
+        def interrupt(self):
+            self.interrupted += 1
+
+    worker = StudentQueryWorker(None)
+    worker._conn, worker._running = Connection(), 2
+    worker.interrupt_before(2)
+    assert worker._conn.interrupted == 0
+    worker.interrupt_before(3)
+    assert worker._conn.interrupted == 1
+
+
+def test_scheduler_delivers_current_generation(connections, monkeypatch):
+    pytest.importorskip("PyQt5")
+    from ui.widgets import query_scheduler
+
+    # Поток не запускается: запросы выполняются в тесте вызовом run()
+    monkeypatch.setattr(query_scheduler.StudentQueryWorker, "start", lambda self: None)
+    scheduler = query_scheduler.StudentQueryScheduler(connections)
+    loaded = []
+    scheduler.loaded.connect(lambda page, next_key: loaded.append([s.full_name for s in page]))
+    scheduler._worker.page_ready.connect(lambda *args: scheduler._worker.stop())
+
+    scheduler.request({"department": "Самбо"}, "name", False, 10)
+    scheduler.request({"department": "Бокс"}, "name", False, 10)
+    # Страница прошлого поколения до срабатывания таймера не доходит
+    scheduler._on_page_ready(1, [], None)
+    scheduler._submit_pending()
+    scheduler._worker.run()
+    assert loaded == [["Ученик1", "Ученик3", "Ученик5"]]
+
+    scheduler._on_page_ready(1, [], None)
+    assert len(loaded) == 1
+    scheduler.close()
@@ -0,0 +1,107 @@
+# tests/test_repositories.py
+import sqlite3
+from datetime import date
+
+import pytest
+
+from database.db_manager import DatabaseManager
+
+
+def student(name, department, group_name, coach, birth_date, enrollment_date, cleared):
+    return (name, None, birth_date, department, group_name, coach, None, None, None, None, None,
+            enrollment_date, cleared)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    db.add_student(student("Иванов Иван", "Бокс", "Г1", "Петров Пётр", "2010-05-01", "2020-09-01", 1))
+    db.add_student(student("Сидоров Семён", "Самбо", "С1", "Орлов Олег", "2012-02-10", "2021-09-01", 0))
+    db.add_student(student("Козлов Кирилл", "Самбо", None, None, "2012-12-31", None, 0))
+    return db
+
+
+def names(students):
+    return sorted(student.full_name for student in students)
+
+
+def test_filter_form_filters(db):
+    pytest.importorskip("PyQt5")
+    from database.repositories import CoachRepository, DepartmentRepository, StudentRepository
+
+    students = StudentRepository(db)
+    departments = {department.name: department.id for department in DepartmentRepository(db).get_all()}
+    coaches = {coach.full_name: coach.id for coach in CoachRepository(db).get_all()}
+
+    assert names(students.filter({"department_id": departments["Самбо"]})) == ["Козлов Кирилл", "Сидоров Семён"]
+    assert names(students.filter({"coach_id": coaches["Орлов Олег"]})) == ["Сидоров Семён"]
+    assert names(students.filter({"birth_year": 2012, "training_allowed": False})) == \
+        ["Козлов Кирилл", "Сидоров Семён"]
+    # Граница «до» включительная
+    filters = students.query_filters({"enrollment_date_from": date(2020, 1, 1),
+                                      "enrollment_date_to": date(2020, 9, 1)})
+    assert filters == {"enrollment_date": ("2020-01-01", "2020-09-02")}
+    assert names(students.filter({"enrollment_date_to": date(2020, 9, 1)})) == ["Иванов Иван"]
+    assert names(students.filter({"department_id": 999})) == []
+    assert students.get(1).coach_id == coaches["Петров Пётр"] and students.get(3).coach_id is None
+
+
+def test_column_value_matches_stored_row(db):
+    pytest.importorskip("PyQt5")
+    from database.db_manager import STUDENT_COLUMNS
+    from database.repositories import StudentRepository
+
+    for student in StudentRepository(db).get_all():
+        row = student.to_row()
+        for index, column in enumerate(STUDENT_COLUMNS):
+            if column != "age":
+                assert student.column_value(column) == row[index]
+        assert student.column_value("age") == student.age
+        assert student.column_value("coach_id") == student.coach_id
+
+
+def test_medical_history(db):
+    pytest.importorskip("PyQt5")
+    from database.repositories import MedicalRepository
+    from models.medical import MedicalExamination
+
+    medical = MedicalRepository(db)
+    medical.add(MedicalExamination(student_id=1, examination_date=date(2024, 3, 1), result="Годен",
+                                   next_examination_date=date(2024, 9, 1), clearance=True))
+    latest = MedicalExamination(student_id=1, examination_date=date(2024, 9, 2), result="Ограничения")
+    medical.add(latest)
+
+    assert [exam.examination_date for exam in medical.for_student(1)] == [date(2024, 9, 2), date(2024, 3, 1)]
+    assert medical.latest(1).id == latest.id and not medical.latest(1).clearance
+    assert medical.for_student(1)[1].next_examination_date == date(2024, 9, 1)
+    db.delete_student(1)
+    assert medical.for_student(1) == []
+
+
+def test_legacy_medical_exams_are_migrated(tmp_path):
+    pytest.importorskip("PyQt5")
+    from database.repositories import MedicalRepository
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, age INTEGER, birth_date TEXT,
+            department TEXT, group_name TEXT, coach TEXT, school TEXT, rank TEXT, rank_date TEXT,
+            snils TEXT, passport TEXT, enrollment_date TEXT, medical_clearance BOOLEAN DEFAULT 0
+        );
+        CREATE TABLE medical_exams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, student_id INTEGER, exam_date TEXT, results TEXT,
+            clearance BOOLEAN, FOREIGN KEY (student_id) REFERENCES students(id)
+        );
+        INSERT INTO students (name) VALUES ('Иванов Иван');
+        INSERT INTO medical_exams (student_id, exam_date, results, clearance) VALUES
+            (1, '15/03/2024', 'Годен', 1), (1, '', NULL, 0), (7, '01/01/2024', NULL, 1);
+    ''')
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    (exam,) = MedicalRepository(db).for_student(1)
+    assert (exam.examination_date, exam.result, exam.clearance) == (date(2024, 3, 15), "Годен", True)
+    db.conn.close()
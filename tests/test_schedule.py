@@ -0,0 +1,89 @@
+# tests/test_schedule.py
+import random
+from datetime import date
+from itertools import combinations
+
+import pytest
+
+from models.schedule import ScheduleSession
+from utils.schedule import conflicts_with, find_conflicts, first_common_day, occurrences
+
+SEASON_START = date(2024, 9, 2)  # понедельник
+SEASON_END = date(2025, 5, 31)
+
+
+def session(id, weekday, start, end, group_id=1, coach_id=None, hall_id=None,
+            valid_from=SEASON_START, valid_to=SEASON_END):
+    return ScheduleSession(id, group_id, coach_id, hall_id, weekday, start, end, valid_from, valid_to)
+
+
+def test_occurrences_are_lazy_and_ordered():
+    sessions = [session(1, 2, 600, 690), session(2, 0, 1080, 1170), session(3, 0, 900, 990, group_id=2)]
+    week = list(occurrences(sessions, date(2024, 9, 2), date(2024, 9, 9)))
+    assert [(item.day, item.session.id) for item in week] == [
+        (date(2024, 9, 2), 3), (date(2024, 9, 2), 2), (date(2024, 9, 4), 1)]
+    assert week[0].end.hour == 16 and week[0].end.minute == 30
+    # Бесконечный по периоду генератор можно остановить на первом занятии
+    first = next(occurrences([session(4, 6, 0, 60, valid_to=None)], SEASON_START, date(9999, 1, 1)))
+    assert first.day == date(2024, 9, 8)
+
+
+def test_first_common_day():
+    first = session(1, 0, 600, 700, valid_from=date(2024, 9, 4), valid_to=date(2024, 9, 8))
+    second = session(2, 0, 600, 700, valid_from=date(2024, 9, 1), valid_to=None)
+    # Периоды пересекаются со среды по воскресенье, понедельника в них нет
+    assert first_common_day(first, second) is None
+    first.valid_to = date(2024, 9, 9)
+    assert first_common_day(first, second) == date(2024, 9, 9)
+
+
+def test_conflicts_per_resource():
+    sessions = [
+        session(1, 0, 600, 690, group_id=1, coach_id=1, hall_id=1),
+        session(2, 0, 660, 750, group_id=2, coach_id=1, hall_id=2),
+        session(3, 0, 690, 780, group_id=3, coach_id=2, hall_id=1),
+        session(4, 1, 600, 690, group_id=4, coach_id=1, hall_id=1),
+        session(5, 0, 600, 690, group_id=5, coach_id=3, hall_id=1, valid_from=date(2025, 6, 1), valid_to=None),
+    ]
+    found = {(resource, first.id, second.id) for resource, _, first, second, _ in find_conflicts(sessions)}
+    # Занятия 1 и 3 только соприкасаются, 4 — в другой день, 5 начинает действовать после конца сезона
+    assert found == {("coach_id", 1, 2)}
+    candidate = session(None, 0, 700, 720, group_id=6, coach_id=2, hall_id=2)
+    assert {(resource, other.id) for resource, _, other, _, _ in conflicts_with(candidate, sessions)} == {
+        ("coach_id", 3), ("hall_id", 2)}
+
+
+def test_sweep_matches_pairwise():
+    generator = random.Random(7)
+    sessions = []
+    for number in range(400):
+        start = generator.randrange(8 * 60, 21 * 60, 15)
+        sessions.append(session(number, generator.randrange(7), start, start + generator.choice((45, 60, 90)),
+                                group_id=generator.randrange(150), coach_id=generator.randrange(40),
+                                hall_id=generator.randrange(12)))
+    expected = set()
+    for first, second in combinations(sessions, 2):
+        for resource, _, one, other, _ in conflicts_with(second, [first]):
+            expected.add((resource, frozenset((one.id, other.id))))
+    found = {(resource, frozenset((first.id, second.id))) for resource, _, first, second, _ in find_conflicts(sessions)}
+    assert found == expected
+
+
+def test_repository_rejects_double_booking():
+    # Модели отделений используют QDate
+    pytest.importorskip("PyQt5")
+    from database.db_manager import DatabaseManager
+    from database.repositories import ScheduleRepository
+
+    db = DatabaseManager(":memory:")
+    db.add_student(("Иванов Иван", None, "2010-01-01", "Бокс", "Г1", "Петров Пётр",
+                    None, None, None, None, None, "2020-09-01", 0))
+    db.add_student(("Сидоров Олег", None, "2010-01-01", "Бокс", "Г2", "Петров Пётр",
+                    None, None, None, None, None, "2020-09-01", 0))
+    schedule = ScheduleRepository(db)
+    schedule.add(session(None, 0, 600, 690, group_id=1))
+    # Тренер по умолчанию — тренер группы, а обе группы ведёт один тренер
+    with pytest.raises(ValueError):
+        schedule.add(session(None, 0, 630, 720, group_id=2))
+    schedule.add(session(None, 0, 690, 780, group_id=2, hall_id=schedule.hall_id("Зал 1")))
+    assert schedule.conflicts() == []
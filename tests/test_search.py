@@ -0,0 +1,45 @@
+# tests/test_search.py
+import pytest
+
+from database.db_manager import DatabaseManager
+from database.search import build_match_query, matches_name
+
+
+def student(name, department=None):
+    return (name, None, None, department, None, None, None, None, None, None, None, None, 0)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for name, department in (("Алёшин Пётр", "Бокс"), ("Алешина Анна", "Самбо"),
+                             ("Иванов Фёдор", "Бокс"), ("Фёдоров Иван", "Самбо")):
+        db.add_student(student(name, department))
+    return db
+
+
+def found(db, text, **filters):
+    rows = db.query_students(dict(filters, search_text=text)).fetchall()
+    return sorted(row[1] for row in rows)
+
+
+def test_match_query():
+    assert build_match_query("  Алёшин  п ") == '"алешин"* "п"*'
+    assert build_match_query("--") is None
+    assert matches_name("Фёдоров Иван", "ФЕД ив") and not matches_name("Иванов Фёдор", "иванова")
+
+
+def test_search_folds_case_and_yo(db):
+    assert found(db, "алешин") == ["Алешина Анна", "Алёшин Пётр"]
+    assert found(db, "АЛЁШИН п") == ["Алёшин Пётр"]
+    assert found(db, "федор") == ["Иванов Фёдор", "Фёдоров Иван"]
+    assert found(db, "фед", department="Самбо") == ["Фёдоров Иван"]
+    # Пустой запрос не ограничивает выборку
+    assert len(found(db, " ")) == 4
+
+
+def test_index_follows_changes(db):
+    db.update_student(3, student("Сидоров Фёдор", "Бокс"))
+    db.delete_student(4)
+    assert found(db, "федор") == ["Сидоров Фёдор"]
+    assert found(db, "иванов") == []
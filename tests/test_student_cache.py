@@ -0,0 +1,34 @@
+# tests/test_student_cache.py
+import database.db_manager as db_manager
+from database.db_manager import DatabaseManager
+
+
+def student(name):
+    return (name, None, "2010-01-01", "Бокс", None, None, None, None, None, None, None, "2020-09-01", 0)
+
+
+def test_cache_returns_same_row_until_write():
+    db = DatabaseManager(":memory:")
+    student_id = db.add_student(student("Иванов Иван"))
+    row = db.get_student(student_id)
+    assert db.get_student(student_id) is row
+
+    db.update_student(student_id, student("Петров Пётр"))
+    updated = db.get_student(student_id)
+    assert updated is not row and updated[1] == "Петров Пётр"
+
+    db.set_students_medical_clearance([student_id], True)
+    assert db.get_student(student_id)[13] == 1
+    db.delete_student(student_id)
+    assert db.get_student(student_id) is None
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(db_manager, "STUDENT_CACHE_SIZE", 3)
+    db = DatabaseManager(":memory:")
+    ids = [db.add_student(student(f"Ученик{number} Тест")) for number in range(5)]
+    first = db.get_student(ids[0])
+    for student_id in ids[1:]:
+        db.get_student(student_id)
+    assert list(db._student_cache) == ids[2:]
+    assert db.get_student(ids[0]) is not first
@@ -0,0 +1,93 @@
+# tests/test_students_table.py
+import pytest
+
+from database.db_manager import DatabaseManager
+
+
+def student(name, department=None, school=None):
+    return (name, None, None, department, None, None, school, None, None, None, None, None, 0)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number in range(10):
+        db.add_student(student(f"Ученик{number}", "Бокс" if number % 2 else "Самбо",
+                               None if number % 3 == 0 else f"Школа{number % 4}"))
+    return db
+
+
+def test_query_filters_and_sort(db):
+    rows = db.query_students({"department": "Бокс"}).fetchall()
+    assert [row[1] for row in rows] == ["Ученик1", "Ученик3", "Ученик5", "Ученик7", "Ученик9"]
+    # NULL идут первыми, одинаковые значения — по id
+    rows = db.query_students(sort_by="school").fetchall()
+    assert [row[7] for row in rows][:4] == [None] * 4
+    assert [row[0] for row in rows][:4] == [1, 4, 7, 10]
+    assert [row[7] for row in db.query_students(sort_by="school", descending=True)][0] == "Школа3"
+
+
+def test_unknown_columns_are_rejected(db):
+    with pytest.raises(ValueError):
+        db.query_students({"id; DROP TABLE students": 1})
+    with pytest.raises(ValueError):
+        db.query_students(sort_by="name DESC")
+
+
+def test_model_fetches_pages_lazily(db):
+    pytest.importorskip("PyQt5")
+    from PyQt5.QtCore import Qt
+    from database.repositories import StudentRepository
+    from ui.widgets.students_table import StudentsTableModel, MEDICAL_COLUMN
+
+    model = StudentsTableModel(StudentRepository(db), page_size=4)
+    model.reload()
+    assert model.rowCount() == 0 and model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 4
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 10
+    assert model.data(model.index(0, 0)) == "Ученик0"
+    assert model.data(model.index(0, MEDICAL_COLUMN)) is False
+
+    model.sort(0, Qt.DescendingOrder)
+    model.fetchMore()
+    assert model.student_id(0) == 10
+
+
+def test_listeners_get_changed_rows(db):
+    events = []
+    db.add_listener(lambda *event: events.append(event))
+    student_id = db.add_student(student("Новый", "Бокс"))
+    db.update_student(student_id, student("Новый", "Самбо"))
+    db.delete_student(student_id)
+    db.delete_student(student_id)
+
+    inserted, updated, deleted = events
+    assert inserted[:2] == ("insert", student_id) and inserted[3] is None
+    assert updated[0] == "update" and (updated[2][4], updated[3][4]) == ("Самбо", "Бокс")
+    assert deleted[0] == "delete" and deleted[2] is None and deleted[3][1] == "Новый"
+
+
+def test_model_applies_single_rows(db):
+    pytest.importorskip("PyQt5")
+    from PyQt5.QtCore import Qt
+    from database.repositories import StudentRepository
+    from ui.widgets.students_table import StudentsTableModel
+
+    model = StudentsTableModel(StudentRepository(db), page_size=100)
+    model.set_filters({"department": "Бокс"})
+    model.sort(0, Qt.AscendingOrder)
+    model.fetchMore()
+    names = lambda: [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+    added = db.add_student(student("Ученик4а", "Бокс"))
+    db.add_student(student("Ученик4б", "Самбо"))
+    assert names() == ["Ученик1", "Ученик3", "Ученик4а", "Ученик5", "Ученик7", "Ученик9"]
+    # Изменение колонки сортировки переставляет строку, выход из фильтра убирает её
+    db.update_student(added, student("Ученик8", "Бокс"))
+    assert names() == ["Ученик1", "Ученик3", "Ученик5", "Ученик7", "Ученик8", "Ученик9"]
+    db.update_student(added, student("Ученик8", "Самбо"))
+    db.delete_student(2)
+    assert names() == ["Ученик3", "Ученик5", "Ученик7", "Ученик9"]
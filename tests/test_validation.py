@@ -0,0 +1,58 @@
+# tests/test_validation.py
+from datetime import date
+
+import pytest
+
+from utils.importer import parse_rows
+from utils.validation import format_snils, validate_batch, validate_snils, validate_student
+
+TODAY = date(2024, 6, 1)
+
+
+def test_snils_checksum():
+    assert validate_snils("11223344595")
+    assert not validate_snils("11223344596")
+    assert not validate_snils("112-233-445 95")
+
+
+def test_format_snils():
+    assert format_snils("11223344595") == "112-233-445 95"
+    assert format_snils("112-233-445 95") == "112-233-445 95"
+    assert format_snils(None) == ""
+    assert format_snils("123") == "123"
+
+
+def test_batch_reports_errors_per_row():
+    cleaned, errors = validate_batch({
+        "name": ["Иванов Иван", "Smith", "Петров  Пётр"],
+        "department": ["Бокс", "Бокс", ""],
+        "birth_date": ["01/02/2010", "2010-02-01", "31/02/2010"],
+        "enrollment_date": ["01/09/2020", "01/09/2030", "01/09/2020"],
+        "snils": ["112-233-445 95", "11223344596", ""],
+        "passport": ["", "1234 567890", "1234567890"],
+    }, TODAY)
+    assert errors[0] == []
+    assert len(errors[1]) == 3
+    assert len(errors[2]) == 3
+    assert cleaned["name"][2] == "Петров Пётр"
+    assert cleaned["birth_date"][:2] == [date(2010, 2, 1), date(2010, 2, 1)]
+    assert cleaned["snils"][0] == "11223344595"
+    assert cleaned["rank_date"] == [None, None, None]
+
+
+def test_validate_student_raises_all_errors():
+    with pytest.raises(ValueError) as error:
+        validate_student({"name": "Иван", "department": "Бокс", "birth_date": "01/02/2010"}, TODAY)
+    assert str(error.value) == "Дата зачисления обязательна"
+
+
+def test_importer_rows_match_dialog_rules():
+    valid = ["Иванов Иван", "", "01/02/2010", "Бокс", "Г1", "Тренер", "", "", "",
+             "11223344595", "", "01/09/2020", "Да"]
+    invalid = list(valid)
+    invalid[9] = "11223344596"
+    results = parse_rows([valid, invalid, valid[:5]], TODAY)
+    assert results[0][1] is None
+    assert results[0][0][1:4] == (None, "2010-02-01", "Бокс")
+    assert "контрольная сумма" in results[1][1]
+    assert "колонок" in results[2][1]
@@ -0,0 +1,74 @@
+# tests/test_worklist.py
+from datetime import date
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from database.worklist import MedicalWorklist
+from utils.config import load_config, medical_settings
+
+TODAY = date(2024, 6, 1)
+
+
+@pytest.fixture
+def db():
+    db = DatabaseManager(":memory:")
+    for number in range(5):
+        db.add_student((f"Ученик{number} Тест", None, "2010-01-01", "Бокс", "Группа", "Петров Пётр",
+                        None, None, None, None, None, "2020-09-01", 0))
+    db.add_medical_exam((1, "2023-11-01", "", 1, "2024-05-01", ""))
+    db.add_medical_exam((2, "2023-12-10", "", 1, "2024-06-10", ""))
+    db.add_medical_exam((3, "2024-01-01", "", 1, "2024-07-01", ""))
+    db.add_medical_exam((4, "2024-05-20", "", 1, "2024-06-01", ""))
+    return db
+
+
+def test_queues(db):
+    worklist = MedicalWorklist(db, due_days=30)
+    assert [row[0] for row in worklist.overdue(TODAY)] == [1]
+    assert [(row[0], row[-1]) for row in worklist.due_soon(TODAY)] == [(4, "2024-06-01"), (2, "2024-06-10")]
+    assert [row[0] for row in worklist.due_soon(TODAY, days=31)] == [4, 2, 3]
+    assert worklist.counts(TODAY) == (1, 2)
+
+
+def test_new_exam_moves_student(db):
+    worklist = MedicalWorklist(db, due_days=30)
+    db.add_medical_exam((1, "2024-05-31", "", 1, "2024-11-30", ""))
+    assert worklist.counts(TODAY) == (0, 2)
+    assert db.count_students({"medical_due": worklist.due_range(TODAY)}) == 2
+
+
+def test_due_days_setting(tmp_path):
+    assert medical_settings()["due_days"] == 30
+    site = tmp_path / "app_config.ini"
+    site.write_text("[medical]\ndue_days = 0\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        medical_settings(load_config(str(site)))
+
+
+def test_exams_from_repository_feed_panel(db):
+    pytest.importorskip("PyQt5")
+    from database.repositories import MedicalRepository
+    from models.medical import MedicalExamination
+
+    worklist = MedicalWorklist(db, due_days=30)
+    panel = []
+    # Так главное окно пересчитывает панель медосмотров после уведомления базы
+    db.add_listener(lambda *event: panel.append(worklist.counts(TODAY)))
+    medical = MedicalRepository(db)
+
+    # Без даты следующего осмотра срок — через полгода, 5 июня
+    medical.add(MedicalExamination(student_id=5, examination_date=date(2023, 12, 5), clearance=True))
+    assert panel == [(1, 3)]
+    assert [row[0] for row in worklist.due_soon(TODAY)] == [4, 5, 2]
+
+    exam = medical.latest(1)
+    exam.next_examination_date = date(2024, 6, 20)
+    medical.update(exam)
+    assert panel[-1] == (0, 4)
+    assert [(row[0], row[-1]) for row in worklist.due_soon(TODAY)] == \
+        [(4, "2024-06-01"), (5, "2024-06-05"), (2, "2024-06-10"), (1, "2024-06-20")]
+    assert db.count_students({"medical_due": worklist.due_range(TODAY)}) == 4
+
+    medical.delete(exam.id)
+    assert panel[-1] == (0, 3) and worklist.overdue(TODAY) == []
@@ -0,0 +1,60 @@
+# ui/forms/analytics_form.py
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+                             QAbstractItemView, QTabWidget)
+from PyQt5.QtCore import Qt
+
+from database.analytics import DIMENSIONS
+from utils.attendance import percent
+
+COUNT_HEADERS = ["Значение", "Учеников", "%"]
+TREND_HEADERS = ["Месяц", "Зачислено", "Всего к концу месяца"]
+
+
+def _table(headers, rows):
+    table = QTableWidget(len(rows), len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    table.setSelectionBehavior(QAbstractItemView.SelectRows)
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(str(value))
+            if column:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(row, column, item)
+    table.resizeColumnsToContents()
+    return table
+
+
+class AnalyticsForm(QDialog):
+    """Статистика: численность учеников по разрезам и динамика зачисления.
+
+    Сводку даёт общий для главного окна StudentAnalytics, поэтому окно
+    открывается без запросов к базе, если данные не менялись.
+    """
+
+    def __init__(self, analytics, parent=None):
+        super().__init__(parent)
+        self.analytics = analytics
+
+        self.setWindowTitle("Статистика")
+        self.resize(700, 550)
+
+        self.init_ui()
+
+    def init_ui(self):
+        summary = self.analytics.summary()
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(QLabel(f"Всего учеников: {summary.total}"))
+
+        tabs = QTabWidget()
+        for dimension, title in DIMENSIONS.items():
+            rows = [("Не указано" if value is None else value, count, percent(count, summary.total))
+                    for value, count in summary.values(dimension)]
+            tabs.addTab(_table(COUNT_HEADERS, rows), title)
+        tabs.addTab(_table(TREND_HEADERS, summary.enrollment_trend()), "Зачисление")
+        main_layout.addWidget(tabs)
+
+        close_button = QPushButton("Закрыть")
+        close_button.clicked.connect(self.accept)
+        main_layout.addWidget(close_button)
+        self.setLayout(main_layout)
@@ -0,0 +1,132 @@
+# ui/forms/attendance_form.py
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+                             QDateEdit, QDateTimeEdit, QTableWidget, QTableWidgetItem, QMessageBox)
+from PyQt5.QtCore import Qt, QDate, QDateTime
+
+from database.repositories import AttendanceRepository, GroupRepository, StudentRepository
+from utils.attendance import percent
+from utils.logger import timed
+
+
+class AttendanceForm(QDialog):
+    """Журнал посещаемости группы за месяц: ученики по строкам, занятия по столбцам"""
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.attendance = AttendanceRepository(db)
+        self.groups = GroupRepository(db)
+        self.students = StudentRepository(db)
+        self.sheet = None
+
+        self.setWindowTitle("Посещаемость")
+        self.resize(900, 600)
+
+        self.init_ui()
+        self.load_sheet()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+
+        select_layout = QHBoxLayout()
+        self.group_combo = QComboBox()
+        for group in self.groups.get_all():
+            self.group_combo.addItem(group.name, group.id)
+        self.group_combo.currentIndexChanged.connect(self.load_sheet)
+        select_layout.addWidget(QLabel("Группа:"))
+        select_layout.addWidget(self.group_combo, 1)
+        self.month_input = QDateEdit(QDate.currentDate())
+        self.month_input.setDisplayFormat("MM.yyyy")
+        self.month_input.dateChanged.connect(self.load_sheet)
+        select_layout.addWidget(QLabel("Месяц:"))
+        select_layout.addWidget(self.month_input)
+        main_layout.addLayout(select_layout)
+
+        self.table = QTableWidget()
+        main_layout.addWidget(self.table)
+        self.summary_label = QLabel()
+        main_layout.addWidget(self.summary_label)
+
+        # Занятие вне расписания (перенос, дополнительная тренировка)
+        extra_layout = QHBoxLayout()
+        self.extra_session = QDateTimeEdit(QDateTime.currentDateTime())
+        self.extra_session.setDisplayFormat("dd.MM.yyyy HH:mm")
+        self.extra_session.setCalendarPopup(True)
+        extra_layout.addWidget(QLabel("Занятие вне расписания:"))
+        extra_layout.addWidget(self.extra_session)
+        extra_button = QPushButton("Добавить")
+        extra_button.clicked.connect(self.add_session)
+        extra_layout.addWidget(extra_button)
+        extra_layout.addStretch()
+        main_layout.addLayout(extra_layout)
+
+        buttons_layout = QHBoxLayout()
+        save_button = QPushButton("Сохранить")
+        save_button.clicked.connect(self.save_sheet)
+        buttons_layout.addWidget(save_button)
+        close_button = QPushButton("Закрыть")
+        close_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(close_button)
+        main_layout.addLayout(buttons_layout)
+
+        self.setLayout(main_layout)
+
+    def load_sheet(self):
+        group_id = self.group_combo.currentData()
+        if group_id is None:
+            self.sheet = None
+            self.table.clear()
+            return
+        self.sheet = self.attendance.sheet(group_id, self.month_input.date().toString("yyyy-MM"))
+        self.show_sheet()
+
+    def show_sheet(self):
+        sheet = self.sheet
+        self.table.blockSignals(True)
+        self.table.clear()
+        self.table.setRowCount(len(sheet.roster))
+        self.table.setColumnCount(len(sheet.sessions))
+        # Ключ занятия «ГГГГ-ММ-ДД ЧЧ:ММ» показывается как «ДД.ММ ЧЧ:ММ»
+        self.table.setHorizontalHeaderLabels([f"{key[8:10]}.{key[5:7]}\n{key[11:]}" for key in sheet.sessions])
+        names = []
+        for position, student_id in enumerate(sheet.roster):
+            student = self.students.get(student_id)
+            names.append(student.full_name if student else f"Ученик №{student_id}")
+            for session in range(len(sheet.sessions)):
+                item = QTableWidgetItem()
+                item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+                item.setCheckState(Qt.Checked if sheet.marks[position] >> session & 1 else Qt.Unchecked)
+                self.table.setItem(position, session, item)
+        self.table.setVerticalHeaderLabels(names)
+        self.table.blockSignals(False)
+        self.update_summary()
+
+    def read_marks(self):
+        """Переносит отметки из таблицы в журнал"""
+        for position, student_id in enumerate(self.sheet.roster):
+            for session in range(len(self.sheet.sessions)):
+                self.sheet.mark(student_id, session, self.table.item(position, session).checkState() == Qt.Checked)
+
+    def update_summary(self):
+        attended, possible = self.sheet.total()
+        self.summary_label.setText(f"Занятий: {len(self.sheet.sessions)}. "
+                                   f"Посещаемость группы: {percent(attended, possible)}%")
+
+    def add_session(self):
+        if self.sheet is None:
+            return
+        moment = self.extra_session.dateTime()
+        if moment.toString("yyyy-MM") != self.sheet.month:
+            QMessageBox.warning(self, "Ошибка", "Занятие должно быть в выбранном месяце")
+            return
+        self.read_marks()
+        self.sheet.add_session(moment.toString("yyyy-MM-dd HH:mm"))
+        self.show_sheet()
+
+    def save_sheet(self):
+        if self.sheet is None:
+            return
+        self.read_marks()
+        with timed("save_attendance"):
+            self.attendance.save(self.sheet)
+        self.update_summary()
+        QMessageBox.information(self, "Посещаемость", "Журнал сохранён")
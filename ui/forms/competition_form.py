@@ -0,0 +1,248 @@
+# ui/forms/competition_form.py
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QComboBox,
+                             QLineEdit, QPushButton, QDateEdit, QTableWidget, QTableWidgetItem,
+                             QAbstractItemView, QMessageBox, QTabWidget, QWidget)
+from PyQt5.QtCore import Qt, QDate
+
+from database.repositories import CompetitionRepository, DepartmentRepository, StudentRepository
+from models.competition import RESULT_TYPES, Competition, format_result, parse_result
+from utils.dates import QT_DISPLAY_FORMAT, format_display, season_of
+from utils.logger import timed
+
+RESULT_HEADERS = ["Место", "Ученик", "Результат", "Очки"]
+STANDINGS_HEADERS = ["Место", "Ученик", "Очки", "Соревнований"]
+
+
+def _fill_table(table, rows, user_data=None):
+    table.setRowCount(len(rows))
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            item = QTableWidgetItem("" if value is None else str(value))
+            if user_data is not None:
+                item.setData(Qt.UserRole, user_data[row])
+            table.setItem(row, column, item)
+
+
+def _read_only_table(headers):
+    table = QTableWidget(0, len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    table.setSelectionBehavior(QAbstractItemView.SelectRows)
+    table.setSelectionMode(QAbstractItemView.SingleSelection)
+    return table
+
+
+class CompetitionForm(QDialog):
+    """Соревнования: протоколы с местами и зачёт сезона по отделениям"""
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.competitions = CompetitionRepository(db)
+        self.departments = DepartmentRepository(db)
+        self.students = StudentRepository(db)
+
+        self.setWindowTitle("Соревнования")
+        self.resize(800, 600)
+
+        self.init_ui()
+        self.load_competitions()
+        self.load_seasons()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+        tabs = QTabWidget()
+        tabs.addTab(self._results_tab(), "Протоколы")
+        tabs.addTab(self._standings_tab(), "Зачёт сезона")
+        main_layout.addWidget(tabs)
+
+        close_button = QPushButton("Закрыть")
+        close_button.clicked.connect(self.accept)
+        main_layout.addWidget(close_button)
+        self.setLayout(main_layout)
+
+    def _department_combo(self, empty_text):
+        combo = QComboBox()
+        combo.addItem(empty_text, None)
+        for department in self.departments.get_all():
+            combo.addItem(department.name, department.id)
+        return combo
+
+    def _results_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        select_layout = QHBoxLayout()
+        self.competition_combo = QComboBox()
+        self.competition_combo.currentIndexChanged.connect(self.load_results)
+        select_layout.addWidget(QLabel("Соревнование:"))
+        select_layout.addWidget(self.competition_combo, 1)
+        delete_button = QPushButton("Удалить соревнование")
+        delete_button.clicked.connect(self.delete_competition)
+        select_layout.addWidget(delete_button)
+        layout.addLayout(select_layout)
+
+        # Новое соревнование
+        new_layout = QFormLayout()
+        self.name_input = QLineEdit()
+        new_layout.addRow("Название:", self.name_input)
+        self.date_input = QDateEdit(QDate.currentDate())
+        self.date_input.setCalendarPopup(True)
+        self.date_input.setDisplayFormat(QT_DISPLAY_FORMAT)
+        new_layout.addRow("Дата:", self.date_input)
+        self.department_combo = self._department_combo("Без отделения")
+        new_layout.addRow("Отделение:", self.department_combo)
+        self.result_type_combo = QComboBox()
+        for result_type, (title, _) in RESULT_TYPES.items():
+            self.result_type_combo.addItem(title, result_type)
+        new_layout.addRow("Результат:", self.result_type_combo)
+        add_button = QPushButton("Добавить соревнование")
+        add_button.clicked.connect(self.add_competition)
+        new_layout.addRow(add_button)
+        layout.addLayout(new_layout)
+
+        self.results_table = _read_only_table(RESULT_HEADERS)
+        layout.addWidget(self.results_table)
+
+        # Результат участника
+        entry_layout = QHBoxLayout()
+        self.student_combo = QComboBox()
+        self.student_combo.setEditable(True)
+        self.student_combo.setInsertPolicy(QComboBox.NoInsert)
+        entry_layout.addWidget(QLabel("Ученик:"))
+        entry_layout.addWidget(self.student_combo, 1)
+        self.result_input = QLineEdit()
+        self.result_input.setPlaceholderText("пусто — заявка без результата")
+        entry_layout.addWidget(self.result_input)
+        save_button = QPushButton("Записать результат")
+        save_button.clicked.connect(self.save_result)
+        entry_layout.addWidget(save_button)
+        remove_button = QPushButton("Снять заявку")
+        remove_button.clicked.connect(self.remove_entry)
+        entry_layout.addWidget(remove_button)
+        layout.addLayout(entry_layout)
+        return tab
+
+    def _standings_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        select_layout = QHBoxLayout()
+        self.season_combo = QComboBox()
+        self.season_combo.currentIndexChanged.connect(self.load_standings)
+        select_layout.addWidget(QLabel("Сезон:"))
+        select_layout.addWidget(self.season_combo)
+        self.standings_department_combo = self._department_combo("Без отделения")
+        self.standings_department_combo.currentIndexChanged.connect(self.load_standings)
+        select_layout.addWidget(QLabel("Отделение:"))
+        select_layout.addWidget(self.standings_department_combo, 1)
+        layout.addLayout(select_layout)
+        self.standings_table = _read_only_table(STANDINGS_HEADERS)
+        layout.addWidget(self.standings_table)
+        return tab
+
+    def current_competition(self):
+        competition_id = self.competition_combo.currentData()
+        return self.competitions.get(competition_id) if competition_id is not None else None
+
+    def load_competitions(self, select_id=None):
+        self.competition_combo.blockSignals(True)
+        self.competition_combo.clear()
+        for competition in self.competitions.get_all():
+            self.competition_combo.addItem(f"{format_display(competition.date)} {competition.name}", competition.id)
+        if select_id is not None:
+            self.competition_combo.setCurrentIndex(self.competition_combo.findData(select_id))
+        self.competition_combo.blockSignals(False)
+        self.load_results()
+
+    def load_seasons(self):
+        current = self.season_combo.currentData()
+        self.season_combo.blockSignals(True)
+        self.season_combo.clear()
+        for season in self.competitions.seasons():
+            self.season_combo.addItem(f"{season}/{season + 1}", season)
+        index = self.season_combo.findData(current)
+        self.season_combo.setCurrentIndex(index if index >= 0 else 0)
+        self.season_combo.blockSignals(False)
+        self.load_standings()
+
+    def load_results(self):
+        competition = self.current_competition()
+        self.student_combo.clear()
+        if competition is None:
+            self.results_table.setRowCount(0)
+            return
+        results = self.competitions.results(competition.id)
+        _fill_table(self.results_table,
+                    [(result.place, result.student_name, format_result(competition.result_type, result.value),
+                      result.points) for result in results],
+                    [result.student_id for result in results])
+        # Заявить можно учеников отделения соревнования
+        department = self.departments.get(competition.department_id) if competition.department_id else None
+        filters = {"department": department.name} if department else None
+        for student in self.students.query(filters, sort_by="name"):
+            self.student_combo.addItem(student.full_name, student.id)
+        self.result_input.setPlaceholderText(
+            f"{RESULT_TYPES[competition.result_type][0]}; пусто — заявка без результата")
+
+    def load_standings(self):
+        season = self.season_combo.currentData()
+        if season is None:
+            self.standings_table.setRowCount(0)
+            return
+        standings = self.competitions.standings(season, self.standings_department_combo.currentData())
+        _fill_table(self.standings_table, [(place, name, points, events)
+                                           for place, _, name, points, events in standings])
+
+    def add_competition(self):
+        name = self.name_input.text().strip()
+        if not name:
+            QMessageBox.warning(self, "Ошибка", "Введите название соревнования")
+            return
+        competition = Competition(name=name, date=self.date_input.date().toPyDate(),
+                                  department_id=self.department_combo.currentData(),
+                                  result_type=self.result_type_combo.currentData())
+        with timed("save_competition"):
+            self.competitions.add(competition)
+        self.name_input.clear()
+        self.load_competitions(competition.id)
+        self.load_seasons()
+
+    def delete_competition(self):
+        competition = self.current_competition()
+        if competition is None:
+            return
+        reply = QMessageBox.question(self, "Подтверждение",
+                                     f"Удалить соревнование «{competition.name}» вместе с протоколом?",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.competitions.delete(competition.id)
+            self.load_competitions()
+            self.load_seasons()
+
+    def save_result(self):
+        competition = self.current_competition()
+        student_id = self.student_combo.currentData()
+        if competition is None or student_id is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите соревнование и ученика")
+            return
+        text = self.result_input.text().strip()
+        try:
+            value = parse_result(competition.result_type, text) if text else None
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", str(e))
+            return
+        with timed("save_result", competition_id=competition.id):
+            self.competitions.set_result(competition.id, student_id, value)
+        self.result_input.clear()
+        self.load_results()
+        if season_of(competition.date) == self.season_combo.currentData():
+            self.load_standings()
+
+    def remove_entry(self):
+        competition = self.current_competition()
+        item = self.results_table.item(self.results_table.currentRow(), 0)
+        if competition is None or item is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите участника в протоколе")
+            return
+        self.competitions.remove_entry(competition.id, item.data(Qt.UserRole))
+        self.load_results()
+        self.load_standings()
@@ -0,0 +1,69 @@
+# ui/forms/export_dialog.py
+import sqlite3
+
+from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtWidgets import QProgressDialog
+
+from database.db_manager import DatabaseManager
+from database.repositories import StudentRepository
+from utils.export import export_to_csv
+from utils.logger import get_logger, timed
+
+log = get_logger(__name__)
+
+
+class CsvExportWorker(QThread):
+    """Экспорт в CSV в отдельном потоке с собственным соединением с БД"""
+    progress = pyqtSignal(int)
+    completed = pyqtSignal(int)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, connections, filename, filters=None, sort_by=None, descending=False, parent=None):
+        super().__init__(parent)
+        self.connections = connections
+        self.filename = filename
+        self.filters = filters
+        self.sort_by = sort_by
+        self.descending = descending
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        # Соединение sqlite3 нельзя передавать между потоками: поток читает через своё
+        db = None
+        try:
+            db = DatabaseManager(connections=self.connections)
+            with timed("export_csv"):
+                written = export_to_csv(StudentRepository(db), self.filename, self.filters, self.sort_by,
+                                        self.descending, progress=self.progress.emit,
+                                        is_cancelled=lambda: self._cancel_requested)
+        except (OSError, sqlite3.Error) as e:
+            log.error("Не удалось экспортировать учеников", exc_info=True)
+            self.failed.emit(str(e))
+            return
+        finally:
+            if db is not None:
+                db.close()
+        if written is None:
+            self.cancelled.emit()
+        else:
+            self.completed.emit(written)
+
+
+class ExportProgressDialog(QProgressDialog):
+    """Окно прогресса экспорта с кнопкой отмены"""
+
+    def __init__(self, worker, total, parent=None):
+        super().__init__("Экспорт учеников...", "Отмена", 0, max(total, 1), parent)
+        self.setWindowTitle("Экспорт в CSV")
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumDuration(300)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.worker = worker
+        self.worker.progress.connect(self.setValue)
+        self.canceled.connect(self.worker.cancel)
+        self.worker.finished.connect(self.close)
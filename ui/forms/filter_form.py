@@ -3,6 +3,8 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                              QPushButton, QDateEdit, QSpinBox)
 from PyQt5.QtCore import Qt, QDate
 
+from utils.dates import QT_DISPLAY_FORMAT, to_storage
+
 
 class StudentFilterForm(QDialog):
     def __init__(self, parent=None, department_manager=None, group_manager=None, coach_manager=None):
@@ -29,46 +31,51 @@ class StudentFilterForm(QDialog):
 
         # Год рождения
         self.birth_year = QSpinBox()
-        self.birth_year.setMinimum(1990)
+        self.birth_year.setMinimum(1989)
         self.birth_year.setMaximum(2020)
-        self.birth_year.setSpecialValueText(" ")  # Пустое значение
-        self.birth_year.setValue(
-            self.birth_year.minimum() - 1)  # Устанавливаем значение меньше минимума для "пустого" значения
+        self.birth_year.setSpecialValueText(" ")  # Минимум означает пустое значение
+        self.birth_year.setValue(self.birth_year.minimum())
         form_layout.addRow("Год рождения:", self.birth_year)
 
+        # Возраст (от и до включительно)
+        self.age_from = QSpinBox()
+        self.age_to = QSpinBox()
+        age_layout = QHBoxLayout()
+        for spin in (self.age_from, self.age_to):
+            spin.setRange(0, 100)
+            spin.setSpecialValueText(" ")  # 0 — пустое значение
+            age_layout.addWidget(spin)
+        form_layout.addRow("Возраст от/до:", age_layout)
+
         # Отделение
         self.department_combo = QComboBox()
         self.department_combo.addItem("Все отделения", None)
         if self.department_manager:
-            departments = self.department_manager.get_all_departments()
-            for department in departments:
-                self.department_combo.addItem(department['name'], department['id'])
+            for department in self.department_manager.get_all():
+                self.department_combo.addItem(department.name, department.id)
         form_layout.addRow("Отделение:", self.department_combo)
 
         # Группа
         self.group_combo = QComboBox()
         self.group_combo.addItem("Все группы", None)
         if self.group_manager:
-            groups = self.group_manager.get_all_groups()
-            for group in groups:
-                self.group_combo.addItem(group['name'], group['id'])
+            for group in self.group_manager.get_all():
+                self.group_combo.addItem(group.name, group.id)
         form_layout.addRow("Группа:", self.group_combo)
 
         # Тренер
         self.coach_combo = QComboBox()
         self.coach_combo.addItem("Все тренеры", None)
         if self.coach_manager:
-            coaches = self.coach_manager.get_all_coaches()
-            for coach in coaches:
-                coach_name = f"{coach['last_name']} {coach['first_name']}"
-                self.coach_combo.addItem(coach_name, coach['id'])
+            for coach in self.coach_manager.get_all():
+                self.coach_combo.addItem(coach.full_name, coach.id)
         form_layout.addRow("Тренер:", self.coach_combo)
 
         # Дата медосмотра (от)
         self.medical_date_from = QDateEdit()
         self.medical_date_from.setCalendarPopup(True)
         self.medical_date_from.setDate(QDate.currentDate().addYears(-1))
-        self.medical_date_from.setDisplayFormat("dd.MM.yyyy")
+        self.medical_date_from.setDisplayFormat(QT_DISPLAY_FORMAT)
         self.medical_date_checkbox_from = QCheckBox("Учитывать")
         self.medical_date_checkbox_from.setChecked(False)
 
@@ -82,7 +89,7 @@ class StudentFilterForm(QDialog):
         self.medical_date_to = QDateEdit()
         self.medical_date_to.setCalendarPopup(True)
         self.medical_date_to.setDate(QDate.currentDate())
-        self.medical_date_to.setDisplayFormat("dd.MM.yyyy")
+        self.medical_date_to.setDisplayFormat(QT_DISPLAY_FORMAT)
         self.medical_date_checkbox_to = QCheckBox("Учитывать")
         self.medical_date_checkbox_to.setChecked(False)
 
@@ -125,7 +132,9 @@ class StudentFilterForm(QDialog):
 
     def reset_filters(self):
         self.search_text.setText("")
-        self.birth_year.setValue(self.birth_year.minimum() - 1)
+        self.birth_year.setValue(self.birth_year.minimum())
+        self.age_from.setValue(0)
+        self.age_to.setValue(0)
         self.department_combo.setCurrentIndex(0)
         self.group_combo.setCurrentIndex(0)
         self.coach_combo.setCurrentIndex(0)
@@ -142,9 +151,15 @@ class StudentFilterForm(QDialog):
             filters['search_text'] = self.search_text.text()
 
         # Год рождения
-        if self.birth_year.value() >= self.birth_year.minimum():
+        if self.birth_year.value() > self.birth_year.minimum():
             filters['birth_year'] = self.birth_year.value()
 
+        # Возраст
+        if self.age_from.value():
+            filters['age_from'] = self.age_from.value()
+        if self.age_to.value():
+            filters['age_to'] = self.age_to.value()
+
         # Отделение
         if self.department_combo.currentData():
             filters['department_id'] = self.department_combo.currentData()
@@ -159,11 +174,11 @@ class StudentFilterForm(QDialog):
 
         # Дата медосмотра (от)
         if self.medical_date_checkbox_from.isChecked():
-            filters['medical_date_from'] = self.medical_date_from.date().toString("yyyy-MM-dd")
+            filters['medical_date_from'] = to_storage(self.medical_date_from.date().toPyDate())
 
         # Дата медосмотра (до)
         if self.medical_date_checkbox_to.isChecked():
-            filters['medical_date_to'] = self.medical_date_to.date().toString("yyyy-MM-dd")
+            filters['medical_date_to'] = to_storage(self.medical_date_to.date().toPyDate())
 
         # Допуск к тренировкам
         if self.training_allowed_combo.currentData() is not None:
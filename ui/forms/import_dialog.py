@@ -0,0 +1,64 @@
+# ui/forms/import_dialog.py
+import sqlite3
+
+from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtWidgets import QProgressDialog
+
+from database.db_manager import DatabaseManager
+from database.repositories import StudentRepository
+from utils.importer import import_students
+from utils.logger import get_logger, timed
+
+log = get_logger(__name__)
+
+
+class StudentImportWorker(QThread):
+    """Импорт учеников в отдельном потоке с собственным соединением для записи"""
+    progress = pyqtSignal(int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_name, filename, user_id=None, parent=None):
+        super().__init__(parent)
+        self.db_name = db_name
+        self.filename = filename
+        self.user_id = user_id
+        self._cancel_requested = False
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def run(self):
+        # Писать можно только через соединение потока, открывшего базу, поэтому
+        # поток открывает базу сам; главное окно узнаёт об изменениях по completed
+        db = None
+        try:
+            db = DatabaseManager(self.db_name)
+            db.set_journal_user(self.user_id)
+            with timed("import_students"):
+                result = import_students(StudentRepository(db), self.filename, progress=self.progress.emit,
+                                         is_cancelled=lambda: self._cancel_requested)
+        except (OSError, ImportError, ValueError, sqlite3.Error) as e:
+            log.warning("Не удалось импортировать учеников", exc_info=True)
+            self.failed.emit(str(e))
+            return
+        finally:
+            if db is not None:
+                db.close()
+        self.completed.emit(result)
+
+
+class ImportProgressDialog(QProgressDialog):
+    """Окно прогресса импорта с кнопкой отмены; число строк в файле заранее неизвестно"""
+
+    def __init__(self, worker, parent=None):
+        super().__init__("Импорт учеников...", "Отмена", 0, 0, parent)
+        self.setWindowTitle("Импорт учеников")
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumDuration(300)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.worker = worker
+        self.worker.progress.connect(lambda processed: self.setLabelText(f"Обработано строк: {processed}"))
+        self.canceled.connect(self.worker.cancel)
+        self.worker.finished.connect(self.close)
@@ -0,0 +1,78 @@
+# ui/forms/login_form.py
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit,
+                             QPushButton, QMessageBox)
+
+from models.user import User
+
+
+class LoginForm(QDialog):
+    """Вход в программу перед открытием главного окна.
+
+    Если пользователей ещё нет (первый запуск), форма создаёт администратора
+    с введёнными логином и паролем. После принятия формы сеанс — в self.session.
+    """
+
+    MIN_PASSWORD_LENGTH = 8
+
+    def __init__(self, users, parent=None):
+        super().__init__(parent)
+        self.users = users
+        self.session = None
+        self.first_run = not users.has_users()
+
+        self.setWindowTitle("Создание администратора" if self.first_run else "Вход")
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+        if self.first_run:
+            main_layout.addWidget(QLabel("Пользователей пока нет. Задайте логин и пароль администратора."))
+
+        form_layout = QFormLayout()
+        self.login_input = QLineEdit()
+        form_layout.addRow("Логин:", self.login_input)
+        self.password_input = QLineEdit()
+        self.password_input.setEchoMode(QLineEdit.Password)
+        form_layout.addRow("Пароль:", self.password_input)
+        self.repeat_input = QLineEdit()
+        self.repeat_input.setEchoMode(QLineEdit.Password)
+        if self.first_run:
+            form_layout.addRow("Повтор пароля:", self.repeat_input)
+        main_layout.addLayout(form_layout)
+
+        buttons_layout = QHBoxLayout()
+        login_button = QPushButton("Создать" if self.first_run else "Войти")
+        login_button.setDefault(True)
+        login_button.clicked.connect(self.try_login)
+        buttons_layout.addWidget(login_button)
+        cancel_button = QPushButton("Отмена")
+        cancel_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(cancel_button)
+        main_layout.addLayout(buttons_layout)
+
+        self.setLayout(main_layout)
+
+    def try_login(self):
+        login = self.login_input.text().strip()
+        password = self.password_input.text()
+        if not login or not password:
+            QMessageBox.warning(self, "Ошибка", "Введите логин и пароль")
+            return
+        if self.first_run and not self.create_admin(login, password):
+            return
+        self.session = self.users.authenticate(login, password)
+        if self.session is None:
+            self.password_input.clear()
+            QMessageBox.warning(self, "Ошибка", "Неверный логин или пароль")
+            return
+        self.accept()
+
+    def create_admin(self, login, password):
+        if len(password) < self.MIN_PASSWORD_LENGTH:
+            QMessageBox.warning(self, "Ошибка", f"Пароль должен быть не короче {self.MIN_PASSWORD_LENGTH} символов")
+            return False
+        if password != self.repeat_input.text():
+            QMessageBox.warning(self, "Ошибка", "Пароли не совпадают")
+            return False
+        self.users.add(User(login=login, role_id=self.users.role_id("admin")), password)
+        return True
@@ -1,65 +1,149 @@
 # ui/forms/main_window.py
-from PyQt5.QtWidgets import QMainWindow, QTableWidget, QTableWidgetItem, QPushButton, QVBoxLayout, QWidget, QMessageBox, QComboBox, QHBoxLayout, QLabel
-from PyQt5.QtCore import Qt
-from datetime import datetime
-from database.db_manager import DatabaseManager
-from utils.export import export_to_csv
+import sqlite3
+
+from PyQt5.QtWidgets import QMainWindow, QTableView, QAbstractItemView, QPushButton, QVBoxLayout, QWidget, QMessageBox, QComboBox, QHBoxLayout, QLabel, QLineEdit, QFileDialog, QMenu, QInputDialog
+from PyQt5.QtCore import Qt, QTimer
+from database.analytics import StudentAnalytics
+from database.facets import FacetCache
+from database.worklist import MedicalWorklist
+from database.repositories import StudentRepository, DepartmentRepository, GroupRepository, CoachRepository, UserRepository
+from models.user import PERMISSIONS
+from ui.forms.export_dialog import CsvExportWorker, ExportProgressDialog
+from ui.forms.import_dialog import StudentImportWorker, ImportProgressDialog
 from ui.forms.add_student_dialog import AddStudentDialog, EditStudentDialog
+from ui.forms.filter_form import StudentFilterForm
+from ui.forms.medical_form import MedicalExamsForm
+from ui.forms.schedule_form import ScheduleForm
+from ui.forms.competition_form import CompetitionForm
+from ui.forms.attendance_form import AttendanceForm
+from ui.forms.analytics_form import AnalyticsForm
+from ui.forms.users_form import UsersForm
+from ui.widgets.students_table import StudentsTableModel, MedicalClearanceDelegate, MEDICAL_COLUMN
+from ui.widgets.query_scheduler import StudentQueryScheduler
+from utils.config import auth_settings, medical_settings
+from utils.logger import get_logger, timed
+
+log = get_logger(__name__)
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, db, session):
+        """Главное окно вошедшего пользователя
+
+        Args:
+            db (DatabaseManager): Открытая база
+            session (Session): Сеанс из LoginForm: права и область видимости учеников
+        """
         super().__init__()
-        self.setWindowTitle("Sport School App")
+        self.setWindowTitle(f"Sport School App — {session.user.login} ({session.role_title})")
         self.setGeometry(100, 100, 800, 600)
-        self.db = DatabaseManager()
-        self.sort_column = None  # Текущая колонка для сортировки
-        self.sort_order = Qt.AscendingOrder  # Текущий порядок сортировки
+        self.db = db
+        self.session = session
+        # Изменения, сделанные в этом окне, журнал записывает на вошедшего пользователя
+        self.db.set_journal_user(session.user.id)
+        self.students = StudentRepository(self.db)
+        # Значения и счётчики для списков фильтров, обновляются при каждом изменении
+        self.facets = FacetCache(self.db, scope=session.scope_filters())
+        # Очередь истекающих медосмотров для панели уведомлений
+        self.worklist = MedicalWorklist(self.db, medical_settings()["due_days"])
+        # Сводка для окна статистики; кэш живёт, пока не изменятся ученики
+        self.analytics = StudentAnalytics(self.db)
+        # Фильтры из формы расширенного поиска, уже в формате query_students
+        self.advanced_filters = {}
         self.init_ui()
 
     def init_ui(self):
         layout = QVBoxLayout()
 
+        # Поиск по имени (полнотекстовый индекс, ищет по началу слов)
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Фамилия, имя или отчество")
+        self.search_input.textChanged.connect(self.apply_filters)
+        search_layout.addWidget(QLabel("Поиск:"))
+        search_layout.addWidget(self.search_input)
+        layout.addLayout(search_layout)
+
         # Фильтры
         filter_layout = QHBoxLayout()
         self.department_filter = QComboBox()
-        self.department_filter.addItems(["Все"])
-        self.department_filter.currentTextChanged.connect(self.apply_filters)
+        self.department_filter.currentIndexChanged.connect(self.apply_filters)
         filter_layout.addWidget(QLabel("Отделение:"))
         filter_layout.addWidget(self.department_filter)
 
         self.school_filter = QComboBox()
-        self.school_filter.addItems(["Все"])
-        self.school_filter.currentTextChanged.connect(self.apply_filters)
+        self.school_filter.currentIndexChanged.connect(self.apply_filters)
         filter_layout.addWidget(QLabel("Школа:"))
         filter_layout.addWidget(self.school_filter)
 
         self.rank_filter = QComboBox()
-        self.rank_filter.addItems(["Все"])
-        self.rank_filter.currentTextChanged.connect(self.apply_filters)
+        self.rank_filter.currentIndexChanged.connect(self.apply_filters)
         filter_layout.addWidget(QLabel("Разряд:"))
         filter_layout.addWidget(self.rank_filter)
 
         self.medical_filter = QComboBox()
-        self.medical_filter.addItems(["Все", "Да", "Нет"])
-        self.medical_filter.currentTextChanged.connect(self.apply_filters)
+        # Данные элемента — (ключ фильтра, значение): ручная отметка или последний медосмотр
+        for text, data in (("Все", None), ("Да", ("medical_clearance", 1)), ("Нет", ("medical_clearance", 0)),
+                           ("Допуск действует", ("medical_status", "cleared")),
+                           ("Допуск просрочен", ("medical_status", "expired")),
+                           ("Допуск скоро истекает", ("medical_due", None)),
+                           ("Нет медосмотров", ("medical_status", "none"))):
+            self.medical_filter.addItem(text, data)
+        self.medical_filter.currentIndexChanged.connect(self.apply_filters)
         filter_layout.addWidget(QLabel("Медосмотр:"))
         filter_layout.addWidget(self.medical_filter)
 
+        self.advanced_filter_button = QPushButton("Расширенный фильтр...")
+        self.advanced_filter_button.clicked.connect(self.show_advanced_filter)
+        filter_layout.addWidget(self.advanced_filter_button)
+
         reset_filters_button = QPushButton("Сбросить фильтры")
         reset_filters_button.clicked.connect(self.reset_filters)
         filter_layout.addWidget(reset_filters_button)
 
         layout.addLayout(filter_layout)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(13)
-        self.table.setHorizontalHeaderLabels([
-            "Имя", "Возраст", "Дата рождения", "Отделение", "Группа", "Тренер",
-            "Школа", "Разряд", "Дата разряда", "СНИЛС", "Паспорт", "Дата зачисления", "Прошёл медосмотр"
-        ])
-        # Включаем сортировку через заголовки
-        self.table.setSortingEnabled(False)  # Отключаем встроенную сортировку
-        self.table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
+        # Панель уведомлений о медосмотрах; скрыта, если просроченных и истекающих нет
+        self.medical_panel = QWidget()
+        panel_layout = QHBoxLayout(self.medical_panel)
+        panel_layout.setContentsMargins(0, 0, 0, 0)
+        self.medical_panel_label = QLabel()
+        panel_layout.addWidget(self.medical_panel_label, 1)
+        overdue_button = QPushButton("Показать просроченные")
+        overdue_button.clicked.connect(lambda: self.show_medical_worklist("expired"))
+        panel_layout.addWidget(overdue_button)
+        due_button = QPushButton("Показать истекающие")
+        due_button.clicked.connect(lambda: self.show_medical_worklist("medical_due"))
+        panel_layout.addWidget(due_button)
+        layout.addWidget(self.medical_panel)
+        # Счётчики пересчитываются один раз после серии изменений (два чтения диапазона индекса)
+        self.medical_panel_timer = QTimer(self)
+        self.medical_panel_timer.setSingleShot(True)
+        self.medical_panel_timer.setInterval(0)
+        self.medical_panel_timer.timeout.connect(self.update_medical_panel)
+        self.db.add_listener(self.on_students_changed)
+        # Статистика пересчитывается заранее, когда серия изменений (например, импорт)
+        # затихла, чтобы окно статистики открывалось без ожидания
+        self.analytics_timer = QTimer(self)
+        self.analytics_timer.setSingleShot(True)
+        self.analytics_timer.setInterval(1000)
+        self.analytics_timer.timeout.connect(self.analytics.summary)
+
+        # Модель подгружает строки порциями, сортировка выполняется в SQL. Запросы идут
+        # в отдельном потоке: быстрые смены фильтров сливаются в один запрос
+        self.scheduler = StudentQueryScheduler(self.db.connections, parent=self)
+        self.scheduler.failed.connect(
+            lambda error: QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить учеников: {error}"))
+        self.model = StudentsTableModel(self.students, parent=self, scheduler=self.scheduler)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(MEDICAL_COLUMN, MedicalClearanceDelegate(self.table))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # Несколько строк выделяются для групповых действий (Ctrl/Shift)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self.show_table_menu)
         layout.addWidget(self.table)
 
         # Кнопки для добавления, редактирования и удаления
@@ -72,196 +156,404 @@ class MainWindow(QMainWindow):
         edit_button.clicked.connect(self.edit_student)
         button_layout.addWidget(edit_button)
 
-        delete_button = QPushButton("Удалить ученика")
+        delete_button = QPushButton("Удалить выбранных")
         delete_button.clicked.connect(self.delete_student)
         button_layout.addWidget(delete_button)
+
+        bulk_button = QPushButton("Действия с выбранными")
+        bulk_menu = QMenu(bulk_button)
+        reassign_actions = [
+            bulk_menu.addAction("Перевести в отделение...", lambda: self.reassign_selected("department", "Отделение")),
+            bulk_menu.addAction("Перевести в группу...", lambda: self.reassign_selected("group_name", "Группа")),
+            bulk_menu.addAction("Сменить тренера...", lambda: self.reassign_selected("coach", "Тренер")),
+        ]
+        bulk_menu.addSeparator()
+        clearance_actions = [
+            bulk_menu.addAction("Отметить медосмотр пройденным", lambda: self.set_selected_clearance(True)),
+            bulk_menu.addAction("Снять отметку о медосмотре", lambda: self.set_selected_clearance(False)),
+        ]
+        bulk_button.setMenu(bulk_menu)
+        button_layout.addWidget(bulk_button)
         layout.addLayout(button_layout)
 
+        file_layout = QHBoxLayout()
+        import_button = QPushButton("Импорт из CSV/XLSX")
+        import_button.clicked.connect(self.import_students)
+        file_layout.addWidget(import_button)
+
         export_button = QPushButton("Экспорт в CSV")
         export_button.clicked.connect(self.export_to_csv)
-        layout.addWidget(export_button)
+        file_layout.addWidget(export_button)
+
+        schedule_button = QPushButton("Расписание")
+        schedule_button.clicked.connect(self.show_schedule)
+        file_layout.addWidget(schedule_button)
+
+        competitions_button = QPushButton("Соревнования")
+        competitions_button.clicked.connect(self.show_competitions)
+        file_layout.addWidget(competitions_button)
+
+        attendance_button = QPushButton("Посещаемость")
+        attendance_button.clicked.connect(self.show_attendance)
+        file_layout.addWidget(attendance_button)
+
+        analytics_button = QPushButton("Статистика")
+        analytics_button.clicked.connect(self.show_analytics)
+        file_layout.addWidget(analytics_button)
+        layout.addLayout(file_layout)
+
+        if self.session.can("users.manage"):
+            users_button = QPushButton("Пользователи")
+            users_button.clicked.connect(self.show_users)
+            file_layout.addWidget(users_button)
+
+        # Недоступные действия выключены; права уже в сеансе, база не опрашивается
+        for widget, permission in ((add_button, "students.edit"), (edit_button, "students.edit"),
+                                   (delete_button, "students.delete"), (import_button, "students.import"),
+                                   (export_button, "students.export"), (schedule_button, "schedule.edit"),
+                                   (competitions_button, "competitions.edit"),
+                                   (attendance_button, "attendance.edit"), (analytics_button, "analytics.view")):
+            widget.setEnabled(self.session.can(permission))
+        for action in reassign_actions:
+            action.setEnabled(self.session.can("students.edit"))
+        for action in clearance_actions:
+            action.setEnabled(self.session.can("medical.edit"))
+        bulk_button.setEnabled(self.session.can("students.edit") or self.session.can("medical.edit"))
 
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        # Колонки, по которым строятся выпадающие списки фильтров (см. FACET_COLUMNS)
+        self.filter_combos = {
+            "department": self.department_filter,
+            "school": self.school_filter,
+            "rank": self.rank_filter,
+        }
+        self.facets.add_listener(self.on_facet_changed)
+
         # Заполняем фильтры динамически
         self.update_filters()
+        self.update_medical_panel()
         self.load_students()
 
+    def closeEvent(self, event):
+        self.medical_panel_timer.stop()
+        self.analytics_timer.stop()
+        self.db.remove_listener(self.on_students_changed)
+        self.scheduler.close()
+        self.db.close()
+        super().closeEvent(event)
+
+    @timed("update_filters")
     def update_filters(self):
-        # Получаем уникальные значения для фильтров
-        self.db.cursor.execute("SELECT DISTINCT department FROM students WHERE department IS NOT NULL")
-        departments = [row[0] for row in self.db.cursor.fetchall()]
-        self.department_filter.clear()
-        self.department_filter.addItems(["Все"] + sorted(departments))
-
-        self.db.cursor.execute("SELECT DISTINCT school FROM students WHERE school IS NOT NULL")
-        schools = [row[0] for row in self.db.cursor.fetchall()]
-        self.school_filter.clear()
-        self.school_filter.addItems(["Все"] + sorted(schools))
-
-        self.db.cursor.execute("SELECT DISTINCT rank FROM students WHERE rank IS NOT NULL")
-        ranks = [row[0] for row in self.db.cursor.fetchall()]
-        self.rank_filter.clear()
-        self.rank_filter.addItems(["Все"] + sorted(ranks))
-
-    def on_header_clicked(self, column):
-        column_to_field = {
-            0: "name",
-            1: "age",
-            2: "birth_date",
-            3: "department",
-            4: "group_name",
-            5: "coach",
-            6: "school",
-            7: "rank",
-            8: "rank_date",
-            9: "snils",
-            10: "passport",
-            11: "enrollment_date",
-            12: "medical_clearance"
-        }
-        field = column_to_field.get(column)
-
-        if field:
-            # Сбрасываем текст заголовков
-            for i in range(self.table.columnCount()):
-                self.table.horizontalHeaderItem(i).setText(
-                    self.table.horizontalHeaderItem(i).text().replace(" ↑", "").replace(" ↓", ""))
-            # Если кликнули на ту же колонку, меняем порядок сортировки
-            if self.sort_column == column:
-                self.sort_order = Qt.DescendingOrder if self.sort_order == Qt.AscendingOrder else Qt.AscendingOrder
-            else:
-                self.sort_order = Qt.AscendingOrder
-            self.sort_column = column
-            # Добавляем стрелку к текущему заголовку
-            header_text = self.table.horizontalHeaderItem(column).text()
-            self.table.horizontalHeaderItem(column).setText(
-                header_text + (" ↑" if self.sort_order == Qt.AscendingOrder else " ↓"))
-            self.load_students(sort_by=field)
-
-    def load_students(self, sort_by=None):
-        self.table.setRowCount(0)
-        query = "SELECT * FROM students"
-        conditions = []
-        params = []
-
-        # Применение фильтров
-        department = self.department_filter.currentText()
-        if department != "Все":
-            conditions.append("department = ?")
-            params.append(department)
-
-        school = self.school_filter.currentText()
-        if school != "Все":
-            conditions.append("school = ?")
-            params.append(school)
-
-        rank = self.rank_filter.currentText()
-        if rank != "Все":
-            conditions.append("rank = ?")
-            params.append(rank)
-
-        medical = self.medical_filter.currentText()
-        if medical != "Все":
-            conditions.append("medical_clearance = ?")
-            params.append(1 if medical == "Да" else 0)
-
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
-
-        # Применение сортировки
-        if sort_by:
-            order = "ASC" if self.sort_order == Qt.AscendingOrder else "DESC"
-            query += f" ORDER BY {sort_by} {order}"
-
-        self.db.cursor.execute(query, params)
-        students = self.db.cursor.fetchall()
-
-        for row, student in enumerate(students):
-            self.table.insertRow(row)
-            # Пропускаем первую колонку (ID), начинаем с 1
-            for col, data in enumerate(student[1:], start=0):
-                if col == 1 and student[3]:  # Возраст (col 1 в таблице, student[3] — дата рождения)
-                    try:
-                        birth_date = datetime.strptime(student[3], '%d/%m/%Y')
-                        today = datetime.now()
-                        age = today.year - birth_date.year
-                        if today.month < birth_date.month or (today.month == birth_date.month and today.day < birth_date.day):
-                            age -= 1
-                        data = str(age)
-                    except ValueError:
-                        data = ""
-                elif col == 12:  # Медосмотр (последняя колонка в таблице)
-                    data = "Да" if data else "Нет"
-                self.table.setItem(row, col, QTableWidgetItem(str(data) if data is not None else ""))
-            # Сохраняем ID в данных строки для использования в edit/delete
-            self.table.setProperty(f"student_id_{row}", student[0])
+        """Перезаполняет списки фильтров из кэша, сохраняя выбранные; возвращает True, если выбор сбросился"""
+        reset = False
+        for column, combo in self.filter_combos.items():
+            current = combo.currentData()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem("Все", None)
+            for value, count in self.facets.values(column):
+                combo.addItem(self.facet_label(value, count), value)
+            position = combo.findData(current) if current is not None else 0
+            if position < 0:
+                position = 0
+                reset = True
+            combo.setCurrentIndex(position)
+            combo.blockSignals(False)
+        return reset
+
+    @staticmethod
+    def facet_label(value, count):
+        return f"{value} ({count})"
+
+    def on_facet_changed(self, column, value, count):
+        """Меняет одну строку списка фильтра вместо перезаполнения всех списков"""
+        if column is None:
+            if self.update_filters():
+                self.load_students()
+            return
+        combo = self.filter_combos.get(column)
+        if combo is None:
+            return
+        position = combo.findData(value)
+        if count == 0:
+            self.remove_filter_value(combo, position)
+            return
+        combo.blockSignals(True)
+        if position >= 0:
+            combo.setItemText(position, self.facet_label(value, count))
+        else:
+            # Первый элемент — «Все», остальные отсортированы по значению
+            position = 1
+            while position < combo.count() and combo.itemData(position) < value:
+                position += 1
+            combo.insertItem(position, self.facet_label(value, count), value)
+        combo.blockSignals(False)
+
+    def remove_filter_value(self, combo, position):
+        if position <= 0:
+            return
+        was_selected = combo.currentIndex() == position
+        combo.blockSignals(True)
+        combo.removeItem(position)
+        if was_selected:
+            combo.setCurrentIndex(0)
+        combo.blockSignals(False)
+        if was_selected:
+            self.load_students()
+
+    def current_filters(self):
+        """Фильтры главного окна в формате DatabaseManager.query_students"""
+        filters = dict(self.advanced_filters)
+        search_text = self.search_input.text().strip()
+        if search_text:
+            filters["search_text"] = search_text
+
+        # В списках показано «значение (число)», само значение — в данных элемента
+        for column, combo in self.filter_combos.items():
+            value = combo.currentData()
+            if value is not None:
+                filters[column] = value
+
+        medical = self.medical_filter.currentData()
+        if medical is not None:
+            column, value = medical
+            # Диапазон «скоро истекает» отсчитывается от сегодняшнего дня на момент запроса
+            filters[column] = self.worklist.due_range() if column == "medical_due" else value
+        # Область видимости пользователя попадает в WHERE каждого запроса и экспорта
+        filters.update(self.session.scope_filters())
+        return filters
+
+    @timed("load_students")
+    def load_students(self):
+        self.model.set_filters(self.current_filters())
+
+    def on_students_changed(self, action, student_id, row, old_row):
+        self.medical_panel_timer.start()
+        self.analytics_timer.start()
+
+    def update_medical_panel(self):
+        overdue, due_soon = self.worklist.counts()
+        self.medical_panel.setVisible(bool(overdue or due_soon))
+        self.medical_panel_label.setText(
+            f"Медосмотр просрочен: {overdue}. Истекает в ближайшие {self.worklist.due_days} дн.: {due_soon}")
+
+    def show_medical_worklist(self, kind):
+        """Выбирает в списке «Медосмотр» просроченные ("expired") или истекающие ("medical_due")"""
+        for index in range(self.medical_filter.count()):
+            data = self.medical_filter.itemData(index)
+            if data is not None and kind in data:
+                self.medical_filter.setCurrentIndex(index)
+                return
 
     def apply_filters(self):
         self.load_students()
 
+    def show_advanced_filter(self):
+        form = StudentFilterForm(self, DepartmentRepository(self.db), GroupRepository(self.db),
+                                 CoachRepository(self.db))
+        if not form.exec_():
+            return
+        self.set_advanced_filters(self.students.query_filters(form.get_filters()))
+        self.load_students()
+
+    def show_schedule(self):
+        ScheduleForm(self.db, self).exec_()
+
+    def show_competitions(self):
+        CompetitionForm(self.db, self).exec_()
+
+    def show_attendance(self):
+        AttendanceForm(self.db, self).exec_()
+
+    def show_analytics(self):
+        AnalyticsForm(self.analytics, self).exec_()
+
+    def show_users(self):
+        if not self.require("users.manage"):
+            return
+        users = UserRepository(self.db, auth_settings()["iterations"])
+        UsersForm(users, self.db, self.session, self).exec_()
+
+    def set_advanced_filters(self, filters):
+        self.advanced_filters = filters
+        suffix = f" ({len(filters)})" if filters else ""
+        self.advanced_filter_button.setText("Расширенный фильтр..." + suffix)
+
     def reset_filters(self):
-        self.department_filter.setCurrentText("Все")
-        self.school_filter.setCurrentText("Все")
-        self.rank_filter.setCurrentText("Все")
+        self.set_advanced_filters({})
+        self.search_input.clear()
+        for combo in self.filter_combos.values():
+            combo.blockSignals(True)
+            combo.setCurrentIndex(0)
+            combo.blockSignals(False)
         self.medical_filter.setCurrentText("Все")
         self.load_students()
 
+    def require(self, permission):
+        """Проверяет право по сеансу; без права предупреждает пользователя"""
+        if self.session.can(permission):
+            return True
+        QMessageBox.warning(self, "Нет доступа", f"Недостаточно прав: {PERMISSIONS[permission].lower()}")
+        return False
+
     def add_student(self):
+        if not self.require("students.edit"):
+            return
         dialog = AddStudentDialog()
         while True:
             if not dialog.exec_():
                 break
             try:
-                data = dialog.get_data()
-                self.db.add_student(data)
-                self.update_filters()
-                self.load_students()
+                with timed("save_student"):
+                    self.students.add(dialog.get_data())
                 break
             except ValueError as e:
                 QMessageBox.warning(self, "Ошибка", str(e))
 
     def edit_student(self):
-        selected = self.table.currentRow()
+        if not self.require("students.edit"):
+            return
+        selected = self.table.currentIndex().row()
         if selected >= 0:
-            student_id = self.table.property(f"student_id_{selected}")
+            student_id = self.model.student_id(selected)
             if student_id is None:
                 QMessageBox.warning(self, "Ошибка", "Не удалось определить ID ученика")
                 return
             student_id = int(student_id)
-            student_data = self.db.get_all_students()[selected]
-            dialog = EditStudentDialog(student_data)
+            student = self.students.get(student_id)
+            if student is None:
+                QMessageBox.warning(self, "Ошибка", "Ученик не найден")
+                return
+            dialog = EditStudentDialog(student)
             while True:
                 if not dialog.exec_():
                     break
                 try:
-                    data = dialog.get_data()
-                    self.db.update_student(student_id, data[1:])
-                    self.update_filters()
-                    self.load_students()
+                    with timed("save_student", student_id=student_id):
+                        self.students.update(dialog.get_data())
                     break
                 except ValueError as e:
                     QMessageBox.warning(self, "Ошибка", str(e))
         else:
             QMessageBox.warning(self, "Ошибка", "Выберите ученика для редактирования")
 
+    def show_table_menu(self, position):
+        if self.table.indexAt(position).row() < 0:
+            return
+        menu = QMenu(self)
+        menu.addAction("Редактировать...", self.edit_student).setEnabled(self.session.can("students.edit"))
+        menu.addAction("Медосмотры...", self.show_medical_exams).setEnabled(self.session.can("medical.edit"))
+        menu.exec_(self.table.viewport().mapToGlobal(position))
+
+    def show_medical_exams(self):
+        if not self.require("medical.edit"):
+            return
+        student_id = self.model.student_id(self.table.currentIndex().row())
+        student = self.students.get(int(student_id)) if student_id is not None else None
+        if student is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите ученика")
+            return
+        # Осмотры пишутся через MedicalRepository: таблица и панель медосмотров
+        # обновляются по уведомлениям базы
+        MedicalExamsForm(self.db, student, self).exec_()
+
+    def selected_student_ids(self):
+        """ID учеников в выделенных строках таблицы в порядке строк"""
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [student_id for student_id in map(self.model.student_id, rows) if student_id is not None]
+
     def delete_student(self):
-        selected = self.table.currentRow()
-        if selected >= 0:
-            student_id = self.table.property(f"student_id_{selected}")
-            if student_id is None:
-                QMessageBox.warning(self, "Ошибка", "Не удалось определить ID ученика")
-                return
-            student_id = int(student_id)
-            self.db.delete_student(student_id)
-            self.update_filters()
-            self.load_students()
-        else:
+        if not self.require("students.delete"):
+            return
+        student_ids = self.selected_student_ids()
+        if not student_ids:
             QMessageBox.warning(self, "Ошибка", "Выберите ученика для удаления")
+            return
+        if len(student_ids) > 1 and QMessageBox.question(
+                self, "Удаление", f"Удалить выбранных учеников ({len(student_ids)})?") != QMessageBox.Yes:
+            return
+        try:
+            self.students.delete_many(student_ids)
+        except sqlite3.Error as e:
+            log.error("Не удалось удалить учеников", exc_info=True, extra={"count": len(student_ids)})
+            QMessageBox.warning(self, "Ошибка", f"Не удалось удалить: {e}")
+
+    def reassign_selected(self, column, title):
+        if not self.require("students.edit"):
+            return
+        student_ids = self.selected_student_ids()
+        if not student_ids:
+            QMessageBox.warning(self, "Ошибка", "Выберите учеников")
+            return
+        values = [str(value) for value in self.students.distinct_values(column)]
+        value, ok = QInputDialog.getItem(self, "Групповое изменение",
+                                         f"{title} для выбранных учеников ({len(student_ids)}):",
+                                         values, 0, True)
+        value = value.strip()
+        if not ok or not value:
+            return
+        try:
+            self.students.reassign(student_ids, **{column: value})
+        except sqlite3.Error as e:
+            log.error("Не удалось изменить учеников", exc_info=True, extra={"column": column})
+            QMessageBox.warning(self, "Ошибка", f"Не удалось изменить: {e}")
+
+    def set_selected_clearance(self, cleared):
+        if not self.require("medical.edit"):
+            return
+        student_ids = self.selected_student_ids()
+        if not student_ids:
+            QMessageBox.warning(self, "Ошибка", "Выберите учеников")
+            return
+        try:
+            self.students.set_medical_clearance(student_ids, cleared)
+        except sqlite3.Error as e:
+            log.error("Не удалось изменить медицинский допуск", exc_info=True)
+            QMessageBox.warning(self, "Ошибка", f"Не удалось изменить: {e}")
+
+    def import_students(self):
+        if not self.require("students.import"):
+            return
+        filename, _ = QFileDialog.getOpenFileName(self, "Импорт учеников", "",
+                                                  "Таблицы (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)")
+        if not filename:
+            return
+        worker = StudentImportWorker(self.db.db_name, filename, self.session.user.id, parent=self)
+        dialog = ImportProgressDialog(worker, self)
+        worker.completed.connect(self.on_import_completed)
+        worker.failed.connect(lambda error: QMessageBox.warning(self, "Ошибка", f"Не удалось импортировать: {error}"))
+        worker.finished.connect(worker.deleteLater)
+        worker.finished.connect(dialog.deleteLater)
+        worker.start()
+
+    def on_import_completed(self, result):
+        # Поток писал через своё соединение: подписчики этой базы перечитывают данные
+        self.db.notify_reset()
+        message = f"Добавлено: {result.inserted}\nОбновлено: {result.updated}"
+        if result.rejected:
+            message += f"\nОтклонено: {result.rejected} (см. {result.errors_filename})"
+        QMessageBox.information(self, "Импорт прерван" if result.cancelled else "Импорт завершён", message)
 
     def export_to_csv(self):
-        students = self.db.get_all_students()
-        export_to_csv(students)
-        QMessageBox.information(self, "Успех", "Данные экспортированы в students_export.csv")
\ No newline at end of file
+        if not self.require("students.export"):
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Экспорт в CSV", "students_export.csv",
+                                                  "CSV (*.csv)")
+        if not filename:
+            return
+        # Выгружается то, что сейчас показано в таблице: те же фильтры и сортировка
+        filters = self.current_filters()
+        total = self.students.count(filters)
+        worker = CsvExportWorker(self.db.connections, filename, filters, self.model.sort_by,
+                                 self.model.descending, parent=self)
+        dialog = ExportProgressDialog(worker, total, self)
+        worker.completed.connect(
+            lambda written: QMessageBox.information(self, "Успех", f"Экспортировано учеников: {written}\n{filename}"))
+        worker.failed.connect(lambda error: QMessageBox.warning(self, "Ошибка", f"Не удалось экспортировать: {error}"))
+        worker.finished.connect(worker.deleteLater)
+        worker.finished.connect(dialog.deleteLater)
+        worker.start()
+        dialog.show()
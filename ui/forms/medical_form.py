@@ -0,0 +1,176 @@
+# ui/forms/medical_form.py
+from datetime import date
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit,
+                             QCheckBox, QPushButton, QDateEdit, QTableWidget, QTableWidgetItem,
+                             QAbstractItemView, QMessageBox)
+from PyQt5.QtCore import Qt, QDate
+
+from database.repositories import MedicalRepository
+from models.medical import EXAM_VALID_MONTHS, MedicalExamination, default_next_date
+from utils.dates import QT_DISPLAY_FORMAT, format_display
+from utils.logger import timed
+
+HEADERS = ["Дата осмотра", "Результат", "Допуск", "Следующий осмотр", "Примечания"]
+
+
+class MedicalExamsForm(QDialog):
+    """История медосмотров ученика, внесение и исправление осмотров"""
+
+    def __init__(self, db, student, parent=None):
+        super().__init__(parent)
+        self.medical = MedicalRepository(db)
+        self.student = student
+        self.exams = []
+
+        self.setWindowTitle(f"Медосмотры: {student.full_name}")
+        self.resize(700, 500)
+
+        self.init_ui()
+        self.load_exams()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.itemSelectionChanged.connect(self.show_selected)
+        main_layout.addWidget(self.table)
+
+        form_layout = QFormLayout()
+        today = QDate.currentDate()
+        self.examination_date = QDateEdit(today)
+        self.examination_date.setCalendarPopup(True)
+        self.examination_date.setDisplayFormat(QT_DISPLAY_FORMAT)
+        self.examination_date.dateChanged.connect(self.update_next_date)
+        form_layout.addRow("Дата осмотра:", self.examination_date)
+
+        self.result_input = QLineEdit()
+        form_layout.addRow("Результат:", self.result_input)
+
+        self.clearance_checkbox = QCheckBox("Допущен к тренировкам")
+        self.clearance_checkbox.setChecked(True)
+        form_layout.addRow("", self.clearance_checkbox)
+
+        # Без отметки срок следующего осмотра — EXAM_VALID_MONTHS месяцев от даты осмотра
+        next_layout = QHBoxLayout()
+        self.next_date = QDateEdit()
+        self.next_date.setCalendarPopup(True)
+        self.next_date.setDisplayFormat(QT_DISPLAY_FORMAT)
+        self.next_date_checkbox = QCheckBox("Указать другой срок")
+        self.next_date_checkbox.toggled.connect(self.update_next_date)
+        next_layout.addWidget(self.next_date)
+        next_layout.addWidget(self.next_date_checkbox)
+        form_layout.addRow("Следующий осмотр:", next_layout)
+
+        self.notes_input = QLineEdit()
+        form_layout.addRow("Примечания:", self.notes_input)
+        main_layout.addLayout(form_layout)
+        main_layout.addWidget(QLabel(f"Если срок не указан, допуск действует {EXAM_VALID_MONTHS} месяцев"))
+
+        buttons_layout = QHBoxLayout()
+        add_button = QPushButton("Добавить осмотр")
+        add_button.clicked.connect(self.add_exam)
+        buttons_layout.addWidget(add_button)
+
+        update_button = QPushButton("Сохранить изменения")
+        update_button.clicked.connect(self.update_exam)
+        buttons_layout.addWidget(update_button)
+
+        delete_button = QPushButton("Удалить осмотр")
+        delete_button.clicked.connect(self.delete_exam)
+        buttons_layout.addWidget(delete_button)
+
+        close_button = QPushButton("Закрыть")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_button)
+        main_layout.addLayout(buttons_layout)
+
+        self.setLayout(main_layout)
+        self.update_next_date()
+
+    def load_exams(self):
+        """История осмотров ученика, от последнего к первому"""
+        self.exams = self.medical.for_student(self.student.id)
+        self.table.setRowCount(len(self.exams))
+        for row, exam in enumerate(self.exams):
+            values = [format_display(exam.examination_date), exam.result or "",
+                      "Да" if exam.clearance else "Нет", format_display(exam.next_examination_date),
+                      exam.notes or ""]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+    def update_next_date(self):
+        self.next_date.setEnabled(self.next_date_checkbox.isChecked())
+        if not self.next_date_checkbox.isChecked():
+            self.next_date.setDate(default_next_date(self.examination_date.date().toPyDate()))
+
+    def selected_exam(self):
+        row = self.table.currentRow()
+        return self.exams[row] if 0 <= row < len(self.exams) else None
+
+    def show_selected(self):
+        exam = self.selected_exam()
+        if exam is None:
+            return
+        self.examination_date.setDate(exam.examination_date)
+        self.result_input.setText(exam.result or "")
+        self.clearance_checkbox.setChecked(exam.clearance)
+        custom = (exam.next_examination_date is not None
+                  and exam.next_examination_date != default_next_date(exam.examination_date))
+        self.next_date_checkbox.setChecked(custom)
+        if custom:
+            self.next_date.setDate(exam.next_examination_date)
+        self.notes_input.setText(exam.notes or "")
+
+    def get_exam(self):
+        """Осмотр из полей формы; None, если даты заданы неверно"""
+        examination_date = self.examination_date.date().toPyDate()
+        next_date = self.next_date.date().toPyDate() if self.next_date_checkbox.isChecked() else None
+        if examination_date > date.today():
+            QMessageBox.warning(self, "Ошибка", "Дата осмотра не может быть в будущем")
+            return None
+        if next_date is not None and next_date <= examination_date:
+            QMessageBox.warning(self, "Ошибка", "Следующий осмотр должен быть позже текущего")
+            return None
+        return MedicalExamination(student_id=self.student.id, examination_date=examination_date,
+                                  result=self.result_input.text().strip(),
+                                  next_examination_date=next_date or default_next_date(examination_date),
+                                  notes=self.notes_input.text().strip(),
+                                  clearance=self.clearance_checkbox.isChecked())
+
+    def add_exam(self):
+        exam = self.get_exam()
+        if exam is None:
+            return
+        with timed("save_medical_exam", student_id=self.student.id):
+            self.medical.add(exam)
+        self.load_exams()
+
+    def update_exam(self):
+        selected = self.selected_exam()
+        if selected is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите осмотр")
+            return
+        exam = self.get_exam()
+        if exam is None:
+            return
+        exam.id = selected.id
+        with timed("save_medical_exam", student_id=self.student.id):
+            self.medical.update(exam)
+        self.load_exams()
+
+    def delete_exam(self):
+        exam = self.selected_exam()
+        if exam is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите осмотр")
+            return
+        reply = QMessageBox.question(self, "Подтверждение",
+                                     f"Удалить осмотр от {format_display(exam.examination_date)}?",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.medical.delete(exam.id)
+            self.load_exams()
@@ -0,0 +1,195 @@
+# ui/forms/schedule_form.py
+from datetime import timedelta
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QComboBox,
+                             QCheckBox, QPushButton, QDateEdit, QTimeEdit, QTableWidget,
+                             QTableWidgetItem, QAbstractItemView, QMessageBox)
+from PyQt5.QtCore import Qt, QDate, QTime
+
+from database.repositories import CoachRepository, DepartmentRepository, GroupRepository, ScheduleRepository
+from models.schedule import WEEKDAYS, ScheduleSession
+from utils.dates import QT_DISPLAY_FORMAT, format_display
+from utils.logger import timed
+from utils.schedule import describe_conflict, occurrences
+
+HEADERS = ["Дата", "День", "Время", "Группа", "Тренер", "Зал"]
+
+
+class ScheduleForm(QDialog):
+    """Расписание занятий на неделю и добавление еженедельных занятий"""
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.schedule = ScheduleRepository(db)
+        self.groups = GroupRepository(db)
+        self.coaches = CoachRepository(db)
+        self.departments = DepartmentRepository(db)
+
+        self.setWindowTitle("Расписание занятий")
+        self.resize(800, 600)
+
+        self.init_ui()
+        self.load_week()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+
+        # Неделя, занятия которой показаны в таблице
+        week_layout = QHBoxLayout()
+        self.week_start = QDateEdit()
+        self.week_start.setCalendarPopup(True)
+        self.week_start.setDisplayFormat(QT_DISPLAY_FORMAT)
+        today = QDate.currentDate()
+        self.week_start.setDate(today.addDays(1 - today.dayOfWeek()))
+        self.week_start.dateChanged.connect(self.load_week)
+        week_layout.addWidget(QLabel("Неделя с:"))
+        week_layout.addWidget(self.week_start)
+        week_layout.addStretch()
+        main_layout.addLayout(week_layout)
+
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        main_layout.addWidget(self.table)
+
+        # Новое еженедельное занятие
+        form_layout = QFormLayout()
+        departments = {department.id: department.name for department in self.departments.get_all()}
+        self.group_combo = QComboBox()
+        for group in self.groups.get_all():
+            department = departments.get(group.department_id)
+            self.group_combo.addItem(f"{group.name} ({department})" if department else group.name, group.id)
+        form_layout.addRow("Группа:", self.group_combo)
+
+        self.coach_combo = QComboBox()
+        self.coach_combo.addItem("Тренер группы", None)
+        for coach in self.coaches.get_all():
+            self.coach_combo.addItem(coach.full_name, coach.id)
+        form_layout.addRow("Тренер:", self.coach_combo)
+
+        self.hall_combo = QComboBox()
+        self.hall_combo.setEditable(True)
+        self.hall_combo.addItem("")
+        for _, name in self.schedule.halls():
+            self.hall_combo.addItem(name)
+        form_layout.addRow("Зал:", self.hall_combo)
+
+        self.weekday_combo = QComboBox()
+        self.weekday_combo.addItems(WEEKDAYS)
+        form_layout.addRow("День недели:", self.weekday_combo)
+
+        time_layout = QHBoxLayout()
+        self.start_time = QTimeEdit(QTime(17, 0))
+        self.end_time = QTimeEdit(QTime(18, 30))
+        for edit in (self.start_time, self.end_time):
+            edit.setDisplayFormat("HH:mm")
+            time_layout.addWidget(edit)
+        form_layout.addRow("Время:", time_layout)
+
+        self.valid_from = QDateEdit(today)
+        self.valid_from.setCalendarPopup(True)
+        self.valid_from.setDisplayFormat(QT_DISPLAY_FORMAT)
+        form_layout.addRow("Действует с:", self.valid_from)
+
+        valid_to_layout = QHBoxLayout()
+        self.valid_to = QDateEdit(today.addMonths(9))
+        self.valid_to.setCalendarPopup(True)
+        self.valid_to.setDisplayFormat(QT_DISPLAY_FORMAT)
+        self.valid_to_checkbox = QCheckBox("Учитывать")
+        self.valid_to_checkbox.setChecked(True)
+        valid_to_layout.addWidget(self.valid_to)
+        valid_to_layout.addWidget(self.valid_to_checkbox)
+        form_layout.addRow("Действует по:", valid_to_layout)
+        main_layout.addLayout(form_layout)
+
+        buttons_layout = QHBoxLayout()
+        add_button = QPushButton("Добавить занятие")
+        add_button.clicked.connect(self.add_session)
+        buttons_layout.addWidget(add_button)
+
+        delete_button = QPushButton("Удалить занятие")
+        delete_button.clicked.connect(self.delete_session)
+        buttons_layout.addWidget(delete_button)
+
+        check_button = QPushButton("Проверить расписание")
+        check_button.clicked.connect(self.check_conflicts)
+        buttons_layout.addWidget(check_button)
+
+        close_button = QPushButton("Закрыть")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(close_button)
+        main_layout.addLayout(buttons_layout)
+
+        self.setLayout(main_layout)
+
+    def load_week(self):
+        """Разворачивает еженедельные занятия в даты выбранной недели"""
+        start = self.week_start.date().toPyDate()
+        groups = {group.id: group.name for group in self.groups.get_all()}
+        coaches = {coach.id: coach.full_name for coach in self.coaches.get_all()}
+        halls = dict(self.schedule.halls())
+        week = list(occurrences(self.schedule.get_all(), start, start + timedelta(days=7)))
+        self.table.setRowCount(len(week))
+        for row, occurrence in enumerate(week):
+            session = occurrence.session
+            values = [format_display(occurrence.day), WEEKDAYS[session.weekday], session.time_range,
+                      groups.get(session.group_id, ""), coaches.get(session.coach_id, ""),
+                      halls.get(session.hall_id, "")]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, session.id)
+                self.table.setItem(row, column, item)
+
+    def add_session(self):
+        start = self.start_time.time()
+        end = self.end_time.time()
+        session = ScheduleSession(
+            group_id=self.group_combo.currentData(),
+            coach_id=self.coach_combo.currentData(),
+            weekday=self.weekday_combo.currentIndex(),
+            start_minute=start.hour() * 60 + start.minute(),
+            end_minute=end.hour() * 60 + end.minute(),
+            valid_from=self.valid_from.date().toPyDate(),
+            valid_to=self.valid_to.date().toPyDate() if self.valid_to_checkbox.isChecked() else None,
+        )
+        if session.group_id is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите группу")
+            return
+        if session.end_minute <= session.start_minute:
+            QMessageBox.warning(self, "Ошибка", "Занятие должно заканчиваться позже, чем начинается")
+            return
+        if session.valid_to is not None and session.valid_to < session.valid_from:
+            QMessageBox.warning(self, "Ошибка", "Период действия занятия пуст")
+            return
+        # Новый зал попадает в справочник только после проверки остальных полей
+        session.hall_id = self.schedule.hall_id(self.hall_combo.currentText())
+        try:
+            with timed("save_schedule_session"):
+                self.schedule.add(session)
+        except ValueError as e:
+            QMessageBox.warning(self, "Пересечение в расписании", str(e))
+            return
+        self.load_week()
+
+    def delete_session(self):
+        item = self.table.item(self.table.currentRow(), 0)
+        if item is None:
+            QMessageBox.warning(self, "Ошибка", "Выберите занятие")
+            return
+        reply = QMessageBox.question(self, "Подтверждение",
+                                     "Удалить еженедельное занятие из расписания на все недели?",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            self.schedule.delete(item.data(Qt.UserRole))
+            self.load_week()
+
+    def check_conflicts(self):
+        """Ищет пересечения во всём расписании одним проходом по занятиям"""
+        conflicts = self.schedule.conflicts()
+        if not conflicts:
+            QMessageBox.information(self, "Расписание", "Пересечений в расписании нет")
+            return
+        QMessageBox.warning(self, "Пересечения в расписании",
+                            "\n".join(describe_conflict(conflict) for conflict in conflicts))
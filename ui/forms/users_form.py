@@ -0,0 +1,142 @@
+# ui/forms/users_form.py
+import sqlite3
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox, QLineEdit,
+                             QPushButton, QTableWidget, QTableWidgetItem, QAbstractItemView, QMessageBox,
+                             QInputDialog, QGroupBox)
+from PyQt5.QtCore import Qt
+
+from database.repositories import CoachRepository, DepartmentRepository
+from models.user import SCOPES, User
+from ui.forms.login_form import LoginForm
+
+HEADERS = ["Логин", "Роль", "Тренер / отделение", "Вход разрешён"]
+
+
+class UsersForm(QDialog):
+    """Пользователи программы: добавление, смена роли, пароля и блокировка"""
+
+    def __init__(self, users, db, session, parent=None):
+        super().__init__(parent)
+        self.users = users
+        self.session = session
+        self.coaches = {coach.id: coach.full_name for coach in CoachRepository(db).get_all()}
+        self.departments = {department.id: department.name for department in DepartmentRepository(db).get_all()}
+        self.roles = {role_id: (title, scope) for role_id, _, title, scope in users.roles()}
+
+        self.setWindowTitle("Пользователи")
+        self.resize(700, 500)
+
+        self.init_ui()
+        self.load_users()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        main_layout.addWidget(self.table)
+
+        actions_layout = QHBoxLayout()
+        password_button = QPushButton("Сменить пароль")
+        password_button.clicked.connect(self.change_password)
+        actions_layout.addWidget(password_button)
+        active_button = QPushButton("Запретить / разрешить вход")
+        active_button.clicked.connect(self.toggle_active)
+        actions_layout.addWidget(active_button)
+        main_layout.addLayout(actions_layout)
+
+        add_box = QGroupBox("Новый пользователь")
+        form_layout = QFormLayout()
+        self.login_input = QLineEdit()
+        form_layout.addRow("Логин:", self.login_input)
+        self.password_input = QLineEdit()
+        self.password_input.setEchoMode(QLineEdit.Password)
+        form_layout.addRow("Пароль:", self.password_input)
+        self.role_combo = QComboBox()
+        for role_id, (title, scope) in self.roles.items():
+            self.role_combo.addItem(f"{title} — {SCOPES[scope].lower()}", role_id)
+        form_layout.addRow("Роль:", self.role_combo)
+        self.coach_combo = QComboBox()
+        self.coach_combo.addItem("Не указан", None)
+        for coach_id, name in self.coaches.items():
+            self.coach_combo.addItem(name, coach_id)
+        form_layout.addRow("Тренер:", self.coach_combo)
+        self.department_combo = QComboBox()
+        self.department_combo.addItem("Не указано", None)
+        for department_id, name in self.departments.items():
+            self.department_combo.addItem(name, department_id)
+        form_layout.addRow("Отделение:", self.department_combo)
+        add_button = QPushButton("Добавить")
+        add_button.clicked.connect(self.add_user)
+        form_layout.addRow(add_button)
+        add_box.setLayout(form_layout)
+        main_layout.addWidget(add_box)
+
+        close_button = QPushButton("Закрыть")
+        close_button.clicked.connect(self.accept)
+        main_layout.addWidget(close_button)
+        self.setLayout(main_layout)
+
+    def load_users(self):
+        users = self.users.get_all()
+        self.table.setRowCount(len(users))
+        for row, user in enumerate(users):
+            title, scope = self.roles.get(user.role_id, ("", "all"))
+            if scope == "coach":
+                binding = self.coaches.get(user.coach_id, "не указан")
+            elif scope == "department":
+                binding = self.departments.get(user.department_id, "не указано")
+            else:
+                binding = ""
+            for column, value in enumerate((user.login, title, binding, "Да" if user.active else "Нет")):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, user.id)
+                self.table.setItem(row, column, item)
+
+    def selected_user(self):
+        item = self.table.item(self.table.currentRow(), 0)
+        return self.users.get(item.data(Qt.UserRole)) if item is not None else None
+
+    def add_user(self):
+        login = self.login_input.text().strip()
+        password = self.password_input.text()
+        if not login or len(password) < LoginForm.MIN_PASSWORD_LENGTH:
+            QMessageBox.warning(self, "Ошибка", f"Введите логин и пароль не короче "
+                                                f"{LoginForm.MIN_PASSWORD_LENGTH} символов")
+            return
+        user = User(login=login, role_id=self.role_combo.currentData(), coach_id=self.coach_combo.currentData(),
+                    department_id=self.department_combo.currentData())
+        try:
+            self.users.add(user, password)
+        except sqlite3.IntegrityError:
+            QMessageBox.warning(self, "Ошибка", f"Логин «{login}» уже занят")
+            return
+        self.login_input.clear()
+        self.password_input.clear()
+        self.load_users()
+
+    def change_password(self):
+        user = self.selected_user()
+        if user is None:
+            return
+        password, ok = QInputDialog.getText(self, "Пароль", f"Новый пароль для {user.login}:", QLineEdit.Password)
+        if not ok:
+            return
+        if len(password) < LoginForm.MIN_PASSWORD_LENGTH:
+            QMessageBox.warning(self, "Ошибка", f"Пароль должен быть не короче {LoginForm.MIN_PASSWORD_LENGTH} символов")
+            return
+        self.users.set_password(user.id, password)
+
+    def toggle_active(self):
+        user = self.selected_user()
+        if user is None:
+            return
+        if user.id == self.session.user.id:
+            QMessageBox.warning(self, "Ошибка", "Нельзя запретить вход самому себе")
+            return
+        user.active = not user.active
+        self.users.update(user)
+        self.load_users()
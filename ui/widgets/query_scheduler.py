@@ -0,0 +1,161 @@
+# ui/widgets/query_scheduler.py
+import queue
+import sqlite3
+import threading
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from database.db_manager import DatabaseManager
+from database.repositories import StudentRepository
+from utils.logger import get_logger, timed
+
+log = get_logger(__name__)
+
+
+class _PageRequest:
+    """Запрос страницы учеников; generation растёт с каждым новым набором фильтров"""
+
+    def __init__(self, generation, filters, sort_by, descending, after, limit):
+        self.generation = generation
+        self.filters = filters
+        self.sort_by = sort_by
+        self.descending = descending
+        self.after = after
+        self.limit = limit
+
+
+class StudentQueryWorker(QThread):
+    """Поток, выполняющий запросы страниц учеников на собственном соединении с БД"""
+    page_ready = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, connections, parent=None):
+        super().__init__(parent)
+        self.connections = connections
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._running = None
+
+    def submit(self, request):
+        """Ставит запрос в очередь и прерывает выполняемый запрос старого поколения"""
+        self._requests.put(request)
+        self.interrupt_before(request.generation)
+
+    def interrupt_before(self, generation):
+        """Прерывает выполняемый запрос, если он старше поколения generation"""
+        with self._lock:
+            # interrupt() можно вызывать из другого потока
+            if self._conn is not None and self._running is not None and self._running < generation:
+                self._conn.interrupt()
+
+    def stop(self):
+        self._requests.put(None)
+
+    def _next_request(self):
+        # Из накопившихся запросов выполняется только последний
+        request = self._requests.get()
+        while request is not None:
+            try:
+                newer = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            request = newer
+        return request
+
+    def run(self):
+        # Соединение sqlite3 нельзя передавать между потоками: поток читает через своё
+        db = DatabaseManager(connections=self.connections)
+        try:
+            conn = db.reader
+        except sqlite3.Error as e:
+            log.error("Не удалось открыть соединение для чтения", exc_info=True)
+            self.failed.emit(0, str(e))
+            return
+        students = StudentRepository(db)
+        with self._lock:
+            self._conn = conn
+        try:
+            while True:
+                request = self._next_request()
+                if request is None:
+                    return
+                with self._lock:
+                    self._running = request.generation
+                try:
+                    with timed("students_page", limit=request.limit, after=request.after is not None):
+                        page, next_key = students.page(request.filters, request.sort_by, request.descending,
+                                                       after=request.after, limit=request.limit)
+                except sqlite3.OperationalError as e:
+                    if "interrupted" not in str(e):
+                        log.error("Не удалось загрузить страницу учеников", exc_info=True)
+                        self.failed.emit(request.generation, str(e))
+                    continue
+                finally:
+                    with self._lock:
+                        self._running = None
+                self.page_ready.emit(request.generation, page, next_key)
+        finally:
+            with self._lock:
+                self._conn = None
+            db.close()
+
+
+class StudentQueryScheduler(QObject):
+    """Выполняет запросы таблицы учеников вне потока интерфейса.
+
+    Частые смены фильтров откладываются на debounce_ms и сливаются в один
+    запрос; новый запрос прерывает выполняющийся устаревший. Сигнал loaded
+    получает только результат последнего запроса.
+    """
+    loaded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, connections, debounce_ms=150, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._pending = None
+        self._query = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._submit_pending)
+        self._worker = StudentQueryWorker(connections, self)
+        self._worker.page_ready.connect(self._on_page_ready)
+        self._worker.failed.connect(self._on_failed)
+        self._worker.start()
+
+    def request(self, filters, sort_by, descending, limit):
+        """Новый набор фильтров или сортировка: первая страница после паузы debounce_ms"""
+        self._generation += 1
+        self._query = (dict(filters), sort_by, descending)
+        self._pending = _PageRequest(self._generation, dict(filters), sort_by, descending, None, limit)
+        # Выполняющийся запрос уже не нужен, даже если новый ещё ждёт паузы
+        self._worker.interrupt_before(self._generation)
+        self._timer.start()
+
+    def request_page(self, after, limit):
+        """Следующая страница текущего запроса, без задержки"""
+        if self._query is None:
+            return
+        filters, sort_by, descending = self._query
+        self._worker.submit(_PageRequest(self._generation, dict(filters), sort_by, descending, after, limit))
+
+    def close(self):
+        self._timer.stop()
+        self._worker.stop()
+        self._worker.wait()
+
+    def _submit_pending(self):
+        request, self._pending = self._pending, None
+        if request is not None:
+            self._worker.submit(request)
+
+    def _on_page_ready(self, generation, page, next_key):
+        # Результат устаревшего запроса, который не успели прервать, отбрасывается
+        if generation == self._generation and self._pending is None:
+            self.loaded.emit(page, next_key)
+
+    def _on_failed(self, generation, message):
+        if generation in (0, self._generation):
+            self.failed.emit(message)
@@ -0,0 +1,267 @@
+# ui/widgets/students_table.py
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QStyledItemDelegate
+from database.db_manager import SCOPE_FILTERS, STUDENT_COLUMNS, SUMMARY_FILTERS, sort_column
+from database.search import matches_name
+from utils.dates import format_display
+
+HEADERS = [
+    "Имя", "Возраст", "Дата рождения", "Отделение", "Группа", "Тренер",
+    "Школа", "Разряд", "Дата разряда", "СНИЛС", "Паспорт", "Дата зачисления", "Прошёл медосмотр"
+]
+
+AGE_COLUMN = 1
+MEDICAL_COLUMN = 12
+
+# Текст ячейки для каждой колонки таблицы
+_DISPLAY = (
+    lambda student: student.full_name,
+    lambda student: "" if student.age is None else str(student.age),
+    lambda student: format_display(student.birth_date),
+    lambda student: student.department or "",
+    lambda student: student.group_name or "",
+    lambda student: student.coach_name or "",
+    lambda student: student.educational_institution or "",
+    lambda student: student.sports_rank or "",
+    lambda student: format_display(student.rank_assignment_date),
+    lambda student: student.snils or "",
+    lambda student: student.passport_data or "",
+    lambda student: format_display(student.enrollment_date),
+    lambda student: student.medical_clearance,
+)
+
+
+class StudentsTableModel(QAbstractTableModel):
+    """Модель таблицы учеников с постраничной подгрузкой строк.
+
+    Строки читаются страницами по page_size по мере прокрутки (canFetchMore/fetchMore)
+    с пагинацией по ключу последней строки, ячейки форматируются только при отрисовке.
+    Со scheduler (StudentQueryScheduler) страницы читаются в отдельном потоке
+    и добавляются в модель по сигналу loaded.
+    """
+
+    def __init__(self, students, page_size=256, parent=None, scheduler=None):
+        super().__init__(parent)
+        self.students = students
+        self.page_size = page_size
+        self.scheduler = scheduler
+        self._rows = []
+        # ID -> загруженный ученик; позиция строки находится двоичным поиском по ключу сортировки
+        self._loaded = {}
+        self._next_key = None
+        self._has_more = False
+        self._loading = False
+        self._filters = {}
+        self._sort_column = None
+        self._sort_order = Qt.AscendingOrder
+        self.students.add_listener(self.on_student_changed)
+        if self.scheduler is not None:
+            self.scheduler.loaded.connect(self.on_page_loaded)
+            self.scheduler.failed.connect(self.on_load_failed)
+
+    def set_filters(self, filters):
+        self._filters = dict(filters)
+        self.reload()
+
+    def reload(self):
+        """Перезапускает запрос с текущими фильтрами и сортировкой."""
+        self.beginResetModel()
+        self._rows = []
+        self._loaded = {}
+        self._next_key = None
+        self._has_more = self.scheduler is None
+        self.endResetModel()
+        if self.scheduler is not None:
+            # Строки придут в on_page_loaded; до этого таблица пуста
+            self._loading = True
+            self.scheduler.request(self._filters, self.sort_by, self.descending, self.page_size)
+
+    @property
+    def filters(self):
+        return dict(self._filters)
+
+    @property
+    def sort_by(self):
+        """Колонка БД, по которой отсортирована таблица, или None"""
+        return STUDENT_COLUMNS[self._sort_column] if self._sort_column is not None else None
+
+    @property
+    def descending(self):
+        return self._sort_order == Qt.DescendingOrder
+
+    def student_id(self, row):
+        """ID ученика в строке таблицы"""
+        if 0 <= row < len(self._rows):
+            return self._rows[row].id
+        return None
+
+    def on_student_changed(self, action, student_id, student, old_student):
+        """Точечно обновляет одну строку вместо перезагрузки всей таблицы"""
+        if action == "reset":
+            self.reload()
+            return
+        if self._loading and not self._rows:
+            # Первая страница ещё читается и уже учтёт это изменение
+            return
+        position = self._find_row(student_id)
+        if position is not None and (student is None or not self._matches(student)):
+            self._remove_row(position)
+            return
+        if student is None or not self._matches(student):
+            return
+
+        if position is not None:
+            if self._sort_key(student) == self._sort_key(self._rows[position]):
+                self._rows[position] = student
+                self._loaded[student.id] = student
+                self.dataChanged.emit(self.index(position, 0), self.index(position, len(HEADERS) - 1))
+                return
+            # Изменилось значение колонки сортировки — переставляем строку
+            self._remove_row(position)
+
+        target = self._insert_position(student)
+        if target == len(self._rows) and self._has_more:
+            # Строка попадёт за пределы загруженной части и придёт со следующей порцией
+            return
+        self.beginInsertRows(QModelIndex(), target, target)
+        self._rows.insert(target, student)
+        self._loaded[student.id] = student
+        self.endInsertRows()
+
+    def _remove_row(self, position):
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self._loaded[self._rows[position].id]
+        del self._rows[position]
+        self.endRemoveRows()
+
+    def _find_row(self, student_id):
+        student = self._loaded.get(student_id)
+        if student is None:
+            return None
+        # Строки упорядочены по ключу сортировки, а загруженный объект хранит прежний ключ
+        position = self._insert_position(student)
+        if position < len(self._rows) and self._rows[position] is student:
+            return position
+        return None
+
+    def _matches(self, student):
+        summary = {}
+        for column, value in self._filters.items():
+            if column in SUMMARY_FILTERS or column in SCOPE_FILTERS:
+                summary[column] = value
+                continue
+            if column == "search_text":
+                if not matches_name(student.full_name, value):
+                    return False
+                continue
+            row_value = student.column_value(column)
+            if isinstance(value, tuple):
+                low, high = value
+                if row_value is None or (low is not None and row_value < low) \
+                        or (high is not None and row_value >= high):
+                    return False
+            elif row_value != value:
+                return False
+        # Фильтры по медосмотрам и области видимости проверяются в базе одним запросом по ID
+        return not summary or self.students.matches(student.id, summary)
+
+    def _sort_key(self, student):
+        # Повторяет порядок SQLite в ORDER BY <колонка>, id: NULL < числа < текст.
+        # Без сортировки строки идут по id, в том числе результаты поиска
+        if self._sort_column is None:
+            return (0, student.id, student.id)
+        column, _ = sort_column(self.sort_by, self.descending)
+        value = student.column_value(column)
+        if value is None:
+            return (0, 0, student.id)
+        return (1 if isinstance(value, (int, float)) else 2, value, student.id)
+
+    def _insert_position(self, student):
+        key = self._sort_key(student)
+        _, descending = sort_column(self.sort_by, self.descending)
+        lo, hi = 0, len(self._rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self._sort_key(self._rows[mid])
+            if (mid_key > key) if descending else (mid_key < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        if self.scheduler is not None:
+            if not self._loading:
+                self._loading = True
+                self.scheduler.request_page(self._next_key, self.page_size)
+            return
+        page, next_key = self.students.page(self._filters, self.sort_by, self.descending,
+                                            after=self._next_key, limit=self.page_size)
+        self._append_page(page, next_key)
+
+    def on_page_loaded(self, page, next_key):
+        """Страница от scheduler; приходят только результаты последнего запроса"""
+        self._loading = False
+        self._append_page(page, next_key)
+
+    def on_load_failed(self, message):
+        self._loading = False
+        self._has_more = False
+
+    def _append_page(self, page, next_key):
+        self._next_key = next_key
+        self._has_more = next_key is not None
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self._loaded.update((student.id, student) for student in page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return _DISPLAY[column](self._rows[index.row()])
+        if role == Qt.TextAlignmentRole and column == MEDICAL_COLUMN:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # Сортировка выполняется в SQL, а не в модели
+        self._sort_column = column if 0 <= column < len(HEADERS) else None
+        self._sort_order = order
+        self.reload()
+
+
+class MedicalClearanceDelegate(QStyledItemDelegate):
+    """Отображает отметку о медосмотре как «Да»/«Нет» с цветовой подсветкой"""
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        cleared = bool(index.data(Qt.DisplayRole))
+        option.text = "Да" if cleared else "Нет"
+        option.palette.setColor(QPalette.Text, QColor("#2e7d32") if cleared else QColor("#c62828"))
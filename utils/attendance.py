@@ -0,0 +1,94 @@
+# utils/attendance.py
+"""Сводки посещаемости по битовым журналам AttendanceSheet.
+
+Все подсчёты идут над целыми числами отметок: посещения — число единичных
+битов, серии — сдвиги и AND, поэтому отчёт за сезон по всей школе не
+разворачивает журналы в отдельные отметки.
+"""
+from bisect import bisect_right
+
+
+def longest_run(bits):
+    """Длина самой длинной серии единичных битов: каждый шаг укорачивает все серии на один"""
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
+
+
+def current_run(bits, length):
+    """Серия единиц, заканчивающаяся старшим из length битов (последним занятием)"""
+    missed = ~bits & ((1 << length) - 1)
+    return length - missed.bit_length()
+
+
+def percent(attended, possible):
+    return round(100 * attended / possible, 1) if possible else 0.0
+
+
+class _Totals:
+    """Посещения и возможные посещения"""
+
+    def __init__(self):
+        self.attended = 0
+        self.possible = 0
+        self.sessions = 0
+
+    @property
+    def percent(self):
+        return percent(self.attended, self.possible)
+
+
+def season_report(sheets, until=None):
+    """Посещаемость за период по ученикам, группам и тренерам.
+
+    Отметки ученика за разные месяцы склеиваются в одно число по порядку
+    месяцев, поэтому серии считаются через границы месяцев. Месяц с занятиями,
+    в котором ученика не было в списке ни одной группы, вставляет в это число
+    нулевой бит: серия прерывается, а число занятий ученика не меняется.
+
+    Args:
+        sheets (iterable): Журналы AttendanceSheet
+        until (str, optional): Учитывать занятия не позже «ГГГГ-ММ-ДД ЧЧ:ММ»; журнал
+            текущего месяца содержит и будущие занятия по расписанию
+
+    Returns:
+        dict: "students" — {student_id: (посещено, занятий, %, лучшая серия, текущая серия)},
+            "groups" и "coaches" — {ID: (посещено, возможно, %, проведено занятий)}
+    """
+    # student_id -> (отметки, длина с нулевыми битами пропусков, занятий, номер последнего месяца)
+    combined = {}
+    groups = {}
+    coaches = {}
+    month, month_number = None, -1
+    for sheet in sorted(sheets, key=lambda sheet: sheet.month):
+        held = len(sheet.sessions) if until is None else bisect_right(sheet.sessions, until)
+        if not held:
+            continue
+        if sheet.month != month:
+            month, month_number = sheet.month, month_number + 1
+        mask = (1 << held) - 1
+        marks = [bits & mask for bits in sheet.marks]
+        for student_id, bits in zip(sheet.roster, marks):
+            previous, offset, student_held, last = combined.get(student_id, (0, 0, 0, month_number))
+            if last < month_number - 1:
+                offset += 1
+            combined[student_id] = (previous | bits << offset, offset + held, student_held + held, month_number)
+        attended = sum(bits.bit_count() for bits in marks)
+        for totals, key in ((groups, sheet.group_id), (coaches, sheet.coach_id)):
+            entry = totals.setdefault(key, _Totals())
+            entry.attended += attended
+            entry.possible += held * len(sheet.roster)
+            entry.sessions += held
+    students = {}
+    for student_id, (bits, length, held, last) in combined.items():
+        attended = bits.bit_count()
+        # Ученика нет в списках последних месяцев: текущей серии нет
+        current = current_run(bits, length) if last == month_number else 0
+        students[student_id] = (attended, held, percent(attended, held), longest_run(bits), current)
+    return {
+        "students": students,
+        "groups": {key: (entry.attended, entry.possible, entry.percent, entry.sessions) for key, entry in groups.items()},
+        "coaches": {key: (entry.attended, entry.possible, entry.percent, entry.sessions) for key, entry in coaches.items()},
+    }
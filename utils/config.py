@@ -0,0 +1,120 @@
+# utils/config.py
+"""Настройки приложения.
+
+Значения по умолчанию лежат в resourses/app_config.ini.py (формат INI).
+Для конкретной установки их переопределяет app_config.ini в рабочем
+каталоге или файл, путь к которому задан в переменной SPORT_SCHOOL_CONFIG.
+"""
+import configparser
+import os
+
+DEFAULTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "resourses", "app_config.ini.py")
+SITE_FILE = "app_config.ini"
+SITE_FILE_ENV = "SPORT_SCHOOL_CONFIG"
+
+# Допустимые значения PRAGMA, которые подставляются в текст запроса
+_CHOICES = {
+    "journal_mode": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
+
+def load_config(path=None):
+    """Настройки по умолчанию, поверх которых прочитан файл установки.
+
+    Args:
+        path (str, optional): Файл установки; по умолчанию из SPORT_SCHOOL_CONFIG
+            или app_config.ini. Отсутствующий файл пропускается.
+
+    Returns:
+        configparser.ConfigParser: Прочитанные настройки
+    """
+    config = configparser.ConfigParser()
+    config.read(DEFAULTS_FILE, encoding="utf-8")
+    config.read(path or os.environ.get(SITE_FILE_ENV) or SITE_FILE, encoding="utf-8")
+    return config
+
+
+def database_settings(config=None):
+    """Настройки соединений с базой из секции [database].
+
+    Raises:
+        ValueError: если значение PRAGMA недопустимо
+
+    Returns:
+        dict: path, journal_mode, synchronous, cache_size, mmap_size, temp_store, busy_timeout
+    """
+    section = (config or load_config())["database"]
+    settings = {
+        "path": section.get("path"),
+        "cache_size": section.getint("cache_size"),
+        "mmap_size": section.getint("mmap_size"),
+        "busy_timeout": section.getint("busy_timeout"),
+    }
+    for name, choices in _CHOICES.items():
+        value = section.get(name, "").upper()
+        if value not in choices:
+            raise ValueError(f"Недопустимое значение {name} в настройках: {value!r}")
+        settings[name] = value
+    return settings
+
+
+def medical_settings(config=None):
+    """Настройки списка истекающих медосмотров из секции [medical].
+
+    Raises:
+        ValueError: если due_days не положительное число
+
+    Returns:
+        dict: due_days
+    """
+    due_days = (config or load_config())["medical"].getint("due_days")
+    if due_days is None or due_days <= 0:
+        raise ValueError(f"Недопустимое значение due_days в настройках: {due_days!r}")
+    return {"due_days": due_days}
+
+
+def auth_settings(config=None):
+    """Настройки входа в программу из секции [auth].
+
+    Raises:
+        ValueError: если iterations не положительное число
+
+    Returns:
+        dict: iterations
+    """
+    iterations = (config or load_config())["auth"].getint("iterations")
+    if iterations is None or iterations <= 0:
+        raise ValueError(f"Недопустимое значение iterations в настройках: {iterations!r}")
+    return {"iterations": iterations}
+
+
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def logging_settings(config=None):
+    """Настройки журнала работы программы из секции [logging].
+
+    Raises:
+        ValueError: если уровень неизвестен или размеры и порог отрицательны
+
+    Returns:
+        dict: enabled, level, path, max_bytes, backup_count, slow_ms
+    """
+    section = (config or load_config())["logging"]
+    settings = {
+        "enabled": section.getboolean("enabled"),
+        "level": section.get("level", "").upper(),
+        "path": section.get("path"),
+        "max_bytes": section.getint("max_bytes"),
+        "backup_count": section.getint("backup_count"),
+        "slow_ms": section.getint("slow_ms"),
+    }
+    if settings["level"] not in _LOG_LEVELS:
+        raise ValueError(f"Недопустимое значение level в настройках: {settings['level']!r}")
+    for name in ("max_bytes", "backup_count", "slow_ms"):
+        if settings[name] is None or settings[name] < 0:
+            raise ValueError(f"Недопустимое значение {name} в настройках: {settings[name]!r}")
+    return settings
@@ -0,0 +1,109 @@
+# utils/dates.py
+"""Единый формат дат приложения.
+
+В базе даты хранятся в ISO 8601 (ГГГГ-ММ-ДД): такие строки сортируются
+как даты, поэтому ORDER BY и диапазонные условия идут по индексу.
+Пользователю даты показываются и вводятся в формате ДД/ММ/ГГГГ.
+"""
+import calendar
+from datetime import date, datetime, timedelta
+
+STORAGE_FORMAT = '%Y-%m-%d'
+DISPLAY_FORMAT = '%d/%m/%Y'
+# Тот же формат отображения в нотации Qt (QDate.toString)
+QT_DISPLAY_FORMAT = 'dd/MM/yyyy'
+DISPLAY_PLACEHOLDER = 'ДД/ММ/ГГГГ'
+# Спортивный сезон начинается 1 сентября
+SEASON_START_MONTH = 9
+
+
+def parse_display(text):
+    """Разбирает дату, введённую пользователем (ДД/ММ/ГГГГ).
+
+    Raises:
+        ValueError: если строка не является корректной датой
+    """
+    return datetime.strptime(text, DISPLAY_FORMAT).date()
+
+
+def from_storage(value):
+    """Дата из значения колонки базы; None для пустых значений"""
+    if not value:
+        return None
+    return date.fromisoformat(value)
+
+
+def to_storage(value):
+    """Значение для записи в базу из date или строки (ДД/ММ/ГГГГ или ГГГГ-ММ-ДД); None для пустых
+
+    Raises:
+        ValueError: если строка не является корректной датой
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value)
+        except ValueError:
+            value = parse_display(value)
+    return value.strftime(STORAGE_FORMAT)
+
+
+def format_display(value):
+    """Строка ДД/ММ/ГГГГ для date или значения колонки базы; "" для пустых"""
+    if not value:
+        return ""
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value)
+        except ValueError:
+            # Значение в непредусмотренном формате показываем как есть
+            return value
+    return value.strftime(DISPLAY_FORMAT)
+
+
+def year_range(year):
+    """Полуинтервал [1 января year, 1 января year+1) в формате хранения"""
+    return f"{int(year):04d}-01-01", f"{int(year) + 1:04d}-01-01"
+
+
+def season_of(day):
+    """Год начала сезона для date или значения колонки базы: 2024 для сезона 2024/2025"""
+    if isinstance(day, str):
+        day = from_storage(day)
+    return day.year if day.month >= SEASON_START_MONTH else day.year - 1
+
+
+def years_before(day, years):
+    """Та же дата years лет назад; 29 февраля переходит в 28 февраля"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def add_months(day, months):
+    """Та же дата через months месяцев; 31 августа + 6 месяцев — последний день февраля"""
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def birth_date_range(low, high, today):
+    """Полуинтервал дат рождения в формате хранения для возраста из [low, high) на дату today.
+
+    None в границе возраста означает открытую границу.
+    """
+    date_from = to_storage(years_before(today, high) + timedelta(days=1)) if high is not None else None
+    date_to = to_storage(years_before(today, low) + timedelta(days=1)) if low is not None else None
+    return date_from, date_to
+
+
+def age_on(birth_date, today):
+    """Полных лет на дату today для date или значения колонки базы; None для пустых"""
+    if isinstance(birth_date, str):
+        birth_date = from_storage(birth_date)
+    if birth_date is None:
+        return None
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
@@ -1,16 +1,68 @@
 # utils/export.py
 import csv
+import os
+from utils.dates import format_display
 
-def export_to_csv(data, filename="students_export.csv"):
-    headers = [
-        "Имя", "Возраст", "Дата рождения", "Отделение", "Группа", "Тренер",
-        "Школа", "Разряд", "Дата разряда", "СНИЛС", "Паспорт", "Дата зачисления", "Прошёл медосмотр"
-    ]
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        for row in data:
-            # Пропускаем ID (первый элемент), форматируем медосмотр
-            row = list(row[1:])  # Исключаем ID
-            row[12] = "Да" if row[12] else "Нет"  # Медосмотр (последний элемент)
-            writer.writerow(row)
\ No newline at end of file
+HEADERS = [
+    "Имя", "Возраст", "Дата рождения", "Отделение", "Группа", "Тренер",
+    "Школа", "Разряд", "Дата разряда", "СНИЛС", "Паспорт", "Дата зачисления", "Прошёл медосмотр"
+]
+
+# Строк за одно чтение из курсора и размер буфера файла
+CHUNK_SIZE = 2000
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def csv_row(row):
+    """Строка CSV из строки таблицы students (порядок STUDENT_FIELDS, возраст посчитан в запросе)"""
+    (_id, name, age, birth_date, department, group_name, coach, school, rank,
+     rank_date, snils, passport, enrollment_date, medical_clearance, _group_id, _coach_id) = row
+    return (name, age, format_display(birth_date), department, group_name,
+            coach, school, rank, format_display(rank_date), snils, passport,
+            format_display(enrollment_date), "Да" if medical_clearance else "Нет")
+
+
+def export_to_csv(students, filename="students_export.csv", filters=None, sort_by=None, descending=False,
+                  progress=None, is_cancelled=None):
+    """Потоковый экспорт учеников в CSV.
+
+    Строки читаются из курсора порциями по CHUNK_SIZE и пишутся в файл с большим
+    буфером, поэтому память не зависит от размера выборки.
+
+    Args:
+        students (StudentRepository): Репозиторий, из которого читаются ученики.
+        filename (str, optional): Путь к файлу.
+        filters, sort_by, descending: Фильтры и сортировка в формате query_students.
+        progress (callable, optional): Вызывается с числом уже записанных строк.
+        is_cancelled (callable, optional): Возвращает True, если экспорт нужно прервать.
+
+    Returns:
+        int | None: Число записанных строк или None, если экспорт отменён.
+            Недописанный файл удаляется и при отмене, и при ошибке.
+    """
+    cursor = students.rows(filters, sort_by, descending)
+    written = 0
+    opened = exhausted = saved = False
+    try:
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            opened = True
+            writer = csv.writer(f)
+            writer.writerow(HEADERS)
+            while True:
+                if is_cancelled is not None and is_cancelled():
+                    break
+                rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    exhausted = True
+                    break
+                writer.writerows([csv_row(row) for row in rows])
+                written += len(rows)
+                if progress is not None:
+                    progress(written)
+        # Файл сохранён, только если буфер успешно сброшен при закрытии
+        saved = exhausted
+    finally:
+        cursor.close()
+        if opened and not saved:
+            os.remove(filename)
+    return written if saved else None
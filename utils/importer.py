@@ -0,0 +1,206 @@
+# utils/importer.py
+"""Массовый импорт учеников из CSV (в формате export_to_csv) и XLSX.
+
+Файл читается потоково: разобранные строки сразу уходят в
+StudentRepository.import_rows, который пишет их порциями в транзакциях.
+Строки с ошибками не прерывают импорт, а попадают в отдельный CSV-файл.
+"""
+import codecs
+import csv
+import os
+import zipfile
+from datetime import date
+
+from utils.export import HEADERS
+from utils.validation import validate_batch
+
+ERROR_HEADERS = ["Строка", "Ошибка"] + HEADERS
+
+_YES = {"да", "1", "true", "yes"}
+_NO = {"нет", "0", "false", "no", ""}
+
+
+class ImportResult:
+    """Итог импорта"""
+
+    def __init__(self, inserted=0, updated=0, rejected=0, errors_filename=None, cancelled=False):
+        self.inserted = inserted
+        self.updated = updated
+        self.rejected = rejected
+        self.errors_filename = errors_filename
+        self.cancelled = cancelled
+
+
+def _detect_encoding(filename):
+    """utf-8 (в том числе с BOM) или cp1251, в которой CSV сохраняет русский Excel"""
+    with open(filename, 'rb') as f:
+        head = f.read(1 << 16)
+    try:
+        # Инкрементальный декодер не ругается на символ, разрезанный границей блока
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return 'cp1251'
+    return 'utf-8-sig'
+
+
+def _read_csv(filename):
+    with open(filename, newline='', encoding=_detect_encoding(filename)) as f:
+        yield from csv.reader(f)
+
+
+def _read_xlsx(filename):
+    # openpyxl нужен только для импорта из Excel, поэтому загружается по требованию
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ImportError("Для импорта из XLSX установите пакет openpyxl") from None
+    try:
+        workbook = load_workbook(filename, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"Файл XLSX повреждён или имеет неверный формат: {e}") from None
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ["" if value is None else value for value in row]
+    finally:
+        workbook.close()
+
+
+def read_rows(filename):
+    """Строки ячеек файла CSV или XLSX (по расширению)"""
+    if filename.lower().endswith(".xlsx"):
+        return _read_xlsx(filename)
+    return _read_csv(filename)
+
+
+# Сколько строк файла проверяется за один вызов validate_batch
+VALIDATION_BATCH_SIZE = 2000
+
+
+def _text(value):
+    if isinstance(value, float) and value.is_integer():
+        # Числа из Excel (СНИЛС, номер паспорта) приходят как float
+        value = int(value)
+    return str(value).strip()
+
+
+def _storage(value):
+    return value.isoformat() if value is not None else None
+
+
+def parse_rows(rows, today):
+    """Значения для таблицы students (порядок STUDENT_COLUMNS) из строк файла.
+
+    Поля проверяются пачкой через utils.validation.validate_batch — по тем же
+    правилам, что в AddStudentDialog. Колонка «Возраст» не читается: возраст
+    считается в запросах по дате рождения.
+
+    Args:
+        rows (list): Строки ячеек файла.
+        today (datetime.date): Дата, с которой сравниваются даты.
+
+    Returns:
+        list: Для каждой строки кортеж (значения, None) или (None, текст ошибки)
+    """
+    results = [None] * len(rows)
+    checked = []
+    for index, cells in enumerate(rows):
+        if len(cells) < len(HEADERS):
+            results[index] = (None, f"Ожидалось {len(HEADERS)} колонок, получено {len(cells)}")
+            continue
+        medical = _text(cells[12]).lower()
+        if medical not in _YES and medical not in _NO:
+            results[index] = (None, f"Прошёл медосмотр: ожидается «Да» или «Нет», получено «{medical}»")
+            continue
+        checked.append(index)
+
+    cleaned, errors = validate_batch({
+        "name": [rows[index][0] for index in checked],
+        "birth_date": [rows[index][2] for index in checked],
+        "department": [rows[index][3] for index in checked],
+        "rank_date": [rows[index][8] for index in checked],
+        "snils": [rows[index][9] for index in checked],
+        "passport": [rows[index][10] for index in checked],
+        "enrollment_date": [rows[index][11] for index in checked],
+    }, today)
+
+    for position, index in enumerate(checked):
+        if errors[position]:
+            results[index] = (None, "; ".join(errors[position]))
+            continue
+        cells = rows[index]
+        birth_date = cleaned["birth_date"][position]
+        results[index] = ((
+            cleaned["name"][position], None, _storage(birth_date),
+            cleaned["department"][position], _text(cells[4]) or None, _text(cells[5]) or None,
+            _text(cells[6]) or None, _text(cells[7]) or None, _storage(cleaned["rank_date"][position]),
+            cleaned["snils"][position], cleaned["passport"][position],
+            _storage(cleaned["enrollment_date"][position]),
+            1 if _text(cells[12]).lower() in _YES else 0), None)
+    return results
+
+
+def import_students(students, filename, errors_filename=None, progress=None, is_cancelled=None):
+    """Импорт учеников из файла с обновлением существующих по СНИЛС.
+
+    Args:
+        students (StudentRepository): Репозиторий, в который пишутся ученики.
+        filename (str): Путь к файлу CSV или XLSX.
+        errors_filename (str, optional): Куда записать отклонённые строки;
+            по умолчанию рядом с файлом импорта с суффиксом _errors.csv.
+        progress (callable, optional): Вызывается с числом обработанных строк.
+        is_cancelled (callable, optional): Возвращает True, если импорт нужно прервать.
+            Строки, уже переданные в базу, остаются записанными; result.cancelled становится True.
+
+    Returns:
+        ImportResult: Число добавленных, обновлённых и отклонённых строк.
+    """
+    if errors_filename is None:
+        errors_filename = os.path.splitext(filename)[0] + "_errors.csv"
+    result = ImportResult()
+    today = date.today()
+    errors_file = None
+    errors_writer = None
+
+    def reject(line, cells, error):
+        nonlocal errors_file, errors_writer
+        if errors_writer is None:
+            errors_file = open(errors_filename, 'w', newline='', encoding='utf-8')
+            errors_writer = csv.writer(errors_file)
+            errors_writer.writerow(ERROR_HEADERS)
+        errors_writer.writerow([line, error] + [_text(value) for value in cells])
+        result.rejected += 1
+
+    def valid_rows():
+        lines, batch = [], []
+        for line, cells in enumerate(read_rows(filename), start=1):
+            if is_cancelled is not None and is_cancelled():
+                result.cancelled = True
+                return
+            if line == 1 and cells and _text(cells[0]) == HEADERS[0]:
+                continue
+            if not any(_text(value) for value in cells):
+                continue
+            lines.append(line)
+            batch.append(cells)
+            if len(batch) < VALIDATION_BATCH_SIZE:
+                continue
+            yield from checked_rows(lines, batch)
+            lines, batch = [], []
+        yield from checked_rows(lines, batch)
+
+    def checked_rows(lines, batch):
+        for line, cells, (values, error) in zip(lines, batch, parse_rows(batch, today)):
+            if error is None:
+                yield values
+            else:
+                reject(line, cells, error)
+
+    try:
+        result.inserted, result.updated = students.import_rows(valid_rows(), progress=progress)
+    finally:
+        if errors_file is not None:
+            errors_file.close()
+    if result.rejected:
+        result.errors_filename = errors_filename
+    return result
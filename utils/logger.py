@@ -0,0 +1,192 @@
+# utils/logger.py
+"""Журнал работы программы.
+
+Записи логгеров "sport_school.*" попадают в очередь (QueueHandler), а в файл
+их пишет поток QueueListener, поэтому поток интерфейса не ждёт диска. Файл —
+JSON Lines с ротацией по размеру: каждая запись — объект на отдельной строке,
+дополнительные поля из extra= становятся его ключами.
+
+timed() замеряет длительность операции. Обычная длительность пишется с
+уровнем DEBUG, операция дольше порога slow_ms — с уровнем WARNING. Если
+журнал выключен, замер сводится к проверке уровня логгера, которую logging
+кэширует.
+"""
+import copy
+import functools
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from datetime import datetime
+
+from utils.config import logging_settings
+
+ROOT_LOGGER = "sport_school"
+# Атрибуты LogRecord; остальные атрибуты записи — поля из extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# До setup_logging() записи никуда не выводятся (и не уходят в stderr через logging.lastResort)
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+_listener = None
+_queue_handler = None
+_slow_ms = 200
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись журнала одной строкой JSON: время, уровень, логгер, сообщение и поля extra"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Сообщение и трассировка вычисляются в потоке, где возникла запись: аргументы
+        # и объект исключения могут измениться, пока запись ждёт в очереди.
+        # В отличие от QueueHandler.prepare, поля extra и трассировка остаются отдельными
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def get_logger(name):
+    """Логгер подсистемы: его записи попадают в журнал программы"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def setup_logging(settings=None):
+    """Включает журнал по настройкам секции [logging].
+
+    Args:
+        settings (dict, optional): Результат utils.config.logging_settings(); по умолчанию
+            читается из настроек. Defaults to None.
+
+    Returns:
+        logging.handlers.QueueListener: Поток записи в файл или None, если журнал выключен
+    """
+    global _listener, _queue_handler, _slow_ms
+    settings = settings or logging_settings()
+    shutdown_logging()
+    root = logging.getLogger(ROOT_LOGGER)
+    root.propagate = False
+    _slow_ms = settings["slow_ms"]
+    if not settings["enabled"]:
+        # Выше CRITICAL: isEnabledFor() ложно для любого уровня, timed() ничего не замеряет
+        root.setLevel(logging.CRITICAL + 1)
+        return None
+    file_handler = logging.handlers.RotatingFileHandler(
+        settings["path"], maxBytes=settings["max_bytes"], backupCount=settings["backup_count"],
+        encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonFormatter())
+    records = queue.SimpleQueue()
+    _queue_handler = _QueueHandler(records)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings["level"])
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Дописывает записи из очереди в файл и останавливает поток записи"""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def log_uncaught_exceptions(logger=None):
+    """Записывает в журнал исключения, не перехваченные в обработчиках интерфейса"""
+    logger = logger or get_logger("app")
+    previous = sys.excepthook
+
+    def excepthook(exc_type, exc, traceback):
+        logger.critical("Необработанное исключение", exc_info=(exc_type, exc, traceback))
+        previous(exc_type, exc, traceback)
+
+    sys.excepthook = excepthook
+
+
+class _Timer:
+    def __init__(self, operation, logger, fields):
+        self.operation = operation
+        self.logger = logger
+        self.fields = fields
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter() if self.logger.isEnabledFor(logging.WARNING) else None
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._start is not None:
+            self._record(time.perf_counter() - self._start, exc_type is not None)
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.logger.isEnabledFor(logging.WARNING):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self._record(time.perf_counter() - start, failed)
+        return wrapper
+
+    def _record(self, seconds, failed):
+        duration_ms = seconds * 1000
+        level = logging.WARNING if duration_ms >= _slow_ms else logging.DEBUG
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, "%s: %.1f мс", self.operation, duration_ms,
+                            extra={"operation": self.operation, "duration_ms": round(duration_ms, 3),
+                                   "failed": failed, **self.fields})
+
+
+def timed(operation, logger=None, **fields):
+    """Замер длительности операции; контекстный менеджер или декоратор
+
+        with timed("export_csv", rows=total):
+            ...
+
+        @timed("load_students")
+        def load_students(self): ...
+
+    Args:
+        operation (str): Название операции (поле operation записи)
+        logger (logging.Logger, optional): Логгер; по умолчанию "sport_school.timing". Defaults to None.
+        **fields: Дополнительные поля записи
+
+    Returns:
+        Объект, который можно использовать в with или как декоратор
+    """
+    return _Timer(operation, logger or get_logger("timing"), fields)
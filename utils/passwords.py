@@ -0,0 +1,61 @@
+# utils/passwords.py
+"""Хэширование паролей пользователей (PBKDF2-HMAC-SHA256).
+
+Хэш хранится строкой «pbkdf2_sha256$итерации$соль$хэш» (соль и хэш в base64),
+поэтому число итераций можно поднять в настройках: старые хэши проверяются
+со своим числом итераций и пересчитываются при следующем входе.
+"""
+import base64
+import hashlib
+import hmac
+import os
+
+ALGORITHM = "pbkdf2_sha256"
+SALT_SIZE = 16
+
+
+def _encode(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _derive(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+
+
+def hash_password(password, iterations, salt=None):
+    """Хэш пароля для хранения в users.password_hash
+
+    Args:
+        password (str): Пароль
+        iterations (int): Число итераций PBKDF2 (рабочий фактор)
+        salt (bytes, optional): Соль; по умолчанию случайная. Defaults to None.
+
+    Returns:
+        str: Строка «pbkdf2_sha256$итерации$соль$хэш»
+    """
+    salt = salt if salt is not None else os.urandom(SALT_SIZE)
+    return f"{ALGORITHM}${iterations}${_encode(salt)}${_encode(_derive(password, salt, iterations))}"
+
+
+def _parse(encoded):
+    algorithm, iterations, salt, digest = encoded.split("$")
+    if algorithm != ALGORITHM:
+        raise ValueError(f"Неизвестный алгоритм хэша: {algorithm}")
+    return int(iterations), base64.b64decode(salt), base64.b64decode(digest)
+
+
+def verify_password(password, encoded):
+    """Совпадает ли пароль с сохранённым хэшем; сравнение за постоянное время"""
+    try:
+        iterations, salt, digest = _parse(encoded)
+    except ValueError:
+        return False
+    return hmac.compare_digest(_derive(password, salt, iterations), digest)
+
+
+def needs_rehash(encoded, iterations):
+    """Нужно ли пересчитать хэш: он посчитан с другим числом итераций или алгоритмом"""
+    try:
+        return _parse(encoded)[0] != iterations
+    except ValueError:
+        return True
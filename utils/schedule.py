@@ -0,0 +1,124 @@
+# utils/schedule.py
+"""Развёртывание еженедельного расписания и поиск пересечений занятий.
+
+Занятие задано днём недели, временем и периодом действия, поэтому сезон —
+это число занятий в неделе, а не число дней. Конкретные даты получаются
+лениво через occurrences(), а пересечения ищутся по самим занятиям.
+"""
+import heapq
+from datetime import timedelta
+
+from models.schedule import WEEKDAYS, Occurrence
+from utils.dates import format_display
+
+# Ресурсы, которые не могут быть заняты двумя занятиями одновременно
+RESOURCES = ("group_id", "coach_id", "hall_id")
+RESOURCE_NAMES = {"group_id": "Группа", "coach_id": "Тренер", "hall_id": "Зал"}
+
+
+def occurrences(sessions, start, end):
+    """Занятия в днях [start, end) по порядку дат и времени начала.
+
+    Даты вычисляются по мере чтения: вызывающий код может остановиться
+    на первой неделе, не разворачивая весь сезон.
+
+    Args:
+        sessions (iterable): Объекты ScheduleSession
+        start (datetime.date): Первый день
+        end (datetime.date): День после последнего
+
+    Yields:
+        Occurrence: Занятие в конкретный день
+    """
+    by_weekday = [[] for _ in WEEKDAYS]
+    for session in sessions:
+        by_weekday[session.weekday].append(session)
+    for day_sessions in by_weekday:
+        day_sessions.sort(key=lambda session: (session.start_minute, session.id or 0))
+    day = start
+    while day < end:
+        for session in by_weekday[day.weekday()]:
+            if session.active_on(day):
+                yield Occurrence(session, day)
+        day += timedelta(days=1)
+
+
+def first_common_day(first, second):
+    """Первый день, в который проходят оба занятия одного дня недели, или None.
+
+    Периоды действия могут пересекаться меньше чем на неделю и не содержать
+    нужного дня недели — тогда занятия не встречаются.
+    """
+    start = max(first.valid_from, second.valid_from)
+    ends = [day for day in (first.valid_to, second.valid_to) if day is not None]
+    day = start + timedelta(days=(first.weekday - start.weekday()) % 7)
+    if ends and day > min(ends):
+        return None
+    return day
+
+
+def _overlap(first, second):
+    """Пересекаются ли занятия по дню недели и времени"""
+    return (first.weekday == second.weekday and first.start_minute < second.end_minute
+            and second.start_minute < first.end_minute)
+
+
+def find_conflicts(sessions):
+    """Пары занятий, которые одновременно занимают одну группу, тренера или зал.
+
+    Занятия каждого ресурса сортируются по (ID ресурса, день недели, начало) и
+    просматриваются одним проходом. Куча по времени окончания держит только
+    занятия, ещё идущие к началу очередного, поэтому сравниваются лишь
+    пересекающиеся по времени пары: O(n log n + k) вместо n² сравнений.
+
+    Returns:
+        list: Кортежи (ресурс, ID ресурса, занятие, занятие, первый общий день)
+    """
+    sessions = list(sessions)
+    conflicts = []
+    for resource in RESOURCES:
+        keyed = sorted((session for session in sessions if getattr(session, resource) is not None),
+                       key=lambda session: (getattr(session, resource), session.weekday, session.start_minute))
+        current = None
+        active = []
+        for order, session in enumerate(keyed):
+            key = (getattr(session, resource), session.weekday)
+            if key != current:
+                current, active = key, []
+            while active and active[0][0] <= session.start_minute:
+                heapq.heappop(active)
+            for _, _, other in active:
+                day = first_common_day(other, session)
+                if day is not None:
+                    conflicts.append((resource, key[0], other, session, day))
+            heapq.heappush(active, (session.end_minute, order, session))
+    return conflicts
+
+
+def conflicts_with(candidate, sessions):
+    """Пересечения одного занятия с уже записанными (в формате find_conflicts).
+
+    Args:
+        candidate (ScheduleSession): Новое или изменённое занятие
+        sessions (iterable): Занятия, с которыми нужно сравнить; само занятие
+            с тем же ID пропускается
+    """
+    conflicts = []
+    for session in sessions:
+        if (candidate.id is not None and session.id == candidate.id) or not _overlap(candidate, session):
+            continue
+        day = first_common_day(session, candidate)
+        if day is None:
+            continue
+        for resource in RESOURCES:
+            value = getattr(candidate, resource)
+            if value is not None and getattr(session, resource) == value:
+                conflicts.append((resource, value, session, candidate, day))
+    return conflicts
+
+
+def describe_conflict(conflict):
+    """Текст пересечения для сообщения пользователю"""
+    resource, _, first, second, day = conflict
+    return (f"{RESOURCE_NAMES[resource]} занят(а) дважды: {WEEKDAYS[first.weekday]} "
+            f"{first.time_range} и {second.time_range}, начиная с {format_display(day)}")
@@ -0,0 +1,226 @@
+# utils/validation.py
+"""Проверка данных учеников.
+
+Правила общие для диалога добавления, массового импорта и проверки уже
+записанных данных. Основной интерфейс — validate_batch(): он принимает
+значения по колонкам и проверяет каждую колонку одним проходом, поэтому
+регулярные выражения компилируются один раз, повторяющиеся даты разбираются
+один раз, а контрольные суммы СНИЛС считаются по всей колонке сразу.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+from utils.dates import parse_display
+
+# Колонки, которые проверяет validate_batch
+FIELDS = ("name", "department", "birth_date", "rank_date", "enrollment_date", "snils", "passport")
+
+_NAME = re.compile(r'[А-Яа-яЁё\s-]+')
+_DISPLAY_DATE = re.compile(r'\d{2}/\d{2}/\d{4}')
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_SNILS = re.compile(r'\d{3}-\d{3}-\d{3}\s\d{2}|\d{11}')
+_PASSPORT = re.compile(r'\d{4}\s\d{6}')
+_SNILS_WEIGHTS = (9, 8, 7, 6, 5, 4, 3, 2, 1)
+
+# (колонка, название для сообщения, обязательна ли)
+_DATE_FIELDS = (
+    ("birth_date", "Дата рождения", True),
+    ("rank_date", "Дата разряда", False),
+    ("enrollment_date", "Дата зачисления", True),
+)
+
+
+def clean_snils(snils):
+    """СНИЛС без дефисов и пробелов"""
+    return ''.join(c for c in snils if c.isdigit())
+
+
+def format_snils(snils):
+    """СНИЛС в виде XXX-XXX-XXX XX; значение не из 11 цифр возвращается как есть"""
+    digits = clean_snils(snils or "")
+    if len(digits) != 11:
+        return snils or ""
+    return f"{digits[:3]}-{digits[3:6]}-{digits[6:9]} {digits[9:]}"
+
+
+def snils_checksums_valid(snils_values):
+    """Проверка контрольных сумм для колонки СНИЛС из 11 цифр.
+
+    Returns:
+        list: True/False для каждого значения
+    """
+    # Колонка раскладывается на девять колонок цифр, и взвешенная сумма
+    # накапливается по ним, а не по каждому СНИЛС отдельно
+    totals = [0] * len(snils_values)
+    for position, weight in enumerate(_SNILS_WEIGHTS):
+        digits = [ord(value[position]) - 48 for value in snils_values]
+        totals = [total + digit * weight for total, digit in zip(totals, digits)]
+    return [total % 101 % 100 == int(value[9:]) for total, value in zip(totals, snils_values)]
+
+
+def validate_snils(snils):
+    """Проверяет контрольную сумму СНИЛС из 11 цифр."""
+    return bool(re.fullmatch(r'\d{11}', snils)) and snils_checksums_valid([snils])[0]
+
+
+@lru_cache(maxsize=65536)
+def _parse_date(text):
+    if _ISO_DATE.fullmatch(text):
+        return date.fromisoformat(text)
+    if not _DISPLAY_DATE.fullmatch(text):
+        raise ValueError(text)
+    return parse_display(text)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # Числа из Excel (СНИЛС, номер паспорта) приходят как float
+        value = int(value)
+    return str(value).strip()
+
+
+def _check_names(values, cleaned, errors):
+    names = [" ".join(_text(value).split()) for value in values]
+    for row, name in enumerate(names):
+        if not _NAME.fullmatch(name):
+            errors[row].append("Имя должно содержать только кириллицу, пробелы и дефисы")
+    cleaned["name"] = names
+
+
+def _check_departments(values, cleaned, errors):
+    departments = [_text(value) for value in values]
+    for row, department in enumerate(departments):
+        if not department:
+            errors[row].append("Отделение обязательно для выбора")
+    cleaned["department"] = departments
+
+
+def _check_dates(column, title, required, values, cleaned, errors, today):
+    result = []
+    for row, value in enumerate(values):
+        if isinstance(value, date):
+            parsed = value.date() if hasattr(value, 'date') else value
+        else:
+            text = _text(value)
+            if not text:
+                if required:
+                    errors[row].append(f"{title} обязательна")
+                result.append(None)
+                continue
+            try:
+                parsed = _parse_date(text)
+            except ValueError:
+                errors[row].append(f"{title} должна быть корректной датой в формате ДД/ММ/ГГГГ")
+                result.append(None)
+                continue
+        if parsed > today:
+            errors[row].append(f"{title} не может быть в будущем")
+        result.append(parsed)
+    cleaned[column] = result
+
+
+def _check_snils(values, cleaned, errors):
+    result = [None] * len(values)
+    rows = []
+    for row, value in enumerate(values):
+        text = _text(value)
+        if not text:
+            continue
+        if not _SNILS.fullmatch(text):
+            errors[row].append("СНИЛС должен быть в формате XXX-XXX-XXX XX")
+            continue
+        result[row] = clean_snils(text)
+        rows.append(row)
+    for row, valid in zip(rows, snils_checksums_valid([result[row] for row in rows])):
+        if not valid:
+            errors[row].append("СНИЛС недействителен (неверная контрольная сумма)")
+    cleaned["snils"] = result
+
+
+def _check_passports(values, cleaned, errors):
+    passports = [_text(value) for value in values]
+    for row, passport in enumerate(passports):
+        if passport and not _PASSPORT.fullmatch(passport):
+            errors[row].append("Паспортные данные должны быть в формате XXXX XXXXXX")
+    cleaned["passport"] = [passport or None for passport in passports]
+
+
+def validate_batch(columns, today=None):
+    """Проверяет пачку записей, переданных по колонкам.
+
+    Args:
+        columns (dict): Списки значений одинаковой длины для колонок из FIELDS.
+            Даты — date или строки ДД/ММ/ГГГГ / ГГГГ-ММ-ДД, СНИЛС — XXX-XXX-XXX XX
+            или 11 цифр. Отсутствующая колонка считается пустой.
+        today (datetime.date, optional): Дата, с которой сравниваются даты.
+
+    Returns:
+        tuple: (dict нормализованных колонок — даты как datetime.date, СНИЛС
+            из 11 цифр; список списков ошибок по строкам, пустой для верных строк)
+    """
+    today = today or date.today()
+    size = max((len(values) for values in columns.values()), default=0)
+
+    def column(name):
+        return columns.get(name) or [""] * size
+
+    cleaned = {}
+    errors = [[] for _ in range(size)]
+    _check_names(column("name"), cleaned, errors)
+    _check_departments(column("department"), cleaned, errors)
+    for name, title, required in _DATE_FIELDS:
+        _check_dates(name, title, required, column(name), cleaned, errors, today)
+    _check_snils(column("snils"), cleaned, errors)
+    _check_passports(column("passport"), cleaned, errors)
+    return cleaned, errors
+
+
+def validate_student(record, today=None):
+    """Проверяет одну запись (словарь колонок из FIELDS).
+
+    Returns:
+        dict: Нормализованные значения
+
+    Raises:
+        ValueError: со всеми найденными ошибками, по одной в строке
+    """
+    cleaned, errors = validate_batch({name: [record.get(name)] for name in FIELDS}, today)
+    if errors[0]:
+        raise ValueError("\n".join(errors[0]))
+    return {name: values[0] for name, values in cleaned.items()}
+
+
+def audit_students(students, batch_size=2000, today=None):
+    """Проверка уже записанных учеников — для регулярной проверки качества данных.
+
+    Args:
+        students (StudentRepository): Репозиторий учеников.
+        batch_size (int, optional): Сколько строк проверяется за один вызов validate_batch.
+
+    Yields:
+        tuple: (ID ученика, имя, список ошибок) для записей с ошибками
+    """
+    cursor = students.rows()
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            # Порядок колонок — STUDENT_FIELDS
+            _, errors = validate_batch({
+                "name": [row[1] for row in rows],
+                "department": [row[4] for row in rows],
+                "birth_date": [row[3] for row in rows],
+                "rank_date": [row[9] for row in rows],
+                "enrollment_date": [row[12] for row in rows],
+                "snils": [row[10] for row in rows],
+                "passport": [row[11] for row in rows],
+            }, today)
+            for row, row_errors in zip(rows, errors):
+                if row_errors:
+                    yield row[0], row[1], row_errors
+    finally:
+        cursor.close()